@@ -2,10 +2,11 @@
 #  Licensed under the GNU AGPL v3.0: https://www.gnu.org/licenses/agpl-3.0.html
 #  Part of the TgMusicBot project. All rights reserved where applicable.
 
-from TgMusic import client
-
 
 def main() -> None:
+    # Imported here so worker processes loading this module never build the bot
+    from TgMusic.client import client
+
     client.logger.info("Starting TgMusicBot...")
     client.run()
 
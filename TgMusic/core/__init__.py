@@ -21,6 +21,19 @@ from ._dataclass import CachedTrack, MusicTrack, PlatformTracks, TrackInfo
 from ._filters import Filter
 from .buttons import SupportButton, control_buttons
 from ._save_cookies import save_all_cookies
+from ._coordinator import download_coordinator
+from ._media_cache import media_cache
+from ._scheduler import Priority, download_scheduler, set_priority
+from ._ytdlp_pool import ytdlp_pool
+from ._transcoder import transcoder
+from ._httpx import HttpxClient
+from ._metadata_cache import metadata_cache
+from ._placement import assistant_balancer
+from ._media_index import media_indexer
+from ._quality import quality_governor
+from ._sharding import shard_manager
+from ._state import state_backend
+from ._playback_sessions import playback_sessions
 
 __all__ = [
     "is_admin",
@@ -44,4 +57,19 @@ __all__ = [
     "PlatformTracks",
     "SupportButton",
     "Filter",
+    "download_coordinator",
+    "media_cache",
+    "Priority",
+    "download_scheduler",
+    "set_priority",
+    "ytdlp_pool",
+    "transcoder",
+    "HttpxClient",
+    "metadata_cache",
+    "assistant_balancer",
+    "media_indexer",
+    "quality_governor",
+    "shard_manager",
+    "state_backend",
+    "playback_sessions",
 ]
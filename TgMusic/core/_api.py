@@ -10,7 +10,7 @@ from pytdbot import types
 from TgMusic.logger import LOGGER
 
 from ._config import config
-from ._downloader import MusicService
+from ._downloader import MusicService, service_registry
 from ._httpx import HttpxClient
 from ._spotify_dl_helper import SpotifyDownload
 from ._dataclass import PlatformTracks, MusicTrack, TrackInfo
@@ -27,7 +27,7 @@ class ApiData(MusicService):
     """
 
     # Platform URL validation patterns
-    URL_PATTERNS = {
+    PLATFORM_PATTERNS = {
         "apple_music": re.compile(
             r"^(https?://)?([a-z0-9-]+\.)*music\.apple\.com/"
             r"([a-z]{2}/)?"
@@ -45,6 +45,7 @@ class ApiData(MusicService):
             re.IGNORECASE,
         ),
     }
+    URL_PATTERNS = tuple(PLATFORM_PATTERNS.values())
 
     def __init__(self, query: Optional[str] = None) -> None:
         """Initialize the API handler with optional query.
@@ -68,18 +69,10 @@ class ApiData(MusicService):
         """
         return query.strip().split("?")[0].split("#")[0]
 
-    def is_valid(self, url: Optional[str]) -> bool:
-        """Validate if URL matches supported platform patterns.
-
-        Args:
-            url: The URL to validate
-
-        Returns:
-            bool: True if URL matches any platform pattern
-        """
-        if not url or not self.api_url or not self.api_key:
-            return False
-        return any(pattern.match(url) for pattern in self.URL_PATTERNS.values())
+    @classmethod
+    def available(cls) -> bool:
+        """The API is only usable with both a URL and a key configured."""
+        return bool(config.API_URL and config.API_KEY)
 
     async def _make_api_request(
         self, endpoint: str, params: Optional[dict] = None
@@ -148,7 +141,9 @@ class ApiData(MusicService):
 
         response = await self._make_api_request("get_track", {"id": self.query})
         return (
-            TrackInfo(**response) if response else types.Error(404, "Track not found")
+            TrackInfo.from_dict(response)
+            if response
+            else types.Error(404, "Track not found")
         )
 
     async def download_track(
@@ -196,6 +191,24 @@ class ApiData(MusicService):
 
         return download_result.file_path
 
+    async def get_stream_url(
+        self, track: TrackInfo, video: bool = False
+    ) -> Optional[str]:
+        """Return the track's CDN URL for playback while it downloads.
+
+        Spotify CDN files are encrypted and must be downloaded first.
+
+        Args:
+            track: TrackInfo containing the CDN URL
+            video: Whether a video stream is needed (unused)
+
+        Returns:
+            str: CDN URL, or None if the track cannot be streamed
+        """
+        if not track or not track.cdnurl or track.platform.lower() == "spotify":
+            return None
+        return track.cdnurl
+
     @staticmethod
     def _parse_tracks_response(
         response_data: Optional[dict],
@@ -214,7 +227,7 @@ class ApiData(MusicService):
 
         try:
             tracks = [
-                MusicTrack(**track_data)
+                MusicTrack.from_dict(track_data)
                 for track_data in response_data["results"]
                 if isinstance(track_data, dict)
             ]
@@ -226,3 +239,6 @@ class ApiData(MusicService):
         except Exception as parse_error:
             LOGGER.error(f"Failed to parse tracks: {parse_error}")
             return types.Error(500, "Failed to process track data")
+
+
+service_registry.register("api", ApiData)
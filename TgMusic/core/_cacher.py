@@ -2,13 +2,17 @@
 #  Licensed under the GNU AGPL v3.0: https://www.gnu.org/licenses/agpl-3.0.html
 #  Part of the TgMusicBot project. All rights reserved where applicable.
 
-from collections import deque
-from typing import Any, Optional, TypeAlias, Union
+import os
+import re
+from collections.abc import Iterator, Sequence
+from typing import Optional, TypeAlias, Union
 
 from cachetools import TTLCache
 from pytdbot import types
 
 from TgMusic.core._dataclass import CachedTrack
+from TgMusic.core._state import ChatSnapshot, StateBackend, state_backend
+from TgMusic.logger import LOGGER
 
 chat_invite_cache = TTLCache(maxsize=1000, ttl=1000)
 
@@ -25,70 +29,288 @@ ChatMemberStatusResult: TypeAlias = Union[ChatMemberStatus, types.Error]
 user_status_cache: TTLCache[str, ChatMemberStatus] = TTLCache(maxsize=5000, ttl=1000)
 
 
+class TrackQueue:
+    """
+    A chat's tracks, the one playing first, with O(1) access by position.
+
+    Backed by a list and a head offset: taking the playing track off the
+    front only advances the offset, and the consumed prefix is dropped
+    once it outgrows the live part. Removing or moving a track by
+    position is a single list ``pop``/``insert``.
+    """
+
+    __slots__ = ("_items", "_head")
+
+    def __init__(self) -> None:
+        self._items: list[Optional[CachedTrack]] = []
+        self._head = 0
+
+    def __len__(self) -> int:
+        return len(self._items) - self._head
+
+    def _position(self, index: int) -> int:
+        size = len(self)
+        if index < 0:
+            index += size
+        if not 0 <= index < size:
+            raise IndexError("queue index out of range")
+        return self._head + index
+
+    def __getitem__(self, index: int) -> CachedTrack:
+        return self._items[self._position(index)]
+
+    def append(self, track: CachedTrack) -> None:
+        self._items.append(track)
+
+    def popleft(self) -> Optional[CachedTrack]:
+        if not len(self):
+            return None
+
+        track = self._items[self._head]
+        self._items[self._head] = None
+        self._head += 1
+        if self._head == len(self._items):
+            self._items.clear()
+            self._head = 0
+        elif self._head > 32 and self._head * 2 > len(self._items):
+            del self._items[: self._head]
+            self._head = 0
+        return track
+
+    def pop(self, index: int) -> CachedTrack:
+        return self._items.pop(self._position(index))
+
+    def move(self, index: int, to: int) -> None:
+        track = self._items.pop(self._position(index))
+        self._items.insert(self._head + max(0, min(to, len(self))), track)
+
+    def view(self, start: int = 0, stop: Optional[int] = None) -> "QueueView":
+        return QueueView(self, start, stop)
+
+
+class QueueView(Sequence[CachedTrack]):
+    """
+    Read-only window onto a chat's queue.
+
+    Positions are relative to the track playing now and the view reflects
+    later changes to the queue, so take what you need before awaiting.
+    """
+
+    __slots__ = ("_queue", "_start", "_stop")
+
+    def __init__(
+        self, queue: TrackQueue, start: int = 0, stop: Optional[int] = None
+    ) -> None:
+        self._queue = queue
+        self._start = start
+        self._stop = stop
+
+    def _bounds(self) -> tuple[int, int]:
+        size = len(self._queue)
+        stop = size if self._stop is None else min(self._stop, size)
+        return min(self._start, stop), stop
+
+    def __len__(self) -> int:
+        start, stop = self._bounds()
+        return stop - start
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            if step != 1:
+                return list(self)[index]
+            offset = self._bounds()[0]
+            return QueueView(self._queue, offset + start, offset + max(start, stop))
+
+        size = len(self)
+        if index < 0:
+            index += size
+        if not 0 <= index < size:
+            raise IndexError("queue index out of range")
+        return self._queue[self._bounds()[0] + index]
+
+    def __iter__(self) -> Iterator[CachedTrack]:
+        start, stop = self._bounds()
+        for i in range(start, stop):
+            if i >= len(self._queue):
+                return
+            yield self._queue[i]
+
+
+# Shared by every chat without state, so lookups never allocate
+_EMPTY_QUEUE = TrackQueue()
+
+
+class ChatState:
+    __slots__ = ("active", "queue")
+
+    def __init__(self, active: bool) -> None:
+        self.active = active
+        self.queue = TrackQueue()
+
+
 class ChatCacher:
-    def __init__(self):
-        self.chat_cache: dict[int, dict[str, Any]] = {}
+    """
+    Per-chat playback state: whether a call is live, and its track queue.
+
+    Reads are always served from memory. Every change is reported to the
+    state backend, which may persist it for ``restore`` after a restart.
+    """
+
+    def __init__(self, backend: StateBackend):
+        self.chat_cache: dict[int, ChatState] = {}
+        self._active: set[int] = set()
+        self.backend = backend
+        backend.bind(self.snapshot)
+
+    def _state(self, chat_id: int, active: bool) -> ChatState:
+        state = self.chat_cache.get(chat_id)
+        if state is None:
+            state = self.chat_cache[chat_id] = ChatState(active)
+            if active:
+                self._active.add(chat_id)
+        return state
+
+    def _queue(self, chat_id: int) -> TrackQueue:
+        state = self.chat_cache.get(chat_id)
+        return state.queue if state else _EMPTY_QUEUE
 
     def add_song(self, chat_id: int, song: CachedTrack) -> CachedTrack:
-        data = self.chat_cache.setdefault(
-            chat_id, {"is_active": True, "queue": deque()}
-        )
-        data["queue"].append(song)
+        self._state(chat_id, True).queue.append(song)
+        self.backend.changed(chat_id)
         return song
 
     def get_upcoming_track(self, chat_id: int) -> Optional[CachedTrack]:
-        queue = self.chat_cache.get(chat_id, {}).get("queue")
-        return queue[1] if queue and len(queue) > 1 else None
+        queue = self._queue(chat_id)
+        return queue[1] if len(queue) > 1 else None
 
     def get_playing_track(self, chat_id: int) -> Optional[CachedTrack]:
-        queue = self.chat_cache.get(chat_id, {}).get("queue")
-        return queue[0] if queue else None
+        queue = self._queue(chat_id)
+        return queue[0] if len(queue) else None
 
     def remove_current_song(self, chat_id: int) -> Optional[CachedTrack]:
-        queue = self.chat_cache.get(chat_id, {}).get("queue")
-        return queue.popleft() if queue else None
+        if track := self._queue(chat_id).popleft():
+            self.backend.changed(chat_id)
+        return track
 
     def is_active(self, chat_id: int) -> bool:
-        return self.chat_cache.get(chat_id, {}).get("is_active", False)
+        return chat_id in self._active
 
     def set_active(self, chat_id: int, active: bool):
-        data = self.chat_cache.setdefault(
-            chat_id, {"is_active": active, "queue": deque()}
-        )
-        data["is_active"] = active
+        self._state(chat_id, active).active = active
+        if active:
+            self._active.add(chat_id)
+        else:
+            self._active.discard(chat_id)
+        self.backend.changed(chat_id)
 
     def clear_chat(self, chat_id: int):
-        self.chat_cache.pop(chat_id, None)
+        if self.chat_cache.pop(chat_id, None):
+            self.backend.changed(chat_id)
+        self._active.discard(chat_id)
 
     def get_queue_length(self, chat_id: int) -> int:
-        return len(self.chat_cache.get(chat_id, {}).get("queue", deque()))
+        return len(self._queue(chat_id))
 
     def get_loop_count(self, chat_id: int) -> int:
-        queue = self.chat_cache.get(chat_id, {}).get("queue", deque())
-        return queue[0].loop if queue else 0
+        queue = self._queue(chat_id)
+        return queue[0].loop if len(queue) else 0
 
     def set_loop_count(self, chat_id: int, loop: int) -> bool:
-        if queue := self.chat_cache.get(chat_id, {}).get("queue", deque()):
+        queue = self._queue(chat_id)
+        if len(queue):
             queue[0].loop = loop
+            self.backend.changed(chat_id)
             return True
         return False
 
-    def remove_track(self, chat_id: int, queue_index: int) -> bool:
-        queue = self.chat_cache.get(chat_id, {}).get("queue")
-        if queue and 0 <= queue_index < len(queue):
-            queue_list = list(queue)
-            queue_list.pop(queue_index)
-            self.chat_cache[chat_id]["queue"] = deque(queue_list)
+    def remove_track(self, chat_id: int, queue_index: int) -> Optional[CachedTrack]:
+        """Remove the track at ``queue_index`` (0 is the one playing) and return it."""
+        queue = self._queue(chat_id)
+        if 0 <= queue_index < len(queue):
+            self.backend.changed(chat_id)
+            return queue.pop(queue_index)
+        return None
+
+    def move_track(self, chat_id: int, queue_index: int, to: int) -> bool:
+        """Move the track at ``queue_index`` to position ``to``."""
+        queue = self._queue(chat_id)
+        if 0 <= queue_index < len(queue):
+            queue.move(queue_index, to)
+            self.backend.changed(chat_id)
             return True
         return False
 
-    def get_queue(self, chat_id: int) -> list[CachedTrack]:
-        return list(self.chat_cache.get(chat_id, {}).get("queue", deque()))
+    def get_queue(self, chat_id: int) -> QueueView:
+        return self._queue(chat_id).view()
 
     def get_active_chats(self) -> list[int]:
-        return [
-            chat_id for chat_id, data in self.chat_cache.items() if data["is_active"]
+        return list(self._active)
+
+    @property
+    def active_count(self) -> int:
+        return len(self._active)
+
+    def snapshot(self, chat_id: int) -> Optional[ChatSnapshot]:
+        """A chat's state as plain data, or None if it has none."""
+        state = self.chat_cache.get(chat_id)
+        if state is None:
+            return None
+        return {
+            "active": state.active,
+            "queue": [
+                {**track.to_dict(), "file_path": str(track.file_path)}
+                for track in state.queue.view()
+            ],
+        }
+
+    def load_chat(self, chat_id: int, snapshot: ChatSnapshot) -> bool:
+        """
+        Replace a chat's state with a saved snapshot.
+
+        Returns:
+            bool: Whether any track of the snapshot could be loaded.
+        """
+        tracks = []
+        for data in snapshot.get("queue", []):
+            try:
+                track = CachedTrack.from_dict(data)
+            except ValueError as e:
+                LOGGER.warning("Skipping stored track in %s: %s", chat_id, e)
+                continue
+            # Stream URLs expire and cached files may have been evicted
+            path = str(track.file_path)
+            if re.match("^https?://", path) or (path and not os.path.exists(path)):
+                track.file_path = ""
+            tracks.append(track)
+
+        self.clear_chat(chat_id)
+        if not tracks:
+            self.backend.changed(chat_id)
+            return False
+
+        state = self._state(chat_id, bool(snapshot.get("active")))
+        for track in tracks:
+            state.queue.append(track)
+        self.backend.changed(chat_id)
+        return True
+
+    async def restore(self) -> list[int]:
+        """
+        Load the chats kept by the state backend.
+
+        Returns:
+            list[int]: Chats that were playing when their state was saved.
+        """
+        playing = [
+            chat_id
+            for chat_id, snapshot in (await self.backend.load()).items()
+            if self.load_chat(chat_id, snapshot) and self.is_active(chat_id)
         ]
 
+        if playing:
+            LOGGER.info("Restored %d playing chats from saved state", len(playing))
+        return playing
+
 
-chat_cache = ChatCacher()
+chat_cache = ChatCacher(state_backend)
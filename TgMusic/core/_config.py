@@ -41,9 +41,68 @@ class BotConfig:
         # Optional Settings
         self.PROXY: Optional[str] = os.getenv("PROXY")
         self.DEFAULT_SERVICE: str = os.getenv("DEFAULT_SERVICE", "youtube").lower()
+        self.SEARCH_PROVIDERS: list[str] = [
+            name.strip().lower()
+            for name in os.getenv("SEARCH_PROVIDERS", "").split(",")
+            if name.strip()
+        ]
+        self.SEARCH_DEADLINE: int = self._get_env_int("SEARCH_DEADLINE", 4)
+        self.SEARCH_MODE: str = os.getenv("SEARCH_MODE", "first").lower()
+        self.PLAYLIST_LIMIT: int = self._get_env_int("PLAYLIST_LIMIT", 500)
         self.MIN_MEMBER_COUNT: int = self._get_env_int("MIN_MEMBER_COUNT", 50)
 
         self.DOWNLOADS_DIR: Path = Path(os.getenv("DOWNLOADS_DIR", "database/music"))
+        self.MEDIA_CACHE_SIZE_MB: int = self._get_env_int("MEDIA_CACHE_SIZE_MB", 5120)
+        self.MEDIA_CACHE_POLICY: str = os.getenv("MEDIA_CACHE_POLICY", "lru").lower()
+        self.PREFETCH_COUNT: int = self._get_env_int("PREFETCH_COUNT", 1)
+        self.STREAM_WHILE_DOWNLOADING: bool = self._get_env_bool(
+            "STREAM_WHILE_DOWNLOADING", False
+        )
+        self.METADATA_CACHE_SIZE: int = self._get_env_int("METADATA_CACHE_SIZE", 2000)
+        self.METADATA_CACHE_TTL: int = self._get_env_int("METADATA_CACHE_TTL", 3600)
+        self.METADATA_TRACK_TTL: int = self._get_env_int("METADATA_TRACK_TTL", 600)
+        self.METADATA_STALE_TTL: int = self._get_env_int("METADATA_STALE_TTL", 86400)
+        self.METADATA_NEGATIVE_TTL: int = self._get_env_int(
+            "METADATA_NEGATIVE_TTL", 120
+        )
+        self.METADATA_CACHE_PERSIST: bool = self._get_env_bool(
+            "METADATA_CACHE_PERSIST", False
+        )
+        self.HTTP_MAX_CONNECTIONS: int = self._get_env_int("HTTP_MAX_CONNECTIONS", 100)
+        self.HTTP_MAX_KEEPALIVE: int = self._get_env_int("HTTP_MAX_KEEPALIVE", 20)
+        self.CIRCUIT_FAILURE_THRESHOLD: int = self._get_env_int(
+            "CIRCUIT_FAILURE_THRESHOLD", 5
+        )
+        self.CIRCUIT_RESET_TIMEOUT: int = self._get_env_int("CIRCUIT_RESET_TIMEOUT", 30)
+        self.QUALITY_CPU_THRESHOLDS: list[int] = self._get_env_int_list(
+            "QUALITY_CPU_THRESHOLDS", [60, 75, 90]
+        )
+        self.QUALITY_CALL_THRESHOLDS: list[int] = self._get_env_int_list(
+            "QUALITY_CALL_THRESHOLDS", [25, 75, 150]
+        )
+        self.QUALITY_PING_LIMIT: int = self._get_env_int("QUALITY_PING_LIMIT", 400)
+        self.QUALITY_SAMPLE_INTERVAL: int = self._get_env_int(
+            "QUALITY_SAMPLE_INTERVAL", 15
+        )
+        self.QUALITY_DOWNGRADE_RUNNING: bool = self._get_env_bool(
+            "QUALITY_DOWNGRADE_RUNNING", False
+        )
+        self.TRANSCODE_CACHE: bool = self._get_env_bool("TRANSCODE_CACHE", False)
+        self.MAX_TRANSCODES: int = self._get_env_int("MAX_TRANSCODES", 1)
+        self.DOWNLOAD_SEGMENTS: int = self._get_env_int("DOWNLOAD_SEGMENTS", 4)
+        self.YTDLP_WORKERS: int = self._get_env_int("YTDLP_WORKERS", 2)
+        self.MAX_YTDLP_DOWNLOADS: int = self._get_env_int("MAX_YTDLP_DOWNLOADS", 3)
+        self.MAX_HTTP_DOWNLOADS: int = self._get_env_int("MAX_HTTP_DOWNLOADS", 6)
+        self.MAX_SPOTIFY_DOWNLOADS: int = self._get_env_int("MAX_SPOTIFY_DOWNLOADS", 2)
+        self.MAX_TELEGRAM_DOWNLOADS: int = self._get_env_int(
+            "MAX_TELEGRAM_DOWNLOADS", 3
+        )
+        self.SHARDS: int = self._get_env_int("SHARDS", 1)
+        self.STATE_BACKEND: str = os.getenv("STATE_BACKEND", "memory").lower()
+        self.REDIS_URL: str = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+        self.SNAPSHOT_INTERVAL: int = self._get_env_int("SNAPSHOT_INTERVAL", 30)
+        self.RESUME_CONCURRENCY: int = self._get_env_int("RESUME_CONCURRENCY", 3)
+        self.RESUME_MAX_AGE: int = self._get_env_int("RESUME_MAX_AGE", 600)
 
         self.SUPPORT_GROUP: str = os.getenv(
             "SUPPORT_GROUP", "https://t.me/GuardxSupport"
@@ -110,6 +169,29 @@ class BotConfig:
         """
         return os.getenv(name, str(default)).lower() == "true"
 
+    @staticmethod
+    def _get_env_int_list(name: str, default: list[int]) -> list[int]:
+        """
+        Retrieve a comma-separated environment variable as a list of integers.
+
+        Args:
+            name (str): Environment variable name.
+            default (list[int]): Fallback value if unset or invalid.
+
+        Returns:
+            list[int]: Parsed integers or the default value.
+        """
+        value = os.getenv(name)
+        if not value:
+            return default
+        try:
+            return [int(part) for part in value.split(",") if part.strip()]
+        except ValueError:
+            LOGGER.warning(
+                "Invalid value for %s: %s (default: %s)", name, value, default
+            )
+            return default
+
     @staticmethod
     def _get_session_strings(prefix: str = "STRING", count: int = 10) -> list[str]:
         """
@@ -141,6 +223,27 @@ class BotConfig:
             return []
         return [url.strip() for url in value.replace(",", " ").split() if url.strip()]
 
+    @classmethod
+    def _purge_directory(cls, path: Path, keep: Path) -> None:
+        """
+        Remove everything inside a directory except the `keep` path.
+
+        Args:
+            path (Path): Directory to purge.
+            keep (Path): Directory (and its contents) to preserve.
+        """
+        keep = keep.resolve()
+        for child in path.iterdir():
+            resolved = child.resolve()
+            if resolved == keep:
+                continue
+            if child.is_dir() and keep.is_relative_to(resolved):
+                cls._purge_directory(child, keep)
+            elif child.is_dir():
+                shutil.rmtree(child)
+            else:
+                child.unlink()
+
     def _validate_config(self) -> None:
         """Validate all required environment configuration values."""
         missing = [
@@ -160,7 +263,7 @@ class BotConfig:
         if self.IGNORE_BACKGROUND_UPDATES:
             db_path = Path("database")
             if db_path.exists():
-                shutil.rmtree(db_path)
+                self._purge_directory(db_path, keep=self.DOWNLOADS_DIR)
 
         try:
             self.DOWNLOADS_DIR.mkdir(parents=True, exist_ok=True)
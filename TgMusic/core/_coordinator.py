@@ -0,0 +1,105 @@
+#  Copyright (c) 2025 AshokShau
+#  Licensed under the GNU AGPL v3.0: https://www.gnu.org/licenses/agpl-3.0.html
+#  Part of the TgMusicBot project. All rights reserved where applicable.
+
+import asyncio
+from typing import Any, Awaitable, Callable, TypeAlias
+
+from TgMusic.logger import LOGGER
+from ._scheduler import PriorityRef, current_priority, set_priority
+
+DownloadKey: TypeAlias = tuple[str, str, bool]
+
+
+class _InFlight:
+    __slots__ = ("task", "waiters", "priority")
+
+    def __init__(self, task: asyncio.Task, priority: PriorityRef) -> None:
+        self.task = task
+        self.waiters = 0
+        self.priority = priority
+
+
+class DownloadCoordinator:
+    """
+    Coalesces concurrent downloads of the same track into a single job.
+
+    Requests are keyed by (platform, track id, video). The first caller starts
+    the download; every caller that arrives while it is still running awaits
+    the same task and receives the same result, including a returned
+    ``types.Error`` or a raised exception. The shared task is only cancelled
+    once every waiter has gone away.
+
+    The shared task runs at the highest priority of any of its waiters, so a
+    prefetch that a listener starts waiting on is promoted in the scheduler.
+    """
+
+    def __init__(self) -> None:
+        self._inflight: dict[DownloadKey, _InFlight] = {}
+        self.started: int = 0
+        self.coalesced: int = 0
+
+    @staticmethod
+    def make_key(platform: str, track_id: str, video: bool) -> DownloadKey:
+        return (platform or "").lower(), str(track_id), bool(video)
+
+    def is_running(self, key: DownloadKey) -> bool:
+        return key in self._inflight
+
+    @staticmethod
+    async def _run_at(
+        priority: PriorityRef, factory: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        set_priority(priority)
+        return await factory()
+
+    def _forget(self, key: DownloadKey, entry: _InFlight, _: asyncio.Task) -> None:
+        if self._inflight.get(key) is entry:
+            del self._inflight[key]
+
+    async def run(self, key: DownloadKey, factory: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Run ``factory`` for ``key`` unless a download for it is already running.
+
+        Args:
+            key (DownloadKey): Identity of the download.
+            factory (Callable): Zero-argument coroutine factory doing the download.
+
+        Returns:
+            Any: Whatever the shared download returned.
+        """
+        priority = current_priority()
+        entry = self._inflight.get(key)
+        if entry is None:
+            ref = PriorityRef(priority)
+            entry = _InFlight(asyncio.create_task(self._run_at(ref, factory)), ref)
+            self._inflight[key] = entry
+            entry.task.add_done_callback(lambda t: self._forget(key, entry, t))
+            self.started += 1
+        else:
+            self.coalesced += 1
+            if priority < entry.priority.value:
+                LOGGER.debug(
+                    "Promoting in-flight download for %s to %s", key, priority.name
+                )
+                entry.priority.value = priority
+            LOGGER.debug("Joining in-flight download for %s", key)
+
+        entry.waiters += 1
+        try:
+            return await asyncio.shield(entry.task)
+        finally:
+            entry.waiters -= 1
+            if entry.waiters == 0 and not entry.task.done():
+                LOGGER.debug("Cancelling orphaned download for %s", key)
+                entry.task.cancel()
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "in_flight": len(self._inflight),
+            "started": self.started,
+            "coalesced": self.coalesced,
+        }
+
+
+download_coordinator = DownloadCoordinator()
@@ -2,10 +2,11 @@
 #  Licensed under the GNU AGPL v3.0: https://www.gnu.org/licenses/agpl-3.0.html
 #  Part of the TgMusicBot project. All rights reserved where applicable.
 
+import asyncio
 from typing import Optional
 
-from cachetools import TTLCache
-from pymongo import AsyncMongoClient
+from cachetools import LRUCache, TTLCache
+from pymongo import AsyncMongoClient, ReplaceOne, UpdateOne
 from pymongo.errors import ConnectionFailure
 
 from TgMusic.logger import LOGGER
@@ -13,6 +14,10 @@ from ._config import config
 
 
 class Database:
+    # Chats and users seen in messages are registered in batches
+    FLUSH_INTERVAL = 5.0
+    MAX_PENDING = 1000
+
     def __init__(self):
         self.mongo_client = AsyncMongoClient(config.MONGO_URI)
         _db = self.mongo_client[config.DB_NAME]
@@ -20,14 +25,29 @@ class Database:
         self.users_db = _db["users"]
         self.bot_db = _db["bot"]
         self.language = _db["language"]
+        self.metadata_db = _db["metadata"]
+        self.sessions_db = _db["sessions"]
 
         self.chat_cache = TTLCache(maxsize=1000, ttl=1200)
         self.bot_cache = TTLCache(maxsize=1000, ttl=1200)
 
+        # IDs already stored or queued, so repeat messages never reach Mongo
+        self._seen = {
+            "chats": LRUCache(maxsize=100_000),
+            "users": LRUCache(maxsize=100_000),
+        }
+        self._pending: dict[str, set[int]] = {"chats": set(), "users": set()}
+        self._flush_lock = asyncio.Lock()
+        self._flush_task: Optional[asyncio.Task] = None
+
     async def ping(self) -> None:
         try:
             await self.mongo_client.aconnect()
             await self.mongo_client.admin.command("ping")
+            if config.METADATA_CACHE_PERSIST:
+                await self.metadata_db.create_index("expires_at", expireAfterSeconds=0)
+            if self._flush_task is None:
+                self._flush_task = asyncio.create_task(self._flush_loop())
             LOGGER.info("Database connection completed.")
         except ConnectionFailure as e:
             raise ConnectionFailure(
@@ -48,12 +68,91 @@ class Database:
             LOGGER.warning("Error getting chat: %s", e)
             return None
 
-    async def add_chat(self, chat_id: int) -> None:
-        if await self.get_chat(chat_id) is None:
-            LOGGER.info("Added chat: %s", chat_id)
-            await self.chat_db.update_one(
-                {"_id": chat_id}, {"$setOnInsert": {}}, upsert=True
+    async def get_metadata(self, key: str) -> Optional[dict]:
+        try:
+            return await self.metadata_db.find_one({"_id": key})
+        except Exception as e:
+            LOGGER.warning("Error getting metadata: %s", e)
+            return None
+
+    async def set_metadata(self, key: str, data: dict) -> None:
+        try:
+            await self.metadata_db.update_one({"_id": key}, {"$set": data}, upsert=True)
+        except Exception as e:
+            LOGGER.warning("Error saving metadata: %s", e)
+
+    async def save_sessions(self, sessions: list[dict]) -> None:
+        """Replace the stored playback sessions with ``sessions``."""
+        try:
+            if sessions:
+                await self.sessions_db.bulk_write(
+                    [ReplaceOne({"_id": s["_id"]}, s, upsert=True) for s in sessions],
+                    ordered=False,
+                )
+            await self.sessions_db.delete_many(
+                {"_id": {"$nin": [s["_id"] for s in sessions]}}
             )
+        except Exception as e:
+            LOGGER.warning("Error saving playback sessions: %s", e)
+
+    async def get_sessions(self) -> list[dict]:
+        try:
+            return [session async for session in self.sessions_db.find({})]
+        except Exception as e:
+            LOGGER.warning("Error getting playback sessions: %s", e)
+            return []
+
+    async def _register(self, kind: str, _id: int) -> None:
+        seen = self._seen[kind]
+        if _id in seen:
+            return
+
+        if sum(map(len, self._pending.values())) >= self.MAX_PENDING:
+            # Make the caller wait for the buffer to drain instead of growing it
+            await self.flush_registrations()
+            if sum(map(len, self._pending.values())) >= self.MAX_PENDING:
+                # Mongo is not keeping up; the ID is registered on a later message
+                return
+
+        self._pending[kind].add(_id)
+        seen[_id] = True
+
+    async def flush_registrations(self) -> None:
+        """Upsert the queued chats and users, one bulk write per collection."""
+        async with self._flush_lock:
+            for kind, collection in (("chats", self.chat_db), ("users", self.users_db)):
+                batch = self._pending[kind]
+                if not batch:
+                    continue
+
+                self._pending[kind] = set()
+                try:
+                    result = await collection.bulk_write(
+                        [
+                            UpdateOne({"_id": _id}, {"$setOnInsert": {}}, upsert=True)
+                            for _id in batch
+                        ],
+                        ordered=False,
+                    )
+                except Exception as e:
+                    self._pending[kind] |= batch
+                    LOGGER.warning("Error registering %d %s: %s", len(batch), kind, e)
+                    continue
+                except BaseException:
+                    # Cancelled mid-write: keep the batch for the final flush
+                    self._pending[kind] |= batch
+                    raise
+
+                if result.upserted_count:
+                    LOGGER.info("Added %d new %s", result.upserted_count, kind)
+
+    async def _flush_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.FLUSH_INTERVAL)
+            await self.flush_registrations()
+
+    async def add_chat(self, chat_id: int) -> None:
+        await self._register("chats", chat_id)
 
     async def _update_chat_field(self, chat_id: int, key: str, value) -> None:
         await self.chat_db.update_one(
@@ -77,6 +176,14 @@ class Database:
     async def set_assistant(self, chat_id: int, assistant: str) -> None:
         await self._update_chat_field(chat_id, "assistant", assistant)
 
+    async def get_assistant_chats(self, assistant: str) -> list[int]:
+        try:
+            cursor = self.chat_db.find({"assistant": assistant}, {"_id": 1})
+            return [chat["_id"] async for chat in cursor]
+        except Exception as e:
+            LOGGER.warning("Error getting assistant chats: %s", e)
+            return []
+
     async def clear_all_assistants(self) -> int:
         # Clear assistants from all chats in the database
         result = await self.chat_db.update_many(
@@ -139,15 +246,17 @@ class Database:
         return chat.get("thumb", True) if chat else True
 
     async def remove_chat(self, chat_id: int) -> None:
+        self._seen["chats"].pop(chat_id, None)
+        self._pending["chats"].discard(chat_id)
         await self.chat_db.delete_one({"_id": chat_id})
         self.chat_cache.pop(chat_id, None)
 
     async def add_user(self, user_id: int) -> None:
-        await self.users_db.update_one(
-            {"_id": user_id}, {"$setOnInsert": {}}, upsert=True
-        )
+        await self._register("users", user_id)
 
     async def remove_user(self, user_id: int) -> None:
+        self._seen["users"].pop(user_id, None)
+        self._pending["users"].discard(user_id)
         await self.users_db.delete_one({"_id": user_id})
 
     async def is_user_exist(self, user_id: int) -> bool:
@@ -205,6 +314,15 @@ class Database:
         self.bot_cache[bot_id] = cached
 
     async def close(self) -> None:
+        if self._flush_task:
+            self._flush_task.cancel()
+            try:
+                # Let an in-flight flush finish unwinding before the final one
+                await self._flush_task
+            except asyncio.CancelledError:
+                pass
+            self._flush_task = None
+        await self.flush_registrations()
         await self.mongo_client.close()
         LOGGER.info("Database connection closed.")
 
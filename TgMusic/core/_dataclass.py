@@ -2,13 +2,100 @@
 #  Licensed under the GNU AGPL v3.0: https://www.gnu.org/licenses/agpl-3.0.html
 #  Part of the TgMusicBot project. All rights reserved where applicable.
 
+from dataclasses import MISSING, asdict, dataclass, fields
 from pathlib import Path
-from typing import Union
+from typing import Any, Callable, Mapping, TypeVar, Union
 
-from pydantic import BaseModel
+R = TypeVar("R", bound="_Record")
 
 
-class CachedTrack(BaseModel):
+class TrackValidationError(ValueError):
+    """Raised when external data cannot be turned into a track record."""
+
+
+def _to_str(value: Any) -> str:
+    if isinstance(value, str):
+        return value
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return str(value)
+    raise TypeError(f"expected a string, got {type(value).__name__}")
+
+
+def _to_int(value: Any) -> int:
+    if isinstance(value, int):
+        return int(value)
+    if isinstance(value, (float, str)):
+        return int(float(value))
+    raise TypeError(f"expected an integer, got {type(value).__name__}")
+
+
+def _to_bool(value: Any) -> bool:
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, int) and value in (0, 1):
+        return bool(value)
+    if isinstance(value, str) and value.lower() in ("true", "false", "1", "0"):
+        return value.lower() in ("true", "1")
+    raise TypeError(f"expected a boolean, got {value!r}")
+
+
+def _to_path(value: Any) -> Union[str, Path]:
+    if isinstance(value, (str, Path)):
+        return value
+    raise TypeError(f"expected a path, got {type(value).__name__}")
+
+
+_CONVERTERS: dict[Any, Callable[[Any], Any]] = {
+    str: _to_str,
+    int: _to_int,
+    bool: _to_bool,
+    Union[str, Path]: _to_path,
+}
+_SCHEMAS: dict[type, tuple[tuple[str, Callable[[Any], Any], Any], ...]] = {}
+
+
+class _Record:
+    """
+    Base of the slotted track records.
+
+    Records are built directly from keyword arguments inside the bot.
+    Data from outside (provider APIs, stored documents) goes through
+    ``from_dict``, which checks required fields, coerces numbers sent as
+    strings and ignores unknown keys.
+    """
+
+    __slots__ = ()
+
+    @classmethod
+    def _schema(cls) -> tuple[tuple[str, Callable[[Any], Any], Any], ...]:
+        if (schema := _SCHEMAS.get(cls)) is None:
+            schema = _SCHEMAS[cls] = tuple(
+                (f.name, _CONVERTERS[f.type], f.default) for f in fields(cls)
+            )
+        return schema
+
+    @classmethod
+    def from_dict(cls: type[R], data: Mapping[str, Any]) -> R:
+        """Build a validated record from external data."""
+        kwargs = {}
+        for name, convert, default in cls._schema():
+            value = data.get(name)
+            if value is None:
+                if default is MISSING:
+                    raise TrackValidationError(f"{cls.__name__}.{name} is required")
+                continue
+            try:
+                kwargs[name] = convert(value)
+            except (TypeError, ValueError) as e:
+                raise TrackValidationError(f"{cls.__name__}.{name}: {e}") from None
+        return cls(**kwargs)
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+@dataclass(slots=True, kw_only=True)
+class CachedTrack(_Record):
     url: str
     name: str
     artist: str
@@ -22,7 +109,8 @@ class CachedTrack(BaseModel):
     platform: str
 
 
-class TrackInfo(BaseModel):
+@dataclass(slots=True, kw_only=True)
+class TrackInfo(_Record):
     url: str
     cdnurl: str
     key: str
@@ -37,7 +125,8 @@ class TrackInfo(BaseModel):
     platform: str
 
 
-class MusicTrack(BaseModel):
+@dataclass(slots=True, kw_only=True)
+class MusicTrack(_Record):
     url: str
     name: str
     artist: str
@@ -48,5 +137,13 @@ class MusicTrack(BaseModel):
     platform: str
 
 
-class PlatformTracks(BaseModel):
+@dataclass(slots=True, kw_only=True)
+class PlatformTracks(_Record):
     tracks: list[MusicTrack]
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> "PlatformTracks":
+        tracks = data.get("tracks")
+        if not isinstance(tracks, list):
+            raise TrackValidationError("PlatformTracks.tracks must be a list")
+        return cls(tracks=[MusicTrack.from_dict(track) for track in tracks])
@@ -2,18 +2,41 @@
 #  Licensed under the GNU AGPL v3.0: https://www.gnu.org/licenses/agpl-3.0.html
 #  Part of the TgMusicBot project. All rights reserved where applicable.
 
+import asyncio
+import re
 from abc import ABC, abstractmethod
 from pathlib import Path
-from typing import Optional, Union
+from typing import AsyncIterator, Optional, Union
 
 from pytdbot import types
+
+from TgMusic.logger import LOGGER
 from ._config import config
+from ._coordinator import download_coordinator
 from ._dataclass import PlatformTracks, TrackInfo
+from ._media_cache import media_cache
+from ._metadata_cache import metadata_cache
+from ._transcoder import transcoder
 
 
 class MusicService(ABC):
-    @abstractmethod
-    def is_valid(self, url: str) -> bool: ...
+    # URLs handled by the provider, checked without creating an instance
+    URL_PATTERNS: tuple[re.Pattern, ...] = ()
+
+    @classmethod
+    def available(cls) -> bool:
+        """Whether the provider is configured and can be used."""
+        return True
+
+    @classmethod
+    def matches(cls, url: Optional[str]) -> bool:
+        """Whether the provider handles ``url``."""
+        if not url or not cls.available():
+            return False
+        return any(pattern.match(url) for pattern in cls.URL_PATTERNS)
+
+    def is_valid(self, url: Optional[str]) -> bool:
+        return self.matches(url)
 
     @abstractmethod
     async def get_info(self) -> Union[PlatformTracks, types.Error]: ...
@@ -29,6 +52,89 @@ class MusicService(ABC):
         self, track_info: TrackInfo, video: bool = False
     ) -> Union[Path, types.Error]: ...
 
+    async def get_stream_url(
+        self, track_info: TrackInfo, video: bool = False
+    ) -> Optional[str]:
+        """Return a direct media URL that can be played while downloading."""
+        return None
+
+    def supports_pages(self) -> bool:
+        """Whether ``get_info_pages`` streams the query's tracks in several pages."""
+        return False
+
+    async def get_info_pages(
+        self,
+    ) -> AsyncIterator[Union[PlatformTracks, types.Error]]:
+        """Yield the tracks of ``get_info`` page by page as they are fetched."""
+        yield await self.get_info()
+
+    def cache_identity(self) -> str:
+        """Normalized form of the query used to key cached metadata."""
+        query = (getattr(self, "query", None) or "").strip()
+        if not re.match("^https?://", query):
+            query = " ".join(query.lower().split())
+        return f"{type(self).__name__}:{query}"
+
+
+class ServiceRegistry:
+    """
+    Routes queries to the music providers.
+
+    Providers register their class under a name when their module is
+    imported. URLs are classified against each class's ``URL_PATTERNS``
+    without creating any objects, and a query-less instance of each
+    provider is created on first use and shared for query-independent
+    work such as downloads.
+    """
+
+    # Config names that refer to a registered provider under another name
+    ALIASES = {"spotify": "api"}
+    DEFAULT = "youtube"
+
+    def __init__(self) -> None:
+        self._services: dict[str, type[MusicService]] = {}
+        self._shared: dict[str, MusicService] = {}
+        self._loaded = False
+
+    def register(self, name: str, service_cls: type[MusicService]) -> None:
+        self._services[name] = service_cls
+
+    def _load(self) -> None:
+        if self._loaded:
+            return
+        # Importing the provider modules registers them
+        from . import _youtube, _jiosaavn, _api  # noqa: F401
+
+        self._loaded = True
+
+    def resolve(self, name: str) -> Optional[str]:
+        """Return the registered, usable provider for a config name."""
+        self._load()
+        name = self.ALIASES.get(name, name)
+        service_cls = self._services.get(name)
+        return name if service_cls and service_cls.available() else None
+
+    def classify(self, url: Optional[str]) -> Optional[str]:
+        """Return the name of the provider handling ``url``, if any."""
+        self._load()
+        for name, service_cls in self._services.items():
+            if service_cls.matches(url):
+                return name
+        return None
+
+    def create(self, name: str, query: Optional[str] = None) -> MusicService:
+        self._load()
+        return self._services[name](query)
+
+    def get(self, name: str) -> MusicService:
+        """Return the shared query-less instance of a provider."""
+        if name not in self._shared:
+            self._shared[name] = self.create(name)
+        return self._shared[name]
+
+
+service_registry = ServiceRegistry()
+
 
 class DownloaderWrapper(MusicService):
     def __init__(self, query: Optional[str] = None) -> None:
@@ -36,40 +142,189 @@ class DownloaderWrapper(MusicService):
         self.service = self._get_service()
 
     def _get_service(self) -> MusicService:
-        from ._youtube import YouTubeData
-        from ._api import ApiData
-        from ._jiosaavn import JiosaavnData
-
-        services = [YouTubeData, JiosaavnData, ApiData]
-        for service_cls in services:
-            if service_cls().is_valid(self.query):
-                return service_cls(self.query)
-
-        fallback_map = {
-            "youtube": YouTubeData,
-            "spotify": ApiData,
-            "jiosaavn": JiosaavnData,
-        }
-        fallback_cls = fallback_map.get(config.DEFAULT_SERVICE, YouTubeData)
-        return (
-            ApiData(self.query)
-            if fallback_cls == ApiData and config.API_URL and config.API_KEY
-            else fallback_cls(self.query)
-        )
+        name = service_registry.classify(self.query)
+        self.matched_url = name is not None
+        if name is None:
+            name = (
+                service_registry.resolve(config.DEFAULT_SERVICE)
+                or ServiceRegistry.DEFAULT
+            )
+        self.service_name = name
+        return service_registry.create(name, self.query)
 
-    def is_valid(self, url: str) -> bool:
+    def is_valid(self, url: Optional[str]) -> bool:
         return self.service.is_valid(url)
 
+    def cache_identity(self) -> str:
+        return self.service.cache_identity()
+
+    def supports_pages(self) -> bool:
+        return self.service.supports_pages()
+
+    async def get_info_pages(
+        self,
+    ) -> AsyncIterator[Union[PlatformTracks, types.Error]]:
+        if not self.supports_pages():
+            # Single-page results go through the metadata cache
+            yield await self.get_info()
+            return
+
+        async for page in self.service.get_info_pages():
+            yield page
+
     async def get_info(self) -> Union[PlatformTracks, types.Error]:
-        return await self.service.get_info()
+        return await metadata_cache.get_or_fetch(
+            "info", self.cache_identity(), self.service.get_info
+        )
+
+    def _search_providers(self) -> dict[str, MusicService]:
+        """Services to query concurrently for a text search, in ranking order."""
+        providers: dict[str, MusicService] = {}
+        for name in config.SEARCH_PROVIDERS:
+            if (name := service_registry.resolve(name)) and name not in providers:
+                providers[name] = service_registry.create(name, self.query)
+        return providers
+
+    @staticmethod
+    def _merge_results(results: list[PlatformTracks]) -> PlatformTracks:
+        """Interleave provider results in ranking order, dropping duplicates."""
+        seen: set[tuple[str, str]] = set()
+        merged = []
+        for rank in range(max(len(result.tracks) for result in results)):
+            for result in results:
+                if rank >= len(result.tracks):
+                    continue
+                track = result.tracks[rank]
+                key = (track.name.strip().lower(), track.artist.strip().lower())
+                if key not in seen:
+                    seen.add(key)
+                    merged.append(track)
+        return PlatformTracks(tracks=merged)
+
+    async def _hedged_search(
+        self, providers: dict[str, MusicService]
+    ) -> Union[PlatformTracks, types.Error]:
+        """
+        Search every provider at once and stop at the deadline.
+
+        In "first" mode the first non-empty result wins; in "merge" mode all
+        results that arrive before the deadline are merged. Unfinished
+        searches are cancelled either way.
+        """
+        tasks = {
+            asyncio.create_task(service.search()): name
+            for name, service in providers.items()
+        }
+        results: dict[str, PlatformTracks] = {}
+        last_error: Optional[types.Error] = None
+        failed = False
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + config.SEARCH_DEADLINE
+        pending = set(tasks)
+
+        try:
+            while pending and (timeout := deadline - loop.time()) > 0:
+                done, pending = await asyncio.wait(
+                    pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    name = tasks[task]
+                    try:
+                        result = task.result()
+                    except Exception as e:
+                        LOGGER.warning("Search via %s failed: %s", name, e)
+                        failed = True
+                        continue
+
+                    if isinstance(result, types.Error):
+                        last_error = result
+                    elif result.tracks:
+                        results[name] = result
+                        if config.SEARCH_MODE != "merge":
+                            LOGGER.debug("Search answered first by %s", name)
+                            return result
+        finally:
+            for task in pending:
+                task.cancel()
+
+        if pending:
+            LOGGER.info(
+                "Search deadline hit; dropped %s",
+                ", ".join(tasks[task] for task in pending),
+            )
+
+        if results:
+            return self._merge_results(
+                [results[name] for name in providers if name in results]
+            )
+        if pending or failed:
+            # Not every provider answered; a 404 here would be cached as "no results"
+            return types.Error(code=504, message=f"Search timed out for: {self.query}")
+        return last_error or types.Error(
+            code=404, message=f"No results found for: {self.query}"
+        )
 
     async def search(self) -> Union[PlatformTracks, types.Error]:
-        return await self.service.search()
+        providers = {} if self.matched_url else self._search_providers()
+        if len(providers) > 1:
+            identity = f"{'+'.join(providers)}:{self.cache_identity().split(':', 1)[1]}"
+            result = await metadata_cache.get_or_fetch(
+                "search", identity, lambda: self._hedged_search(providers)
+            )
+        else:
+            result = await metadata_cache.get_or_fetch(
+                "search", self.cache_identity(), self.service.search
+            )
+        if isinstance(result, PlatformTracks) and not re.match(
+            "^https?://", self.query or ""
+        ):
+            # Search results already hold what get_info would fetch for each hit
+            for track in result.tracks:
+                identity = DownloaderWrapper(track.url).cache_identity()
+                metadata_cache.seed("info", identity, PlatformTracks(tracks=[track]))
+        return result
 
     async def get_track(self) -> Union[TrackInfo, types.Error]:
-        return await self.service.get_track()
+        return await metadata_cache.get_or_fetch(
+            "track", self.cache_identity(), self.service.get_track
+        )
+
+    async def get_stream_url(
+        self, track_info: TrackInfo, video: bool = False
+    ) -> Optional[str]:
+        return await service_registry.get(self.service_name).get_stream_url(
+            track_info, video
+        )
+
+    @staticmethod
+    def get_cached(track_info: TrackInfo, video: bool = False) -> Optional[Path]:
+        """Return the cached file for a track without downloading it."""
+        key = download_coordinator.make_key(track_info.platform, track_info.tc, video)
+        return media_cache.get(key)
 
     async def download_track(
         self, track_info: TrackInfo, video: bool = False
     ) -> Union[Path, types.Error]:
-        return await self.service.download_track(track_info, video)
+        if not track_info:
+            return await self.service.download_track(track_info, video)
+
+        if cached := self.get_cached(track_info, video):
+            return cached
+        return await self.fetch_track(track_info, video)
+
+    async def fetch_track(
+        self, track_info: TrackInfo, video: bool = False
+    ) -> Union[Path, types.Error]:
+        """Download a track into the media cache, skipping the cache lookup."""
+        key = download_coordinator.make_key(track_info.platform, track_info.tc, video)
+
+        async def _download() -> Union[Path, types.Error]:
+            service = service_registry.get(self.service_name)
+            result = await service.download_track(track_info, video)
+            if isinstance(result, Path):
+                await media_cache.put(key, result)
+                transcoder.schedule(key, result, video)
+            return result
+
+        # Concurrent requests for the same track share one download
+        return await download_coordinator.run(key, _download)
@@ -3,12 +3,15 @@
 # Part of the TgMusicBot project. All rights reserved where applicable.
 
 import asyncio
+import importlib.util
+import json
 import re
 import time
 import uuid
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Optional, Union, Dict
+from collections import Counter, defaultdict, deque
+from typing import Any, AsyncIterator, ClassVar, Optional, Union, Dict
 from urllib.parse import unquote
 
 import aiofiles
@@ -16,6 +19,7 @@ import httpx
 from aiofiles import os
 
 from ._config import config
+from ._scheduler import download_scheduler
 from TgMusic.logger import LOGGER
 
 
@@ -27,13 +31,151 @@ class DownloadResult:
     status_code: Optional[int] = None
 
 
+class HostHealth:
+    """Latency samples and failure state of one upstream host."""
+
+    __slots__ = ("latencies", "failures", "opened_at", "probing", "trips", "errors")
+
+    def __init__(self) -> None:
+        self.latencies: deque[float] = deque(maxlen=50)
+        self.failures = 0
+        self.opened_at = 0.0
+        self.probing = False
+        self.trips = 0
+        self.errors = 0
+
+    @property
+    def is_open(self) -> bool:
+        return self.opened_at > 0
+
+
+class HostMonitor:
+    """
+    Per-host circuit breakers and latency-based timeouts.
+
+    After ``threshold`` consecutive failures a host's circuit opens and
+    requests to it fail immediately. Once ``reset_timeout`` seconds pass, a
+    single probe request is let through: success closes the circuit,
+    failure keeps it open for another period. Request timeouts follow the
+    host's observed p95 latency, so a degraded upstream is given up on in
+    seconds rather than after the full default timeout.
+    """
+
+    MIN_SAMPLES = 10
+    MIN_TIMEOUT = 3.0
+    LATENCY_FACTOR = 3
+
+    def __init__(self, threshold: int, reset_timeout: float) -> None:
+        self.threshold = threshold
+        self.reset_timeout = reset_timeout
+        self._hosts: dict[str, HostHealth] = defaultdict(HostHealth)
+
+    @staticmethod
+    def host_of(url: str) -> str:
+        try:
+            return httpx.URL(url).host
+        except Exception:
+            return ""
+
+    def is_open(self, host: str) -> bool:
+        """Whether requests to ``host`` are refused right now. Takes no probe."""
+        if self.threshold <= 0:
+            return False
+
+        health = self._hosts.get(host)
+        if health is None or not health.is_open:
+            return False
+        return (
+            health.probing or time.monotonic() - health.opened_at < self.reset_timeout
+        )
+
+    def acquire(self, host: str) -> Optional[bool]:
+        """
+        Admit a request to ``host``; pair every admitted request with ``release``.
+
+        Returns:
+            None if the circuit refuses the request, True if it is the probe
+            deciding whether the circuit closes, False otherwise.
+        """
+        if self.is_open(host):
+            return None
+
+        health = self._hosts.get(host)
+        if health is None or not health.is_open:
+            return False
+
+        health.probing = True
+        LOGGER.info("Probing %s after its circuit opened", host)
+        return True
+
+    def release(self, host: str, probe: bool) -> None:
+        """Free the probe slot if the probe ended without recording a result."""
+        if probe and (health := self._hosts.get(host)) and health.probing:
+            health.probing = False
+
+    def timeout_for(self, host: str, default: float) -> float:
+        health = self._hosts.get(host)
+        if not health or len(health.latencies) < self.MIN_SAMPLES:
+            return default
+
+        samples = sorted(health.latencies)
+        p95 = samples[int(len(samples) * 0.95) - 1]
+        return min(default, max(self.MIN_TIMEOUT, p95 * self.LATENCY_FACTOR))
+
+    def record_success(self, host: str, latency: float) -> None:
+        health = self._hosts[host]
+        health.latencies.append(latency)
+        health.failures = 0
+        if health.is_open:
+            LOGGER.info("Circuit for %s closed", host)
+        health.opened_at = 0.0
+        health.probing = False
+
+    def record_failure(self, host: str) -> None:
+        health = self._hosts[host]
+        health.failures += 1
+        health.errors += 1
+        if health.probing or (
+            not health.is_open and self.threshold and health.failures >= self.threshold
+        ):
+            if not health.probing:
+                health.trips += 1
+                LOGGER.warning(
+                    "Circuit for %s opened after %d failures", host, health.failures
+                )
+            health.opened_at = time.monotonic()
+            health.probing = False
+
+    def stats(self) -> dict[str, dict[str, Any]]:
+        return {
+            host: {
+                "open": health.is_open,
+                "trips": health.trips,
+                "errors": health.errors,
+                "timeout": self.timeout_for(host, HttpxClient.DEFAULT_TIMEOUT),
+            }
+            for host, health in self._hosts.items()
+        }
+
+
+host_monitor = HostMonitor(
+    config.CIRCUIT_FAILURE_THRESHOLD, config.CIRCUIT_RESET_TIMEOUT
+)
+
+
 class HttpxClient:
     DEFAULT_TIMEOUT = 30
     DEFAULT_DOWNLOAD_TIMEOUT = 120
     CHUNK_SIZE = 1024 * 1024
+    MIN_SEGMENT_SIZE = 2 * 1024 * 1024
     MAX_RETRIES = 2
     BACKOFF_FACTOR = 1.0
 
+    # Shared connection pools, one per (timeout, max_redirects) combination
+    _sessions: ClassVar[dict[tuple[int, int], httpx.AsyncClient]] = {}
+    _requests: ClassVar[Counter[str]] = Counter()
+    HTTP2: ClassVar[bool] = importlib.util.find_spec("h2") is not None
+
     def __init__(
         self,
         timeout: int = DEFAULT_TIMEOUT,
@@ -43,22 +185,79 @@ class HttpxClient:
         self._timeout = timeout
         self._download_timeout = download_timeout
         self._max_redirects = max_redirects
-        self._session = httpx.AsyncClient(
-            timeout=httpx.Timeout(
-                connect=self._timeout,
-                read=self._timeout,
-                write=self._timeout,
-                pool=self._timeout,
-            ),
-            follow_redirects=max_redirects > 0,
-            max_redirects=max_redirects,
-        )
+        self._session = self._get_session(timeout, max_redirects)
+
+    @classmethod
+    def _get_session(cls, timeout: int, max_redirects: int) -> httpx.AsyncClient:
+        key = (timeout, max_redirects)
+        session = cls._sessions.get(key)
+        if session is None or session.is_closed:
+            session = httpx.AsyncClient(
+                timeout=httpx.Timeout(
+                    connect=timeout,
+                    read=timeout,
+                    write=timeout,
+                    pool=timeout,
+                ),
+                limits=httpx.Limits(
+                    max_connections=config.HTTP_MAX_CONNECTIONS,
+                    max_keepalive_connections=config.HTTP_MAX_KEEPALIVE,
+                    keepalive_expiry=30,
+                ),
+                http2=cls.HTTP2,
+                follow_redirects=max_redirects > 0,
+                max_redirects=max_redirects,
+            )
+            cls._sessions[key] = session
+        return session
+
+    @property
+    def session(self) -> httpx.AsyncClient:
+        """The shared ``httpx.AsyncClient`` behind this client."""
+        return self._session
 
     async def close(self) -> None:
-        try:
-            await self._session.aclose()
-        except Exception as e:
-            LOGGER.error("Error closing HTTP session: %s", repr(e), exc_info=True)
+        """Sessions are shared process-wide; see ``close_all``."""
+
+    @classmethod
+    async def close_all(cls) -> None:
+        """Close every shared session. Called once on shutdown."""
+        sessions = list(cls._sessions.values())
+        cls._sessions.clear()
+        for session in sessions:
+            try:
+                await session.aclose()
+            except Exception as e:
+                LOGGER.error("Error closing HTTP session: %s", repr(e), exc_info=True)
+
+    @staticmethod
+    def is_available(url: str) -> bool:
+        """Whether requests to the host of ``url`` are currently allowed."""
+        return not host_monitor.is_open(host_monitor.host_of(url))
+
+    @classmethod
+    def _record(cls, url: str) -> None:
+        cls._requests[httpx.URL(url).host] += 1
+
+    @classmethod
+    def stats(cls) -> dict[str, Any]:
+        connections = idle = 0
+        for session in cls._sessions.values():
+            # httpcore keeps its pool on the transport; not part of httpx's API
+            pool = getattr(session._transport, "_pool", None)
+            for conn in getattr(pool, "connections", []):
+                connections += 1
+                idle += conn.is_idle()
+
+        return {
+            "sessions": len(cls._sessions),
+            "http2": cls.HTTP2,
+            "connections": connections,
+            "idle": idle,
+            "requests": sum(cls._requests.values()),
+            "top_hosts": cls._requests.most_common(3),
+            "hosts": host_monitor.stats(),
+        }
 
     @staticmethod
     def _get_headers(url: str, base_headers: Dict[str, str]) -> Dict[str, str]:
@@ -92,12 +291,41 @@ class HttpxClient:
             LOGGER.error(error_msg)
             return DownloadResult(success=False, error=error_msg)
 
+        host = host_monitor.host_of(url)
+        probe = host_monitor.acquire(host)
+        if probe is None:
+            error_msg = f"Upstream {host} is unavailable"
+            LOGGER.warning("Skipping download of %s: circuit open", url)
+            return DownloadResult(success=False, error=error_msg)
+
         headers = self._get_headers(url, kwargs.pop("headers", {}))
+        self._record(url)
 
+        try:
+            async with download_scheduler.slot("http"):
+                return await self._download_file(url, file_path, overwrite, headers)
+        finally:
+            # Cancelled or failed without a result: let another probe through
+            host_monitor.release(host, probe)
+
+    async def _download_file(
+        self,
+        url: str,
+        file_path: Optional[Union[str, Path]],
+        overwrite: bool,
+        headers: Dict[str, str],
+    ) -> DownloadResult:
+        host = host_monitor.host_of(url)
+        start = time.monotonic()
         try:
             async with self._session.stream(
                 "GET", url, timeout=self._download_timeout, headers=headers
             ) as response:
+                if response.status_code >= 500:
+                    host_monitor.record_failure(host)
+                else:
+                    host_monitor.record_success(host, time.monotonic() - start)
+
                 if not response.is_success:
                     error_msg = await self._parse_error_response(response)
                     LOGGER.error(
@@ -130,23 +358,30 @@ class HttpxClient:
                 temp_path = path.with_suffix(f"{path.suffix}.part")
                 path.parent.mkdir(parents=True, exist_ok=True)
 
-                try:
-                    async with aiofiles.open(temp_path, "wb") as f:
-                        async for chunk in response.aiter_bytes(self.CHUNK_SIZE):
-                            await f.write(chunk)
-                except Exception as e:
-                    if temp_path.exists():
-                        await os.remove(temp_path)
-                    raise e
-
-                temp_path.rename(path)
-
-                LOGGER.info(
-                    "Successfully downloaded file to %s (size: %d bytes)",
-                    path,
-                    path.stat().st_size,
-                )
-                return DownloadResult(success=True, file_path=path)
+                total = int(response.headers.get("Content-Length") or 0)
+                ranged = self._supports_ranges(response, total)
+                if not ranged:
+                    try:
+                        async with aiofiles.open(temp_path, "wb") as f:
+                            async for chunk in response.aiter_bytes(self.CHUNK_SIZE):
+                                await f.write(chunk)
+                    except Exception as e:
+                        if temp_path.exists():
+                            await os.remove(temp_path)
+                        raise e
+
+            if ranged:
+                # The probe response is closed unread; ranges are fetched anew
+                await self._download_ranges(url, headers, temp_path, total)
+
+            temp_path.rename(path)
+
+            LOGGER.info(
+                "Successfully downloaded file to %s (size: %d bytes)",
+                path,
+                path.stat().st_size,
+            )
+            return DownloadResult(success=True, file_path=path)
 
         except httpx.HTTPStatusError as e:
             error_msg = await self._parse_error_response(e.response)
@@ -162,6 +397,7 @@ class HttpxClient:
             )
 
         except httpx.RequestError as e:
+            host_monitor.record_failure(host)
             error_msg = f"Request failed for {url}: {str(e)}"
             LOGGER.error(error_msg, exc_info=True)
             return DownloadResult(success=False, error=error_msg)
@@ -171,6 +407,138 @@ class HttpxClient:
             LOGGER.error(error_msg, exc_info=True)
             return DownloadResult(success=False, error=error_msg)
 
+    async def iter_bytes(self, url: str, **kwargs: Any) -> AsyncIterator[bytes]:
+        """
+        Stream the body of ``url`` without writing it to disk.
+
+        Raises:
+            httpx.HTTPStatusError: If the server answers with an error status.
+        """
+        headers = self._get_headers(url, kwargs.pop("headers", {}))
+        self._record(url)
+        async with download_scheduler.slot("http"):
+            async with self._session.stream(
+                "GET", url, timeout=self._download_timeout, headers=headers
+            ) as response:
+                response.raise_for_status()
+                async for chunk in response.aiter_bytes(self.CHUNK_SIZE):
+                    yield chunk
+
+    @staticmethod
+    def _supports_ranges(response: httpx.Response, total: int) -> bool:
+        return (
+            total > 0
+            and response.headers.get("Accept-Ranges", "").lower() == "bytes"
+            and not response.headers.get("Content-Encoding")
+        )
+
+    def _plan_segments(self, total: int) -> list[list[int]]:
+        count = max(1, min(config.DOWNLOAD_SEGMENTS, total // self.MIN_SEGMENT_SIZE))
+        size = -(-total // count)
+        return [
+            [start, min(start + size, total) - 1] for start in range(0, total, size)
+        ]
+
+    @staticmethod
+    async def _load_segments(
+        state_path: Path, temp_path: Path, total: int
+    ) -> Optional[list[list[int]]]:
+        """Load the progress of an interrupted ranged download, if it is usable."""
+        if not (await os.path.exists(state_path) and await os.path.exists(temp_path)):
+            return None
+
+        try:
+            async with aiofiles.open(state_path, "r") as f:
+                state = json.loads(await f.read())
+        except (OSError, ValueError):
+            return None
+
+        if state.get("total") != total or (await os.stat(temp_path)).st_size != total:
+            return None
+        return state.get("segments")
+
+    async def _download_ranges(
+        self, url: str, headers: Dict[str, str], temp_path: Path, total: int
+    ) -> None:
+        """
+        Download ``total`` bytes into ``temp_path`` as parallel byte ranges.
+
+        Progress is kept next to the ``.part`` file, so a later call for the
+        same URL only fetches what is still missing.
+        """
+        state_path = temp_path.with_name(f"{temp_path.name}.json")
+        segments = await self._load_segments(state_path, temp_path, total)
+        if segments is None:
+            segments = self._plan_segments(total)
+            async with aiofiles.open(temp_path, "wb") as f:
+                await f.truncate(total)
+        else:
+            LOGGER.info(
+                "Resuming %s with %d bytes left",
+                temp_path.name,
+                sum(end - pos + 1 for pos, end in segments if pos <= end),
+            )
+
+        tasks = [
+            asyncio.create_task(self._fetch_range(url, headers, temp_path, segment))
+            for segment in segments
+            if segment[0] <= segment[1]
+        ]
+        try:
+            await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            async with aiofiles.open(state_path, "w") as f:
+                await f.write(json.dumps({"total": total, "segments": segments}))
+            raise
+
+        if await os.path.exists(state_path):
+            await os.remove(state_path)
+
+    async def _fetch_range(
+        self,
+        url: str,
+        headers: Dict[str, str],
+        temp_path: Path,
+        segment: list[int],
+    ) -> None:
+        """Fill one ``[position, end]`` segment, advancing its position as bytes land."""
+        for attempt in range(self.MAX_RETRIES + 1):
+            try:
+                range_headers = {**headers, "Range": f"bytes={segment[0]}-{segment[1]}"}
+                async with self._session.stream(
+                    "GET", url, timeout=self._download_timeout, headers=range_headers
+                ) as response:
+                    response.raise_for_status()
+                    if response.status_code != 206:
+                        raise httpx.RequestError(
+                            "Server ignored the range request", request=response.request
+                        )
+
+                    async with aiofiles.open(temp_path, "r+b") as f:
+                        await f.seek(segment[0])
+                        async for chunk in response.aiter_bytes(self.CHUNK_SIZE):
+                            chunk = chunk[: segment[1] - segment[0] + 1]
+                            await f.write(chunk)
+                            segment[0] += len(chunk)
+
+                if segment[0] <= segment[1]:
+                    raise httpx.ReadError("Range response ended early")
+                return
+            except httpx.TransportError as e:
+                if attempt == self.MAX_RETRIES:
+                    raise
+                LOGGER.warning(
+                    "Range %d-%d of %s failed (%s), retrying",
+                    segment[0],
+                    segment[1],
+                    url,
+                    e,
+                )
+                await asyncio.sleep(self.BACKOFF_FACTOR * (2**attempt))
+
     @staticmethod
     def _sanitize_filename(name: str) -> str:
         """Sanitize filename to remove unsafe characters."""
@@ -187,14 +555,50 @@ class HttpxClient:
             LOGGER.error("Empty URL provided")
             return None
 
+        host = host_monitor.host_of(url)
+        probe = host_monitor.acquire(host)
+        if probe is None:
+            LOGGER.warning("Skipping request to %s: circuit open", url)
+            return None
+
+        try:
+            return await self._make_request(
+                url, host, max_retries, backoff_factor, **kwargs
+            )
+        finally:
+            # Cancelled or failed without a result: let another probe through
+            host_monitor.release(host, probe)
+
+    async def _make_request(
+        self,
+        url: str,
+        host: str,
+        max_retries: int,
+        backoff_factor: float,
+        **kwargs: Any,
+    ) -> Optional[Dict[str, Any]]:
         headers = self._get_headers(url, kwargs.pop("headers", {}))
+        timeout = kwargs.pop("timeout", None)
+        self._record(url)
         last_error = None
 
         for attempt in range(max_retries):
+            if attempt and host_monitor.is_open(host):
+                break
+
             try:
                 start = time.monotonic()
-                response = await self._session.get(url, headers=headers, **kwargs)
+                response = await self._session.get(
+                    url,
+                    headers=headers,
+                    timeout=timeout or host_monitor.timeout_for(host, self._timeout),
+                    **kwargs,
+                )
                 duration = time.monotonic() - start
+                if response.status_code >= 500:
+                    host_monitor.record_failure(host)
+                else:
+                    host_monitor.record_success(host, duration)
 
                 if not response.is_success:
                     error_msg = await self._parse_error_response(response)
@@ -220,6 +624,7 @@ class HttpxClient:
                 return response.json()
 
             except httpx.RequestError as e:
+                host_monitor.record_failure(host)
                 last_error = str(e)
                 LOGGER.warning(
                     "Request failed for %s (attempt %d/%d): %s",
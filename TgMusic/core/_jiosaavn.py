@@ -7,14 +7,14 @@ import re
 from pathlib import Path
 from typing import Any, Optional, Union
 
-import yt_dlp
 from pytdbot import types
 
 from TgMusic.logger import LOGGER
 from ._config import config
 from ._dataclass import PlatformTracks, MusicTrack, TrackInfo
-from ._downloader import MusicService
+from ._downloader import MusicService, service_registry
 from ._httpx import HttpxClient
+from ._ytdlp_pool import YtDlpPoolUnavailable, ytdlp_pool
 
 
 class JiosaavnData(MusicService):
@@ -35,6 +35,15 @@ class JiosaavnData(MusicService):
         r"^(https?://)?(www\.)?jiosaavn\.com/featured/[\w-]+/[a-zA-Z0-9_-]+$",
         re.IGNORECASE,
     )
+    URL_PATTERNS = (JIOSAAVN_SONG_PATTERN, JIOSAAVN_PLAYLIST_PATTERN)
+
+    # yt-dlp options for metadata extraction
+    YDL_OPTS = {
+        "quiet": True,
+        "no_warnings": True,
+        "extract_flat": "in_playlist",
+        "socket_timeout": 10,
+    }
 
     # API configuration
     API_SEARCH_ENDPOINT = (
@@ -59,28 +68,6 @@ class JiosaavnData(MusicService):
             query: JioSaavn URL or search term to process
         """
         self.query = query
-        self._ydl_opts = {
-            "quiet": True,
-            "no_warnings": True,
-            "extract_flat": "in_playlist",
-            "socket_timeout": 10,
-        }
-
-    def is_valid(self, url: str) -> bool:
-        """Validate if URL matches JioSaavn patterns.
-
-        Args:
-            url: URL to validate
-
-        Returns:
-            bool: True if URL matches song or playlist pattern
-        """
-        if not url:
-            return False
-        return bool(
-            self.JIOSAAVN_SONG_PATTERN.match(url)
-            or self.JIOSAAVN_PLAYLIST_PATTERN.match(url)
-        )
 
     async def search(self) -> Union[PlatformTracks, types.Error]:
         """Search JioSaavn for tracks matching the query.
@@ -114,7 +101,7 @@ class JiosaavnData(MusicService):
                 if track
             ]
             return PlatformTracks(
-                tracks=[MusicTrack(**track) for track in formatted_tracks]
+                tracks=[MusicTrack.from_dict(track) for track in formatted_tracks]
             )
 
         except Exception as error:
@@ -169,21 +156,37 @@ class JiosaavnData(MusicService):
             return types.Error(code=404, message="Could not retrieve track details")
 
         track_data = data["results"][0]
-        return TrackInfo(
-            cdnurl=track_data.get("cdnurl", ""),
-            key="nil",
-            name=track_data.get("name", ""),
-            artist=track_data.get("artist", self.DEFAULT_ARTIST),
-            tc=track_data.get("id", ""),
-            album=track_data.get("album", self.DEFAULT_ALBUM),
-            cover=track_data.get("cover", ""),
-            lyrics="None",
-            duration=track_data.get("duration", self.DEFAULT_DURATION),
-            year=track_data.get("year", self.DEFAULT_YEAR),
-            url=track_data.get("url", ""),
-            platform="jiosaavn",
+        # yt-dlp reports durations as floats, so validate at this boundary
+        return TrackInfo.from_dict(
+            {
+                "cdnurl": track_data.get("cdnurl", ""),
+                "key": "nil",
+                "name": track_data.get("name", ""),
+                "artist": track_data.get("artist", self.DEFAULT_ARTIST),
+                "tc": track_data.get("id", ""),
+                "album": track_data.get("album", self.DEFAULT_ALBUM),
+                "cover": track_data.get("cover", ""),
+                "lyrics": "None",
+                "duration": track_data.get("duration", self.DEFAULT_DURATION),
+                "year": track_data.get("year", self.DEFAULT_YEAR),
+                "url": track_data.get("url", ""),
+                "platform": "jiosaavn",
+            }
         )
 
+    async def _extract(self, url: str) -> Optional[dict[str, Any]]:
+        """Extract metadata with the yt-dlp worker pool.
+
+        Falls back to a local ``YoutubeDL`` in a thread when the pool is unavailable.
+        """
+        try:
+            return await ytdlp_pool.extract(url, self.YDL_OPTS)
+        except YtDlpPoolUnavailable:
+            import yt_dlp
+
+            with yt_dlp.YoutubeDL(self.YDL_OPTS) as ydl:
+                return await asyncio.to_thread(ydl.extract_info, url, download=False)
+
     async def get_track_data(self, url: str) -> Optional[dict[str, Any]]:
         """Retrieve metadata for a single JioSaavn track.
 
@@ -194,11 +197,8 @@ class JiosaavnData(MusicService):
             dict: Parsed track metadata or None if failed
         """
         try:
-            with yt_dlp.YoutubeDL(self._ydl_opts) as ydl:
-                info = await asyncio.to_thread(ydl.extract_info, url, download=False)
-                return {"results": [self._format_track(info)]} if info else None
-        except yt_dlp.DownloadError as error:
-            LOGGER.error(f"Download error for track {url}: {error}")
+            info = await self._extract(url)
+            return {"results": [self._format_track(info)]} if info else None
         except Exception as error:
             LOGGER.error(f"Unexpected error processing track {url}: {error}")
         return None
@@ -213,20 +213,16 @@ class JiosaavnData(MusicService):
             dict: Parsed playlist tracks or None if failed
         """
         try:
-            with yt_dlp.YoutubeDL(self._ydl_opts) as ydl:
-                info = await asyncio.to_thread(ydl.extract_info, url, download=False)
-
-                if not info or not info.get("entries"):
-                    LOGGER.warning(f"Empty playlist response for {url}")
-                    return None
-
-                return {
-                    "results": [
-                        self._format_track(track) for track in info["entries"] if track
-                    ]
-                }
-        except yt_dlp.DownloadError as error:
-            LOGGER.error(f"Download error for playlist {url}: {error}")
+            info = await self._extract(url)
+            if not info or not info.get("entries"):
+                LOGGER.warning(f"Empty playlist response for {url}")
+                return None
+
+            return {
+                "results": [
+                    self._format_track(track) for track in info["entries"] if track
+                ]
+            }
         except Exception as error:
             LOGGER.error(f"Unexpected error processing playlist {url}: {error}")
         return None
@@ -261,6 +257,20 @@ class JiosaavnData(MusicService):
 
         return result.file_path
 
+    async def get_stream_url(
+        self, track: TrackInfo, video: bool = False
+    ) -> Optional[str]:
+        """Return the track's CDN URL for playback while it downloads.
+
+        Args:
+            track: TrackInfo containing the CDN URL
+            video: Ignored, JioSaavn only serves audio
+
+        Returns:
+            str: CDN URL, or None if unavailable
+        """
+        return track.cdnurl if track and track.cdnurl else None
+
     @staticmethod
     def format_jiosaavn_url(name_and_id: str) -> str:
         """Format a JioSaavn URL from track name and ID.
@@ -343,5 +353,8 @@ class JiosaavnData(MusicService):
             return types.Error(code=404, message="No valid tracks found in response")
 
         return PlatformTracks(
-            tracks=[MusicTrack(**track) for track in data["results"] if track]
+            tracks=[MusicTrack.from_dict(track) for track in data["results"] if track]
         )
+
+
+service_registry.register("jiosaavn", JiosaavnData)
@@ -0,0 +1,335 @@
+#  Copyright (c) 2025 AshokShau
+#  Licensed under the GNU AGPL v3.0: https://www.gnu.org/licenses/agpl-3.0.html
+#  Part of the TgMusicBot project. All rights reserved where applicable.
+
+import asyncio
+import json
+import os
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Optional, Union
+
+from TgMusic.logger import LOGGER
+from TgMusic.modules.utils import probe_media
+
+from ._cacher import chat_cache
+from ._config import config
+from ._coordinator import DownloadKey
+
+
+@dataclass
+class CacheEntry:
+    path: str
+    size: int
+    codec: str = ""
+    duration: int = 0
+    last_access: float = 0.0
+    hits: int = 0
+
+
+class MediaCache:
+    """
+    Size-bounded on-disk cache of downloaded media.
+
+    Every file a service downloads into ``DOWNLOADS_DIR`` is recorded in a
+    JSON index (track key -> path, size, codec, duration, last access, hit
+    count) that survives restarts. Once the total size exceeds the byte
+    budget, entries are evicted by LRU or LFU order. Files that are queued
+    in an active chat are never evicted.
+    """
+
+    INDEX_NAME = ".index.json"
+    SAVE_DELAY = 5
+
+    def __init__(
+        self, directory: Path, max_bytes: int = 0, policy: str = "lru"
+    ) -> None:
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.policy = policy if policy in ("lru", "lfu") else "lru"
+        self._index_path = directory / self.INDEX_NAME
+        self._entries: dict[str, CacheEntry] = {}
+        self._total_bytes = 0
+        self._lock = asyncio.Lock()
+        self._save_task: Optional[asyncio.Task] = None
+        # Replaced files that were still playing when their entry moved on
+        self._orphans: set[str] = set()
+
+        self.hits = 0
+        self.misses = 0
+        self.evicted_files = 0
+        self.evicted_bytes = 0
+
+        self._load()
+
+    @staticmethod
+    def make_key(key: DownloadKey) -> str:
+        platform, track_id, video = key
+        return f"{platform}:{track_id}:{'video' if video else 'audio'}"
+
+    def __contains__(self, key: DownloadKey) -> bool:
+        """Whether a track is indexed, without counting a hit or miss."""
+        return self.make_key(key) in self._entries
+
+    def _load(self) -> None:
+        if not self._index_path.exists():
+            return
+
+        try:
+            with open(self._index_path, "r", encoding="utf-8") as f:
+                raw = json.load(f)
+        except Exception as e:
+            LOGGER.warning("Failed to read media cache index: %s", e)
+            return
+
+        for key, data in raw.items():
+            try:
+                entry = CacheEntry(**data)
+            except TypeError:
+                continue
+            if os.path.isfile(entry.path):
+                self._entries[key] = entry
+                self._total_bytes += entry.size
+
+        LOGGER.info(
+            "Loaded media cache index: %d files, %.2f MiB",
+            len(self._entries),
+            self._total_bytes / (1024 * 1024),
+        )
+
+    def _write_index(self, snapshot: dict[str, dict[str, Any]]) -> None:
+        tmp_path = self._index_path.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(snapshot, f)
+        os.replace(tmp_path, self._index_path)
+
+    async def save(self) -> None:
+        """Persist the index to disk."""
+        snapshot = {key: asdict(entry) for key, entry in self._entries.items()}
+        try:
+            await asyncio.to_thread(self._write_index, snapshot)
+        except Exception as e:
+            LOGGER.warning("Failed to write media cache index: %s", e)
+
+    async def _delayed_save(self) -> None:
+        await asyncio.sleep(self.SAVE_DELAY)
+        await self.save()
+
+    def _schedule_save(self) -> None:
+        if self._save_task is None or self._save_task.done():
+            self._save_task = asyncio.create_task(self._delayed_save())
+
+    def get(self, key: DownloadKey) -> Optional[Path]:
+        """
+        Look up a cached file.
+
+        Args:
+            key (DownloadKey): Identity of the track.
+
+        Returns:
+            Optional[Path]: Path of the cached file, or None on a miss.
+        """
+        cache_key = self.make_key(key)
+        entry = self._entries.get(cache_key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        if not os.path.isfile(entry.path):
+            self._drop(cache_key)
+            self.misses += 1
+            self._schedule_save()
+            return None
+
+        entry.last_access = time.time()
+        entry.hits += 1
+        self.hits += 1
+        self._schedule_save()
+        return Path(entry.path)
+
+    async def put(self, key: DownloadKey, path: Union[str, Path]) -> Path:
+        """
+        Record a freshly downloaded file and evict older files if needed.
+
+        Files outside the cache directory (e.g. TDLib downloads) are left alone.
+
+        Args:
+            key (DownloadKey): Identity of the track.
+            path (Union[str, Path]): Location of the downloaded file.
+
+        Returns:
+            Path: The recorded path.
+        """
+        path = Path(path)
+        if not path.resolve().is_relative_to(self.directory.resolve()):
+            return path
+
+        try:
+            size = path.stat().st_size
+        except OSError as e:
+            LOGGER.warning("Not caching %s: %s", path, e)
+            return path
+
+        info = await probe_media(path)
+        streams = info.get("streams") or [{}]
+        try:
+            duration = int(float(info.get("format", {}).get("duration", 0)))
+        except (TypeError, ValueError):
+            duration = 0
+
+        cache_key = self.make_key(key)
+        async with self._lock:
+            self._drop(cache_key)
+            self._entries[cache_key] = CacheEntry(
+                path=str(path),
+                size=size,
+                codec=streams[0].get("codec_name", ""),
+                duration=duration,
+                last_access=time.time(),
+            )
+            self._total_bytes += size
+            await self._evict(keep=cache_key)
+
+        await self.save()
+        return path
+
+    async def replace(self, key: DownloadKey, path: Path) -> bool:
+        """
+        Point an entry at a re-encoded copy of its file and drop the original.
+
+        Queued tracks that are not currently playing are switched to the new
+        file right away; the original is removed once nothing plays it.
+
+        Args:
+            key (DownloadKey): Identity of the track.
+            path (Path): The replacement file.
+
+        Returns:
+            bool: Whether the entry now points at ``path``; False if the
+                track is no longer cached.
+        """
+        cache_key = self.make_key(key)
+        async with self._lock:
+            old = self._entries.get(cache_key)
+            if old is None:
+                return False
+            if old.path == str(path):
+                return True
+
+            info = await probe_media(path)
+            streams = info.get("streams") or [{}]
+            self._drop(cache_key)
+            self._entries[cache_key] = CacheEntry(
+                path=str(path),
+                size=path.stat().st_size,
+                codec=streams[0].get("codec_name", ""),
+                duration=old.duration,
+                last_access=old.last_access,
+                hits=old.hits,
+            )
+            self._total_bytes += self._entries[cache_key].size
+
+            for chat_id in chat_cache.get_active_chats():
+                for track in chat_cache.get_queue(chat_id)[1:]:
+                    if str(track.file_path) == old.path:
+                        track.file_path = path
+
+            self._orphans.add(old.path)
+            await self._remove_orphans()
+            await self._evict(keep=cache_key)
+
+        await self.save()
+        return True
+
+    async def _remove_orphans(self) -> None:
+        pinned = self._pinned_paths()
+        for orphan in list(self._orphans - pinned):
+            self._orphans.discard(orphan)
+            try:
+                await asyncio.to_thread(os.remove, orphan)
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                LOGGER.warning("Failed to remove replaced file %s: %s", orphan, e)
+
+    def _drop(self, cache_key: str) -> Optional[CacheEntry]:
+        entry = self._entries.pop(cache_key, None)
+        if entry:
+            self._total_bytes -= entry.size
+        return entry
+
+    def _victim_order(self, entry: CacheEntry) -> tuple:
+        if self.policy == "lfu":
+            return entry.hits, entry.last_access
+        return (entry.last_access,)
+
+    @staticmethod
+    def _pinned_paths() -> set[str]:
+        return {
+            str(track.file_path)
+            for chat_id in chat_cache.get_active_chats()
+            for track in chat_cache.get_queue(chat_id)
+            if track.file_path
+        }
+
+    async def _evict(self, keep: str) -> None:
+        if self._orphans:
+            await self._remove_orphans()
+
+        if not self.max_bytes or self._total_bytes <= self.max_bytes:
+            return
+
+        pinned = self._pinned_paths()
+        candidates = sorted(
+            (
+                (key, entry)
+                for key, entry in self._entries.items()
+                if key != keep and entry.path not in pinned
+            ),
+            key=lambda item: self._victim_order(item[1]),
+        )
+        for key, entry in candidates:
+            if self._total_bytes <= self.max_bytes:
+                break
+
+            self._drop(key)
+            try:
+                await asyncio.to_thread(os.remove, entry.path)
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                LOGGER.warning("Failed to evict %s: %s", entry.path, e)
+                continue
+
+            self.evicted_files += 1
+            self.evicted_bytes += entry.size
+            LOGGER.debug(
+                "Evicted %s (%d bytes) from media cache", entry.path, entry.size
+            )
+
+    async def close(self) -> None:
+        if self._save_task and not self._save_task.done():
+            self._save_task.cancel()
+        await self.save()
+
+    def stats(self) -> dict[str, Union[int, float, str]]:
+        lookups = self.hits + self.misses
+        return {
+            "files": len(self._entries),
+            "bytes": self._total_bytes,
+            "max_bytes": self.max_bytes,
+            "policy": self.policy,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evicted_files": self.evicted_files,
+            "evicted_bytes": self.evicted_bytes,
+        }
+
+
+media_cache = MediaCache(
+    config.DOWNLOADS_DIR,
+    max_bytes=config.MEDIA_CACHE_SIZE_MB * 1024 * 1024,
+    policy=config.MEDIA_CACHE_POLICY,
+)
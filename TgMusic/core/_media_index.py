@@ -0,0 +1,191 @@
+#  Copyright (c) 2025 AshokShau
+#  Licensed under the GNU AGPL v3.0: https://www.gnu.org/licenses/agpl-3.0.html
+#  Part of the TgMusicBot project. All rights reserved where applicable.
+
+import asyncio
+import os
+import re
+from bisect import bisect_right
+from pathlib import Path
+from typing import Optional, Union
+
+from cachetools import LRUCache
+
+from TgMusic.logger import LOGGER
+from TgMusic.modules.utils import probe_media
+
+# Elementary streams that can be entered at any packet boundary by skipping bytes
+BYTE_SEEKABLE_FORMATS = {"mp3", "aac"}
+# Minimum spacing in seconds between indexed seek points
+INDEX_RESOLUTION = 1.0
+
+# A file's path and whether its video stream is indexed
+IndexKey = tuple[str, bool]
+
+
+class MediaIndex:
+    """Seek points (keyframe time and byte offset) and exact duration of a file."""
+
+    __slots__ = ("duration", "format_name", "times", "offsets")
+
+    def __init__(
+        self,
+        duration: float,
+        format_name: str,
+        times: list[float],
+        offsets: list[int],
+    ) -> None:
+        self.duration = duration
+        self.format_name = format_name
+        self.times = times
+        self.offsets = offsets
+
+    def keyframe_before(self, position: float) -> tuple[float, int]:
+        """Return the last seek point at or before ``position``."""
+        i = bisect_right(self.times, position) - 1
+        if i < 0:
+            return 0.0, 0
+        return self.times[i], self.offsets[i]
+
+    def seek_args(self, position: float, video: bool) -> tuple[float, str]:
+        """
+        Input-side ffmpeg options that start playback near ``position``.
+
+        Raw MP3/AAC streams are entered by skipping straight to the byte
+        offset, so ffmpeg never parses what comes before. Video is started
+        on the keyframe, avoiding decoding and discarding a GOP. Other
+        audio seeks to the exact position through the demuxer.
+
+        Returns:
+            The position playback actually starts at, and the options.
+        """
+        keyframe, offset = self.keyframe_before(position)
+        if self.format_name in BYTE_SEEKABLE_FORMATS and offset > 0:
+            return keyframe, f"-skip_initial_bytes {offset}"
+        if video:
+            return keyframe, f"-ss {keyframe:.3f}"
+        return position, f"-ss {position:.3f}"
+
+
+class MediaIndexer:
+    """
+    Builds a ``MediaIndex`` once per local file and stream, in the background.
+
+    Audio and video playback seek on different packets (any audio packet
+    versus video keyframes), so a file played both ways gets an index for
+    each, keyed by ``(path, video)``.
+
+    Packets are read with ffprobe without decoding, and keyframes at most
+    ``INDEX_RESOLUTION`` seconds apart are kept, so the index of a
+    multi-hour mix stays small.
+    """
+
+    def __init__(self, maxsize: int = 256) -> None:
+        self._indexes: LRUCache[IndexKey, MediaIndex] = LRUCache(maxsize=maxsize)
+        self._tasks: dict[IndexKey, asyncio.Task] = {}
+        self.built = 0
+        self.failed = 0
+
+    def get(self, path: Union[str, Path], video: bool) -> Optional[MediaIndex]:
+        return self._indexes.get((str(path), video))
+
+    def schedule(self, path: Union[str, Path], video: bool) -> None:
+        """Index a local file in the background unless already done."""
+        key = (str(path), video)
+        if (
+            re.match("^https?://", key[0])
+            or key in self._indexes
+            or key in self._tasks
+            or not os.path.exists(key[0])
+        ):
+            return
+
+        task = asyncio.create_task(self._build(key))
+        self._tasks[key] = task
+        task.add_done_callback(lambda _: self._tasks.pop(key, None))
+
+    async def _build(self, key: IndexKey) -> None:
+        path, video = key
+        try:
+            index = await self.build(path, video)
+        except Exception as e:
+            LOGGER.warning("Indexing %s failed: %s", path, e)
+            index = None
+
+        if index is None:
+            self.failed += 1
+            return
+
+        self._indexes[key] = index
+        self.built += 1
+        LOGGER.debug("Indexed %s: %d seek points", path, len(index.times))
+
+    @staticmethod
+    async def build(path: str, video: bool) -> Optional[MediaIndex]:
+        """
+        Read a file's packets and build its index.
+
+        Args:
+            path (str): Local media file.
+            video (bool): Index the video stream's keyframes instead of audio.
+
+        Returns:
+            Optional[MediaIndex]: The index, or None if probing failed.
+        """
+        info = await probe_media(path)
+        try:
+            duration = float(info["format"]["duration"])
+            format_name = info["format"]["format_name"].split(",")[0]
+        except (KeyError, TypeError, ValueError):
+            return None
+
+        process = await asyncio.create_subprocess_exec(
+            "ffprobe",
+            "-v",
+            "quiet",
+            "-select_streams",
+            "v:0" if video else "a:0",
+            "-show_entries",
+            "packet=pts_time,pos,flags",
+            "-of",
+            "csv=p=0",
+            path,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL,
+        )
+
+        times: list[float] = []
+        offsets: list[int] = []
+        next_point = 0.0
+        try:
+            async for line in process.stdout:
+                fields = line.decode().strip().split(",")
+                if len(fields) < 3 or not fields[2].startswith("K"):
+                    continue
+                try:
+                    pts, pos = float(fields[0]), int(fields[1])
+                except ValueError:
+                    continue
+                if pts >= next_point:
+                    times.append(pts)
+                    offsets.append(pos)
+                    next_point = pts + INDEX_RESOLUTION
+        except BaseException:
+            if process.returncode is None:
+                process.kill()
+            raise
+        finally:
+            await process.wait()
+
+        return MediaIndex(duration, format_name, times, offsets)
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "files": len(self._indexes),
+            "pending": len(self._tasks),
+            "built": self.built,
+            "failed": self.failed,
+        }
+
+
+media_indexer = MediaIndexer()
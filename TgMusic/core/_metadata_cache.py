@@ -0,0 +1,245 @@
+#  Copyright (c) 2025 AshokShau
+#  Licensed under the GNU AGPL v3.0: https://www.gnu.org/licenses/agpl-3.0.html
+#  Part of the TgMusicBot project. All rights reserved where applicable.
+
+import asyncio
+import time
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Optional, Union
+
+from cachetools import LRUCache
+from pytdbot import types
+
+from TgMusic.logger import LOGGER
+from ._config import config
+from ._database import db
+from ._dataclass import PlatformTracks, TrackInfo
+
+MetadataResult = Union[PlatformTracks, TrackInfo, types.Error]
+
+
+class _Entry:
+    __slots__ = ("value", "fresh_until", "stale_until")
+
+    def __init__(self, value: MetadataResult, fresh_until: float, stale_until: float):
+        self.value = value
+        self.fresh_until = fresh_until
+        self.stale_until = stale_until
+
+
+class MetadataCache:
+    """
+    Tiered cache for ``search``, ``get_info`` and ``get_track`` results.
+
+    Results live in an in-memory LRU with per-kind TTLs and, when
+    ``METADATA_CACHE_PERSIST`` is enabled, in a Mongo collection that
+    survives restarts. "Not found" errors are cached briefly as negative
+    entries; other errors are never cached. After its TTL an entry stays
+    usable for a grace period: it is returned immediately while a single
+    background refresh replaces it. Track lookups carry expiring CDN
+    URLs, so they have a short TTL and no grace period.
+    """
+
+    MODELS: dict[str, type[Union[PlatformTracks, TrackInfo]]] = {
+        "search": PlatformTracks,
+        "info": PlatformTracks,
+        "track": TrackInfo,
+    }
+
+    def __init__(
+        self,
+        maxsize: int,
+        ttl: int,
+        track_ttl: int,
+        stale_ttl: int,
+        negative_ttl: int,
+        persist: bool = False,
+    ) -> None:
+        self._memory: LRUCache[str, _Entry] = LRUCache(maxsize=maxsize)
+        self._ttls = {
+            "search": (ttl, stale_ttl),
+            "info": (ttl, stale_ttl),
+            "track": (track_ttl, 0),
+        }
+        self.negative_ttl = negative_ttl
+        self.persist = persist
+        self._inflight: dict[str, asyncio.Task] = {}
+        self._refreshing: dict[str, asyncio.Task] = {}
+
+        self.hits = 0
+        self.stale_hits = 0
+        self.negative_hits = 0
+        self.persistent_hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(kind: str, identity: str) -> str:
+        return f"{kind}:{identity}"
+
+    def _store(self, kind: str, key: str, value: MetadataResult) -> Optional[_Entry]:
+        now = time.time()
+        if isinstance(value, types.Error):
+            if value.code != 404:
+                return None
+            entry = _Entry(value, now + self.negative_ttl, now + self.negative_ttl)
+        else:
+            ttl, stale_ttl = self._ttls[kind]
+            entry = _Entry(value, now + ttl, now + ttl + stale_ttl)
+
+        self._memory[key] = entry
+        return entry
+
+    def seed(
+        self, kind: str, identity: str, value: Union[PlatformTracks, TrackInfo]
+    ) -> None:
+        """
+        Store a result obtained elsewhere, unless a fresh entry already exists.
+
+        Args:
+            kind (str): "search", "info" or "track".
+            identity (str): Normalized URL, track id or query.
+            value: The result to cache.
+        """
+        key = self.make_key(kind, identity)
+        entry = self._memory.get(key)
+        if entry is None or entry.fresh_until <= time.time():
+            self._store(kind, key, value)
+
+    async def get_or_fetch(
+        self,
+        kind: str,
+        identity: str,
+        fetch: Callable[[], Awaitable[MetadataResult]],
+    ) -> MetadataResult:
+        """
+        Return a cached result, or fetch and cache it.
+
+        Concurrent misses for the same key share one upstream call.
+
+        Args:
+            kind (str): "search", "info" or "track".
+            identity (str): Normalized URL, track id or query.
+            fetch (Callable): Zero-argument coroutine factory doing the lookup.
+
+        Returns:
+            The cached or freshly fetched result.
+        """
+        key = self.make_key(kind, identity)
+        now = time.time()
+
+        entry = self._memory.get(key)
+        if entry is not None and entry.stale_until > now:
+            if isinstance(entry.value, types.Error):
+                self.negative_hits += 1
+            elif entry.fresh_until > now:
+                self.hits += 1
+            else:
+                self.stale_hits += 1
+                self._refresh(kind, key, fetch)
+            return entry.value
+
+        if key not in self._inflight:
+            task = asyncio.create_task(self._load(kind, key, fetch))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        return await asyncio.shield(self._inflight[key])
+
+    async def _load(
+        self, kind: str, key: str, fetch: Callable[[], Awaitable[MetadataResult]]
+    ) -> MetadataResult:
+        if self.persist and (value := await self._load_persistent(kind, key)):
+            self.persistent_hits += 1
+            if self._memory[key].fresh_until <= time.time():
+                self._refresh(kind, key, fetch)
+            return value
+
+        self.misses += 1
+        value = await fetch()
+        if (entry := self._store(kind, key, value)) and self.persist:
+            if not isinstance(value, types.Error):
+                await self._save_persistent(kind, key, entry)
+        return value
+
+    def _refresh(
+        self, kind: str, key: str, fetch: Callable[[], Awaitable[MetadataResult]]
+    ) -> None:
+        if key in self._refreshing:
+            return
+
+        async def _run() -> None:
+            try:
+                value = await fetch()
+                if isinstance(value, types.Error):
+                    return
+                entry = self._store(kind, key, value)
+                if entry and self.persist:
+                    await self._save_persistent(kind, key, entry)
+            except Exception as e:
+                LOGGER.warning("Metadata refresh failed for %s: %s", key, e)
+            finally:
+                self._refreshing.pop(key, None)
+
+        self._refreshing[key] = asyncio.create_task(_run())
+
+    async def _load_persistent(
+        self, kind: str, key: str
+    ) -> Optional[Union[PlatformTracks, TrackInfo]]:
+        doc = await db.get_metadata(key)
+        if not doc:
+            return None
+
+        now = time.time()
+        if doc.get("stale_until", 0) <= now:
+            return None
+
+        try:
+            value = self.MODELS[kind].from_dict(doc["value"])
+        except Exception as e:
+            LOGGER.warning("Discarding malformed metadata for %s: %s", key, e)
+            return None
+
+        self._memory[key] = _Entry(value, doc["fresh_until"], doc["stale_until"])
+        return value
+
+    async def _save_persistent(self, kind: str, key: str, entry: _Entry) -> None:
+        await db.set_metadata(
+            key,
+            {
+                "kind": kind,
+                "value": entry.value.to_dict(),
+                "fresh_until": entry.fresh_until,
+                "stale_until": entry.stale_until,
+                "expires_at": datetime.fromtimestamp(entry.stale_until, timezone.utc),
+            },
+        )
+
+    def stats(self) -> dict[str, Any]:
+        lookups = (
+            self.hits
+            + self.stale_hits
+            + self.negative_hits
+            + self.persistent_hits
+            + self.misses
+        )
+        served = lookups - self.misses
+        return {
+            "size": len(self._memory),
+            "maxsize": self._memory.maxsize,
+            "persist": self.persist,
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "negative_hits": self.negative_hits,
+            "persistent_hits": self.persistent_hits,
+            "misses": self.misses,
+            "hit_rate": served / lookups if lookups else 0.0,
+        }
+
+
+metadata_cache = MetadataCache(
+    maxsize=config.METADATA_CACHE_SIZE,
+    ttl=config.METADATA_CACHE_TTL,
+    track_ttl=config.METADATA_TRACK_TTL,
+    stale_ttl=config.METADATA_STALE_TTL,
+    negative_ttl=config.METADATA_NEGATIVE_TTL,
+    persist=config.METADATA_CACHE_PERSIST,
+)
@@ -0,0 +1,117 @@
+#  Copyright (c) 2025 AshokShau
+#  Licensed under the GNU AGPL v3.0: https://www.gnu.org/licenses/agpl-3.0.html
+#  Part of the TgMusicBot project. All rights reserved where applicable.
+
+import random
+import time
+from collections import deque
+from typing import Any, Optional
+
+from ._cacher import chat_cache
+
+
+class AssistantLoad:
+    __slots__ = ("audio", "video", "errors")
+
+    def __init__(self) -> None:
+        self.audio: set[int] = set()
+        self.video: set[int] = set()
+        self.errors: deque[float] = deque()
+
+
+class AssistantBalancer:
+    """
+    Chooses which assistant (userbot session) serves a new chat.
+
+    An assistant's score is its live audio calls plus its live video calls
+    weighted by ``VIDEO_WEIGHT``, plus ``ERROR_PENALTY`` for each playback
+    error in the last ``ERROR_WINDOW`` seconds. All sessions share one
+    process and one ffmpeg CPU budget that cannot be attributed per
+    session, so the video weight stands in for each assistant's CPU share.
+    Calls are only counted while the chat is active, so chats cleared
+    without going through ``release`` stop counting on their own.
+    """
+
+    VIDEO_WEIGHT = 3.0
+    ERROR_PENALTY = 2.0
+    ERROR_WINDOW = 600
+    # Score margin over the average before an assistant counts as overloaded
+    HOT_MARGIN = 1.0
+
+    def __init__(self) -> None:
+        self._loads: dict[str, AssistantLoad] = {}
+        self._chats: dict[int, str] = {}
+
+    def _load(self, name: str) -> AssistantLoad:
+        if name not in self._loads:
+            self._loads[name] = AssistantLoad()
+        return self._loads[name]
+
+    def _prune(self, load: AssistantLoad) -> None:
+        for chats in (load.audio, load.video):
+            for chat_id in [c for c in chats if not chat_cache.is_active(c)]:
+                chats.discard(chat_id)
+                self._chats.pop(chat_id, None)
+
+        cutoff = time.monotonic() - self.ERROR_WINDOW
+        while load.errors and load.errors[0] < cutoff:
+            load.errors.popleft()
+
+    def score(self, name: str) -> float:
+        load = self._load(name)
+        self._prune(load)
+        return (
+            len(load.audio)
+            + len(load.video) * self.VIDEO_WEIGHT
+            + len(load.errors) * self.ERROR_PENALTY
+        )
+
+    def pick(self, candidates: list[str]) -> Optional[str]:
+        """Return the least loaded candidate, breaking ties at random."""
+        if not candidates:
+            return None
+        scores = {name: self.score(name) for name in candidates}
+        lowest = min(scores.values())
+        return random.choice([name for name, s in scores.items() if s == lowest])
+
+    def overloaded(self, candidates: list[str]) -> list[str]:
+        """Assistants whose score is well above the average of ``candidates``."""
+        if len(candidates) < 2:
+            return []
+        scores = {name: self.score(name) for name in candidates}
+        average = sum(scores.values()) / len(scores)
+        return [name for name, s in scores.items() if s > average + self.HOT_MARGIN]
+
+    def assign(self, name: str, chat_id: int, video: bool) -> None:
+        """Record that ``name`` is streaming in ``chat_id``."""
+        self.release(chat_id)
+        load = self._load(name)
+        (load.video if video else load.audio).add(chat_id)
+        self._chats[chat_id] = name
+
+    def release(self, chat_id: int) -> None:
+        """Record that the call in ``chat_id`` ended."""
+        if (name := self._chats.pop(chat_id, None)) is None:
+            return
+        load = self._load(name)
+        load.audio.discard(chat_id)
+        load.video.discard(chat_id)
+
+    def record_error(self, name: str) -> None:
+        self._load(name).errors.append(time.monotonic())
+
+    def stats(self, candidates: list[str]) -> dict[str, dict[str, Any]]:
+        result = {}
+        for name in candidates:
+            score = self.score(name)
+            load = self._load(name)
+            result[name] = {
+                "audio": len(load.audio),
+                "video": len(load.video),
+                "errors": len(load.errors),
+                "score": score,
+            }
+        return result
+
+
+assistant_balancer = AssistantBalancer()
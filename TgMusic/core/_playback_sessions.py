@@ -0,0 +1,253 @@
+#  Copyright (c) 2025 AshokShau
+#  Licensed under the GNU AGPL v3.0: https://www.gnu.org/licenses/agpl-3.0.html
+#  Part of the TgMusicBot project. All rights reserved where applicable.
+
+import asyncio
+import time
+from typing import TYPE_CHECKING, Any, Optional
+
+from pytdbot import types
+
+from TgMusic.logger import LOGGER
+from ._cacher import chat_cache
+from ._config import config
+from ._database import db
+
+if TYPE_CHECKING:
+    from ._tgcalls import Calls
+
+
+class PlaybackSessions:
+    """
+    Snapshots active playback and resumes it after a restart.
+
+    Every ``interval`` seconds, and once more on shutdown or ``/restart``,
+    each active chat's queue (loop counts included), position in the
+    current track, speed, paused state and assistant are written to the
+    ``sessions`` collection. On startup, sessions saved less than
+    ``max_age`` seconds ago are resumed at their position, ``concurrency``
+    at a time and with call joins spaced ``RESTORE_SPACING`` seconds apart,
+    so a mass rejoin stays clear of flood waits. Chats whose queue was already restored by
+    the state backend keep that (fresher) queue and only take the
+    position from the snapshot.
+    """
+
+    RESTORE_SPACING = 1.0
+
+    def __init__(self, interval: int, concurrency: int, max_age: int) -> None:
+        self.interval = interval
+        self.concurrency = max(1, concurrency)
+        self.max_age = max_age
+
+        self._calls: Optional["Calls"] = None
+        self._task: Optional[asyncio.Task] = None
+        self._restore_task: Optional[asyncio.Task] = None
+        # Sessions still being resumed, saved as they are until they play
+        self._restoring: dict[int, dict[str, Any]] = {}
+        self._pace = asyncio.Lock()
+        self._next_join = 0.0
+
+        self.saved = 0
+        self.resumed = 0
+        self.failed = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.interval > 0
+
+    def is_restoring(self, chat_id: int) -> bool:
+        return chat_id in self._restoring
+
+    async def _snapshot(self, chat_id: int) -> Optional[dict[str, Any]]:
+        position = await self._calls.played_time(chat_id)
+        if isinstance(position, types.Error):
+            position = self._calls.positions.position(chat_id) or 0
+
+        # played_time clears chats whose call is gone
+        state = chat_cache.snapshot(chat_id)
+        if not state or not state["queue"]:
+            return None
+
+        entry = self._calls.positions.get(chat_id)
+        return {
+            "_id": chat_id,
+            "queue": state["queue"],
+            "position": float(position),
+            "speed": self._calls.positions.speed(chat_id),
+            "paused": entry is not None and entry.paused_at is not None,
+            "assistant": await db.get_assistant(chat_id),
+            "saved_at": time.time(),
+        }
+
+    async def save(self) -> int:
+        """Snapshot every active chat now.
+
+        Returns:
+            int: Number of sessions saved
+        """
+        if not self.enabled or self._calls is None:
+            return 0
+
+        chat_ids = [
+            c for c in chat_cache.get_active_chats() if c not in self._restoring
+        ]
+        snapshots = await asyncio.gather(*(self._snapshot(c) for c in chat_ids))
+        sessions = [s for s in snapshots if s] + list(self._restoring.values())
+        await db.save_sessions(sessions)
+        self.saved = len(sessions)
+        return self.saved
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.save()
+            except Exception as e:
+                LOGGER.error("Playback snapshot failed: %s", e, exc_info=True)
+
+    def start(self, calls: "Calls") -> None:
+        self._calls = calls
+        if self.enabled and (self._task is None or self._task.done()):
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop snapshotting after saving the sessions one last time."""
+        if self._task:
+            self._task.cancel()
+            self._task = None
+        if self._restore_task:
+            self._restore_task.cancel()
+            self._restore_task = None
+        try:
+            await self.save()
+        except Exception as e:
+            LOGGER.error("Final playback snapshot failed: %s", e)
+
+    async def restore(self, restored: list[int]) -> None:
+        """
+        Resume the saved sessions in the background.
+
+        Args:
+            restored (list[int]): Playing chats whose queue the state
+                backend already restored.
+        """
+        sessions = (
+            {s["_id"]: s for s in await db.get_sessions()} if self.enabled else {}
+        )
+        cutoff = time.time() - self.max_age
+        to_resume: dict[int, tuple[float, float, bool]] = {}
+
+        for chat_id in restored:
+            to_resume[chat_id] = (0.0, 1.0, False)
+
+        for chat_id, session in sessions.items():
+            if session.get("saved_at", 0) < cutoff or not session.get("queue"):
+                continue
+
+            if chat_id in to_resume:
+                # Keep the newer queue; the position only applies to the same track
+                playing = chat_cache.get_playing_track(chat_id)
+                if not playing or playing.url != session["queue"][0].get("url"):
+                    continue
+            elif not chat_cache.load_chat(
+                chat_id, {"active": True, "queue": session["queue"]}
+            ):
+                continue
+
+            assistant = session.get("assistant")
+            if assistant and assistant in self._calls.available_clients:
+                await db.set_assistant(chat_id, assistant)
+            self._restoring[chat_id] = session
+            to_resume[chat_id] = (
+                session.get("position", 0.0),
+                session.get("speed", 1.0),
+                session.get("paused", False),
+            )
+
+        if not to_resume:
+            return
+
+        LOGGER.info("Resuming playback in %d chats", len(to_resume))
+        slots = asyncio.Semaphore(self.concurrency)
+        self._restore_task = asyncio.create_task(self._resume_all(slots, to_resume))
+
+    async def _resume_all(
+        self,
+        slots: asyncio.Semaphore,
+        to_resume: dict[int, tuple[float, float, bool]],
+    ) -> None:
+        await asyncio.gather(
+            *(
+                self._resume(slots, chat_id, *session)
+                for chat_id, session in to_resume.items()
+            ),
+            return_exceptions=True,
+        )
+        self._restore_task = None
+
+    async def _paced(self) -> None:
+        async with self._pace:
+            loop = asyncio.get_running_loop()
+            if (wait := self._next_join - loop.time()) > 0:
+                await asyncio.sleep(wait)
+            self._next_join = loop.time() + self.RESTORE_SPACING
+
+    async def _resume(
+        self,
+        slots: asyncio.Semaphore,
+        chat_id: int,
+        position: float,
+        speed: float,
+        paused: bool,
+    ) -> None:
+        try:
+            async with slots:
+                await self._paced()
+                result = await self._calls.resume_session(chat_id, position, speed)
+                if paused and not isinstance(result, types.Error):
+                    # Joining a call always starts playing
+                    if isinstance(
+                        pause := await self._calls.pause(chat_id), types.Error
+                    ):
+                        LOGGER.warning(
+                            "Could not pause resumed playback in %s: %s",
+                            chat_id,
+                            pause.message,
+                        )
+        except Exception as e:
+            result = types.Error(code=500, message=str(e))
+        finally:
+            self._restoring.pop(chat_id, None)
+
+        if isinstance(result, types.Error):
+            self.failed += 1
+            LOGGER.warning(
+                "Could not resume playback in %s: %s", chat_id, result.message
+            )
+            chat_cache.clear_chat(chat_id)
+            return
+
+        self.resumed += 1
+        if track := chat_cache.get_playing_track(chat_id):
+            text = (
+                f"⏸️ Restored <b>{track.name}</b> (paused) after a restart."
+                if paused
+                else f"▶️ Resumed <b>{track.name}</b> after a restart."
+            )
+            await self._calls.bot.sendTextMessage(chat_id, text)
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "saved": self.saved,
+            "restoring": len(self._restoring),
+            "resumed": self.resumed,
+            "failed": self.failed,
+        }
+
+
+playback_sessions = PlaybackSessions(
+    interval=config.SNAPSHOT_INTERVAL,
+    concurrency=config.RESUME_CONCURRENCY,
+    max_age=config.RESUME_MAX_AGE,
+)
@@ -0,0 +1,72 @@
+#  Copyright (c) 2025 AshokShau
+#  Licensed under the GNU AGPL v3.0: https://www.gnu.org/licenses/agpl-3.0.html
+#  Part of the TgMusicBot project. All rights reserved where applicable.
+
+import time
+from pathlib import Path
+from typing import Optional, Union
+
+
+class PlaybackPosition:
+    __slots__ = ("source", "offset", "speed", "started_at", "paused_at")
+
+    def __init__(self, source: Union[str, Path], offset: float, speed: float) -> None:
+        self.source = source
+        self.offset = offset
+        self.speed = speed
+        self.started_at = time.monotonic()
+        self.paused_at: Optional[float] = None
+
+    @property
+    def position(self) -> float:
+        now = self.paused_at if self.paused_at is not None else time.monotonic()
+        return self.offset + (now - self.started_at) * self.speed
+
+
+class PositionTracker:
+    """
+    Tracks where in the current track each chat is.
+
+    The position is the offset the stream was started at plus the wall
+    time since then, scaled by the playback speed and excluding pauses.
+    Unlike the call's own timer it survives seeks, speed changes and
+    restarted streams.
+    """
+
+    def __init__(self) -> None:
+        self._positions: dict[int, PlaybackPosition] = {}
+
+    def start(
+        self,
+        chat_id: int,
+        source: Union[str, Path],
+        offset: float = 0.0,
+        speed: float = 1.0,
+    ) -> None:
+        """Record that ``source`` started playing at ``offset`` seconds."""
+        self._positions[chat_id] = PlaybackPosition(source, offset, speed)
+
+    def get(self, chat_id: int) -> Optional[PlaybackPosition]:
+        return self._positions.get(chat_id)
+
+    def position(self, chat_id: int) -> Optional[float]:
+        entry = self._positions.get(chat_id)
+        return entry.position if entry else None
+
+    def speed(self, chat_id: int) -> float:
+        entry = self._positions.get(chat_id)
+        return entry.speed if entry else 1.0
+
+    def pause(self, chat_id: int) -> None:
+        entry = self._positions.get(chat_id)
+        if entry and entry.paused_at is None:
+            entry.paused_at = time.monotonic()
+
+    def resume(self, chat_id: int) -> None:
+        entry = self._positions.get(chat_id)
+        if entry and entry.paused_at is not None:
+            entry.started_at += time.monotonic() - entry.paused_at
+            entry.paused_at = None
+
+    def clear(self, chat_id: int) -> None:
+        self._positions.pop(chat_id, None)
@@ -0,0 +1,113 @@
+#  Copyright (c) 2025 AshokShau
+#  Licensed under the GNU AGPL v3.0: https://www.gnu.org/licenses/agpl-3.0.html
+#  Part of the TgMusicBot project. All rights reserved where applicable.
+
+import asyncio
+from pathlib import Path
+from typing import Awaitable, Callable, Optional, Union
+
+from pytdbot import types
+
+from TgMusic.logger import LOGGER
+from ._cacher import chat_cache
+from ._dataclass import CachedTrack
+from ._scheduler import Priority, set_priority
+
+
+class Prefetcher:
+    """
+    Downloads upcoming queued tracks in the background while the current one plays.
+
+    When a prefetch finishes, the file path is stored on the queued
+    ``CachedTrack`` itself, so ``play_next`` finds the file ready. A prefetch
+    whose track is no longer among the next ``depth`` tracks is cancelled on
+    the next ``refresh``. ``on_ready`` is called with the chat ID after each
+    successful prefetch.
+    """
+
+    def __init__(
+        self,
+        download: Callable[[CachedTrack], Awaitable[Union[Path, types.Error]]],
+        depth: int = 1,
+        on_ready: Optional[Callable[[int], None]] = None,
+    ) -> None:
+        self._download = download
+        self.depth = depth
+        self._on_ready = on_ready
+        self._tasks: dict[int, dict[int, tuple[CachedTrack, asyncio.Task]]] = {}
+
+    def refresh(self, chat_id: int) -> None:
+        """
+        Sync background downloads with the chat's upcoming tracks.
+
+        Call this whenever the current track changes or the queue is modified.
+
+        Args:
+            chat_id (int): Target chat ID.
+        """
+        if self.depth <= 0:
+            return
+
+        upcoming = chat_cache.get_queue(chat_id)[1 : 1 + self.depth]
+        wanted = {id(track): track for track in upcoming if not track.file_path}
+        running = self._tasks.setdefault(chat_id, {})
+
+        for key, (_, task) in list(running.items()):
+            if key not in wanted:
+                task.cancel()
+                running.pop(key, None)
+
+        for key, track in wanted.items():
+            if key not in running:
+                task = asyncio.create_task(self._prefetch(chat_id, track))
+                running[key] = (track, task)
+
+        if not running:
+            self._tasks.pop(chat_id, None)
+
+    def cancel(self, chat_id: int) -> None:
+        """
+        Cancel every pending prefetch for a chat.
+
+        Args:
+            chat_id (int): Target chat ID.
+        """
+        for _, task in self._tasks.pop(chat_id, {}).values():
+            task.cancel()
+
+    async def _prefetch(self, chat_id: int, track: CachedTrack) -> None:
+        set_priority(Priority.PREFETCH)
+        try:
+            LOGGER.debug("Prefetching %s for chat %s", track.name, chat_id)
+            result = await self._download(track)
+            if isinstance(result, types.Error):
+                LOGGER.warning(
+                    "Prefetch failed for %s in chat %s: %s",
+                    track.name,
+                    chat_id,
+                    result.message,
+                )
+                return
+
+            if result and not track.file_path:
+                track.file_path = result
+                LOGGER.info("Prefetched %s for chat %s", track.name, chat_id)
+                if self._on_ready:
+                    self._on_ready(chat_id)
+        except asyncio.CancelledError:
+            LOGGER.debug("Prefetch of %s cancelled for chat %s", track.name, chat_id)
+            raise
+        except Exception as e:
+            LOGGER.error("Prefetch error for chat %s: %s", chat_id, e, exc_info=True)
+        finally:
+            running = self._tasks.get(chat_id)
+            if running and running.get(id(track), (None, None))[0] is track:
+                running.pop(id(track), None)
+                if not running:
+                    self._tasks.pop(chat_id, None)
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "chats": len(self._tasks),
+            "in_flight": sum(len(running) for running in self._tasks.values()),
+        }
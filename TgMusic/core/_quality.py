@@ -0,0 +1,206 @@
+#  Copyright (c) 2025 AshokShau
+#  Licensed under the GNU AGPL v3.0: https://www.gnu.org/licenses/agpl-3.0.html
+#  Part of the TgMusicBot project. All rights reserved where applicable.
+
+import asyncio
+from typing import TYPE_CHECKING, Any, Optional
+
+import psutil
+from pytdbot import types
+from pytgcalls.types import AudioQuality, VideoQuality
+
+from TgMusic.logger import LOGGER
+from ._cacher import chat_cache
+from ._config import config
+
+if TYPE_CHECKING:
+    from ._tgcalls import Calls
+
+# Presets from full quality (0) to the cheapest (3)
+QUALITY_LEVELS: list[tuple[AudioQuality, VideoQuality]] = [
+    (AudioQuality.STUDIO, VideoQuality.FHD_1080p),
+    (AudioQuality.HIGH, VideoQuality.HD_720p),
+    (AudioQuality.MEDIUM, VideoQuality.SD_480p),
+    (AudioQuality.LOW, VideoQuality.SD_360p),
+]
+LEVEL_NAMES = ["studio", "reduced", "economy", "minimal"]
+
+
+class QualityGovernor:
+    """
+    Picks stream presets for new calls from the load on the host.
+
+    Every ``interval`` seconds it samples host CPU, the number of active
+    calls, and ntgcalls' CPU usage and each assistant's ping. The level is
+    the highest one any signal calls for. CPU and call count are compared
+    against three thresholds each (reduced, economy, minimal), and a ping
+    above ``ping_limit`` asks for at least "reduced". Pressure lowers the
+    level at once; it is raised again one step at a time after
+    ``UPGRADE_AFTER`` calmer samples. With ``downgrade_running`` enabled,
+    streams started at a higher level than the current one are restarted
+    at their position with the cheaper preset, a few per sample; paused
+    streams are left alone and restarted when they are resumed.
+    """
+
+    UPGRADE_AFTER = 3
+    RESTARTS_PER_SAMPLE = 5
+
+    def __init__(
+        self,
+        cpu_thresholds: list[int],
+        call_thresholds: list[int],
+        ping_limit: int,
+        interval: int,
+        downgrade_running: bool = False,
+    ) -> None:
+        self.cpu_thresholds = cpu_thresholds
+        self.call_thresholds = call_thresholds
+        self.ping_limit = ping_limit
+        self.interval = interval
+        self.downgrade_running = downgrade_running
+
+        self.level = 0
+        self._calm_samples = 0
+        self._chat_levels: dict[int, int] = {}
+        self._task: Optional[asyncio.Task] = None
+        self.last_sample: dict[str, float] = {}
+        self.downgraded = 0
+
+    @staticmethod
+    def _threshold_level(value: float, thresholds: list[int]) -> int:
+        return sum(1 for limit in thresholds[:3] if value >= limit)
+
+    def presets(
+        self, video: bool, ready: bool = False
+    ) -> tuple[AudioQuality, VideoQuality]:
+        """
+        Return the audio and video presets for a new stream.
+
+        Video streams and transcoded files never go above the "reduced"
+        audio preset, since they carry 48 kHz audio at most.
+        """
+        audio_level = max(self.level, 1) if video or ready else self.level
+        video_level = max(self.level, 1) if ready else self.level
+        return QUALITY_LEVELS[audio_level][0], QUALITY_LEVELS[video_level][1]
+
+    def record(self, chat_id: int) -> None:
+        """Remember the level a chat's stream was started at."""
+        self._chat_levels[chat_id] = self.level
+
+    def forget(self, chat_id: int) -> None:
+        self._chat_levels.pop(chat_id, None)
+
+    def is_stale(self, chat_id: int) -> bool:
+        """Whether the chat's stream is due a restart at a cheaper preset."""
+        return (
+            self.downgrade_running
+            and self._chat_levels.get(chat_id, self.level) < self.level
+        )
+
+    async def sample(self, calls: "Calls") -> int:
+        """Take one load sample and update the level."""
+        host_cpu = psutil.cpu_percent(interval=None)
+        active = chat_cache.active_count
+
+        ntg_cpu = 0.0
+        max_ping = 0.0
+        for client in calls.calls.values():
+            try:
+                # ntgcalls reports one figure per process, so this differs
+                # between assistants only when they run in separate shards
+                ntg_cpu = max(ntg_cpu, await client.cpu_usage)
+                max_ping = max(max_ping, client.ping or 0.0)
+            except Exception as e:
+                LOGGER.debug("Failed to read call stats: %s", e)
+
+        wanted = max(
+            self._threshold_level(max(host_cpu, ntg_cpu), self.cpu_thresholds),
+            self._threshold_level(active, self.call_thresholds),
+            1 if max_ping >= self.ping_limit else 0,
+        )
+        self.last_sample = {
+            "cpu": host_cpu,
+            "ntgcalls_cpu": ntg_cpu,
+            "calls": active,
+            "ping": max_ping,
+        }
+
+        if wanted > self.level:
+            LOGGER.info(
+                "Stream quality lowered to %s (cpu %.0f%%, %d calls, ping %.0fms)",
+                LEVEL_NAMES[wanted],
+                max(host_cpu, ntg_cpu),
+                active,
+                max_ping,
+            )
+            self.level = wanted
+            self._calm_samples = 0
+        elif wanted < self.level:
+            self._calm_samples += 1
+            if self._calm_samples >= self.UPGRADE_AFTER:
+                self.level -= 1
+                self._calm_samples = 0
+                LOGGER.info("Stream quality raised to %s", LEVEL_NAMES[self.level])
+        else:
+            self._calm_samples = 0
+        return self.level
+
+    @staticmethod
+    def _is_video(chat_id: int) -> bool:
+        track = chat_cache.get_playing_track(chat_id)
+        return bool(track and track.is_video)
+
+    async def _downgrade_streams(self, calls: "Calls") -> None:
+        for chat_id in [c for c in self._chat_levels if not chat_cache.is_active(c)]:
+            self.forget(chat_id)
+
+        # Restarting a paused stream would start it playing again
+        stale = [
+            c
+            for c in self._chat_levels
+            if self.is_stale(c)
+            and getattr(calls.positions.get(c), "paused_at", None) is None
+        ]
+        # Video streams cost the most, so move them first
+        stale.sort(key=lambda c: not self._is_video(c))
+        for chat_id in stale[: self.RESTARTS_PER_SAMPLE]:
+            result = await calls.restart_stream(chat_id)
+            if not isinstance(result, types.Error):
+                self.downgraded += 1
+
+    async def _run(self, calls: "Calls") -> None:
+        psutil.cpu_percent(interval=None)  # prime the CPU counter
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.sample(calls)
+                if self.downgrade_running:
+                    await self._downgrade_streams(calls)
+            except Exception as e:
+                LOGGER.error("Quality governor error: %s", e, exc_info=True)
+
+    def start(self, calls: "Calls") -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run(calls))
+
+    def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            self._task = None
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "level": LEVEL_NAMES[self.level],
+            "downgrade_running": self.downgrade_running,
+            "downgraded": self.downgraded,
+            **self.last_sample,
+        }
+
+
+quality_governor = QualityGovernor(
+    cpu_thresholds=config.QUALITY_CPU_THRESHOLDS,
+    call_thresholds=config.QUALITY_CALL_THRESHOLDS,
+    ping_limit=config.QUALITY_PING_LIMIT,
+    interval=config.QUALITY_SAMPLE_INTERVAL,
+    downgrade_running=config.QUALITY_DOWNGRADE_RUNNING,
+)
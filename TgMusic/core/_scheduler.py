@@ -0,0 +1,193 @@
+#  Copyright (c) 2025 AshokShau
+#  Licensed under the GNU AGPL v3.0: https://www.gnu.org/licenses/agpl-3.0.html
+#  Part of the TgMusicBot project. All rights reserved where applicable.
+
+import asyncio
+import itertools
+import time
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from enum import IntEnum
+from typing import AsyncIterator, Optional, Union
+
+from TgMusic.logger import LOGGER
+from ._config import config
+
+
+class Priority(IntEnum):
+    """Download priority classes; lower values are served first."""
+
+    NOW = 0
+    PREFETCH = 1
+    BACKGROUND = 2
+
+
+class PriorityRef:
+    """Mutable priority shared by every slot request made from one task."""
+
+    __slots__ = ("value",)
+
+    def __init__(self, value: Priority) -> None:
+        self.value = value
+
+
+_current_priority: ContextVar[Optional[PriorityRef]] = ContextVar(
+    "download_priority", default=None
+)
+
+
+def current_priority() -> Priority:
+    ref = _current_priority.get()
+    return ref.value if ref else Priority.NOW
+
+
+def set_priority(priority: Union[Priority, PriorityRef]) -> PriorityRef:
+    """
+    Set the download priority for the current task.
+
+    Args:
+        priority (Union[Priority, PriorityRef]): New priority, or an existing
+            reference to share with another task.
+
+    Returns:
+        PriorityRef: The reference now bound to the task.
+    """
+    ref = priority if isinstance(priority, PriorityRef) else PriorityRef(priority)
+    _current_priority.set(ref)
+    return ref
+
+
+class _Waiter:
+    __slots__ = ("ref", "seq", "future", "enqueued_at")
+
+    def __init__(self, ref: PriorityRef, seq: int, future: asyncio.Future) -> None:
+        self.ref = ref
+        self.seq = seq
+        self.future = future
+        self.enqueued_at = time.monotonic()
+
+    def order(self) -> tuple[int, int]:
+        return self.ref.value, self.seq
+
+
+class _Source:
+    __slots__ = ("limit", "active", "waiters", "acquired", "total_wait", "max_wait")
+
+    def __init__(self, limit: int) -> None:
+        self.limit = max(1, limit)
+        self.active = 0
+        self.waiters: list[_Waiter] = []
+        self.acquired = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+
+class DownloadScheduler:
+    """
+    Caps how many downloads of each kind run at once.
+
+    Each source (yt-dlp processes, HTTP streams, Spotify pipelines, TDLib
+    downloads) has its own concurrency limit. When a source is saturated,
+    requests queue and are admitted by priority class, then by arrival.
+    The priority is read from the calling task, so playback paths default
+    to ``Priority.NOW`` while prefetch and warm-up tasks mark themselves
+    lower. A queued request follows its ``PriorityRef``, so boosting the
+    reference (e.g. when a listener starts waiting on a prefetch) takes
+    effect immediately.
+    """
+
+    def __init__(self, limits: dict[str, int]) -> None:
+        self._sources: dict[str, _Source] = {
+            name: _Source(limit) for name, limit in limits.items()
+        }
+        self._seq = itertools.count()
+
+    def _source(self, name: str) -> _Source:
+        if name not in self._sources:
+            self._sources[name] = _Source(1)
+        return self._sources[name]
+
+    @asynccontextmanager
+    async def slot(self, name: str) -> AsyncIterator[None]:
+        """
+        Hold one concurrency slot of a source for the duration of the block.
+
+        Args:
+            name (str): Source name, e.g. "yt-dlp" or "http".
+        """
+        source = self._source(name)
+        await self._acquire(name, source)
+        try:
+            yield
+        finally:
+            self._release(source)
+
+    async def _acquire(self, name: str, source: _Source) -> None:
+        if source.active < source.limit and not source.waiters:
+            source.active += 1
+            source.acquired += 1
+            return
+
+        ref = _current_priority.get() or PriorityRef(Priority.NOW)
+        waiter = _Waiter(
+            ref, next(self._seq), asyncio.get_running_loop().create_future()
+        )
+        source.waiters.append(waiter)
+        LOGGER.debug(
+            "Queued %s download (priority %s, depth %d)",
+            name,
+            ref.value.name,
+            len(source.waiters),
+        )
+
+        try:
+            await waiter.future
+        except asyncio.CancelledError:
+            if waiter.future.done() and not waiter.future.cancelled():
+                # The slot was handed over just before cancellation
+                self._release(source)
+            elif waiter in source.waiters:
+                source.waiters.remove(waiter)
+            raise
+
+        waited = time.monotonic() - waiter.enqueued_at
+        source.acquired += 1
+        source.total_wait += waited
+        source.max_wait = max(source.max_wait, waited)
+
+    @staticmethod
+    def _release(source: _Source) -> None:
+        source.active -= 1
+        while source.waiters and source.active < source.limit:
+            waiter = min(source.waiters, key=_Waiter.order)
+            source.waiters.remove(waiter)
+            if waiter.future.done():
+                continue
+            source.active += 1
+            waiter.future.set_result(None)
+
+    def stats(self) -> dict[str, dict[str, Union[int, float]]]:
+        return {
+            name: {
+                "active": source.active,
+                "limit": source.limit,
+                "queued": len(source.waiters),
+                "acquired": source.acquired,
+                "avg_wait": (
+                    source.total_wait / source.acquired if source.acquired else 0.0
+                ),
+                "max_wait": source.max_wait,
+            }
+            for name, source in self._sources.items()
+        }
+
+
+download_scheduler = DownloadScheduler(
+    {
+        "yt-dlp": config.MAX_YTDLP_DOWNLOADS,
+        "http": config.MAX_HTTP_DOWNLOADS,
+        "spotify": config.MAX_SPOTIFY_DOWNLOADS,
+        "telegram": config.MAX_TELEGRAM_DOWNLOADS,
+        "transcode": config.MAX_TRANSCODES,
+    }
+)
@@ -0,0 +1,292 @@
+#  Copyright (c) 2025 AshokShau
+#  Licensed under the GNU AGPL v3.0: https://www.gnu.org/licenses/agpl-3.0.html
+#  Part of the TgMusicBot project. All rights reserved where applicable.
+
+import asyncio
+import importlib
+import itertools
+import multiprocessing
+from functools import reduce
+from multiprocessing.connection import Connection
+from types import SimpleNamespace
+from typing import Any, Awaitable, Callable, Optional
+
+from TgMusic.logger import LOGGER
+from TgMusic.workers.shard import run_worker
+from ._config import config
+
+REQUEST_TIMEOUT = 60
+START_TIMEOUT = 180
+
+
+class RemoteError(Exception):
+    """Raised for a worker failure whose exception type could not be rebuilt."""
+
+
+def _decode_error(payload: tuple[str, str, str, Any]) -> Exception:
+    """
+    Rebuild an exception raised in a worker.
+
+    Exceptions are sent as their type's name and message rather than
+    pickled, since pyrogram and pytgcalls errors take constructor
+    arguments that pickling does not preserve. The rebuilt exception is
+    of the original type, so callers' ``except`` clauses still match.
+    """
+    module, qualname, message, value = payload
+    try:
+        cls = reduce(getattr, qualname.split("."), importlib.import_module(module))
+        if isinstance(cls, type) and issubclass(cls, Exception):
+            exc = cls.__new__(cls)
+            Exception.__init__(exc, message)
+            if value is not None:
+                exc.value = value
+            return exc
+    except Exception:
+        pass
+    return RemoteError(f"{qualname}: {message}")
+
+
+class ShardClient:
+    """Front-end side of one worker process."""
+
+    def __init__(
+        self, shard_id: int, on_exit: Optional[Callable[[list[str]], None]] = None
+    ) -> None:
+        self.shard_id = shard_id
+        self.on_exit = on_exit
+        self.clients: list[str] = []
+        self.alive = False
+        self._conn: Optional[Connection] = None
+        self._process: Optional[multiprocessing.Process] = None
+        self._ids = itertools.count(1)
+        self._pending: dict[int, asyncio.Future] = {}
+        self._handlers: dict[str, Callable[[Any], Awaitable[Any]]] = {}
+        self._tasks: set[asyncio.Task] = set()
+
+    def start(self) -> None:
+        ctx = multiprocessing.get_context("spawn")
+        self._conn, child_conn = ctx.Pipe()
+        self._process = ctx.Process(
+            target=run_worker,
+            args=(self.shard_id, config.API_ID, config.API_HASH, child_conn),
+            name=f"TgMusic-shard{self.shard_id}",
+        )
+        self._process.start()
+        child_conn.close()
+        asyncio.get_running_loop().add_reader(self._conn.fileno(), self._on_readable)
+        self.alive = True
+        LOGGER.info("Shard %d started (pid %s)", self.shard_id, self._process.pid)
+
+    def set_handler(self, name: str, handler: Callable[[Any], Awaitable[Any]]) -> None:
+        self._handlers[name] = handler
+
+    def _dispatch(self, message: tuple) -> None:
+        kind = message[0]
+        if kind == "update":
+            if handler := self._handlers.get(message[1]):
+                task = asyncio.create_task(handler(message[2]))
+                self._tasks.add(task)
+                task.add_done_callback(self._tasks.discard)
+            return
+
+        future = self._pending.pop(message[1], None)
+        if future is None or future.done():
+            return
+        if kind == "result":
+            future.set_result(message[2])
+        else:
+            future.set_exception(_decode_error(message[2]))
+
+    def _on_readable(self) -> None:
+        try:
+            while self._conn.poll():
+                self._dispatch(self._conn.recv())
+        except (EOFError, OSError):
+            self._on_exit()
+
+    def _on_exit(self) -> None:
+        if not self.alive:
+            return
+        self.alive = False
+        asyncio.get_running_loop().remove_reader(self._conn.fileno())
+        LOGGER.error(
+            "Shard %d exited; its assistants (%s) are unavailable",
+            self.shard_id,
+            ", ".join(self.clients),
+        )
+        for future in self._pending.values():
+            if not future.done():
+                future.set_exception(RemoteError(f"Shard {self.shard_id} exited"))
+        self._pending.clear()
+        if self.on_exit is not None:
+            self.on_exit(list(self.clients))
+
+    async def request(
+        self, kind: str, *args: Any, timeout: float = REQUEST_TIMEOUT
+    ) -> Any:
+        if not self.alive:
+            raise RemoteError(f"Shard {self.shard_id} is not running")
+
+        request_id = next(self._ids)
+        future = asyncio.get_running_loop().create_future()
+        self._pending[request_id] = future
+        try:
+            self._conn.send((kind, request_id, *args))
+            return await asyncio.wait_for(future, timeout)
+        finally:
+            self._pending.pop(request_id, None)
+
+    async def stop(self) -> None:
+        if self._process is None:
+            return
+        if self.alive:
+            try:
+                self._conn.send(("stop",))
+            except OSError:
+                pass
+            self.alive = False
+            asyncio.get_running_loop().remove_reader(self._conn.fileno())
+
+        await asyncio.to_thread(self._process.join, 10)
+        if self._process.is_alive():
+            self._process.terminate()
+        self._conn.close()
+        self._process = None
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "alive": self.alive,
+            "pid": self._process.pid if self._process else None,
+            "clients": len(self.clients),
+            "pending": len(self._pending),
+        }
+
+
+class RemoteUserbot:
+    """
+    Stand-in for a worker's pyrogram client.
+
+    Covers what the front-end uses: ``me``, ``name``, joining and leaving
+    chats, and listing dialogs.
+    """
+
+    def __init__(self, shard: ShardClient, name: str, me: dict[str, Any]) -> None:
+        self._shard = shard
+        self.name = name
+        self.me = SimpleNamespace(**me)
+
+    async def join_chat(self, chat_id: Any) -> None:
+        await self._shard.request("userbot", self.name, "join_chat", chat_id)
+
+    async def leave_chat(self, chat_id: Any) -> None:
+        await self._shard.request("userbot", self.name, "leave_chat", chat_id)
+
+    async def get_dialogs(self):
+        chat_ids = await self._shard.request(
+            "userbot", self.name, "dialogs", timeout=START_TIMEOUT
+        )
+        for chat_id in chat_ids:
+            yield SimpleNamespace(chat=SimpleNamespace(id=chat_id))
+
+
+def _remote(method: str) -> Callable[..., Awaitable[Any]]:
+    async def call(self: "RemoteCalls", *args: Any, **kwargs: Any) -> Any:
+        return await self._shard.request("call", self.name, method, args, kwargs)
+
+    call.__name__ = method
+    return call
+
+
+class RemoteCalls:
+    """
+    Front-end proxy for a PyTgCalls instance running in a shard worker.
+
+    Streams, call configs and results are pickled across the pipe, and
+    worker exceptions are re-raised here with their original types.
+    """
+
+    def __init__(self, shard: ShardClient, name: str, me: dict[str, Any]) -> None:
+        self._shard = shard
+        self.name = name
+        self.mtproto_client = RemoteUserbot(shard, name, me)
+        # Last ping reported by the worker, refreshed on each ``cpu_usage`` read
+        self.ping = 0.0
+
+    play = _remote("play")
+    leave_call = _remote("leave_call")
+    change_volume_call = _remote("change_volume_call")
+    mute = _remote("mute")
+    unmute = _remote("unmute")
+    resume = _remote("resume")
+    pause = _remote("pause")
+    time = _remote("time")
+    get_participants = _remote("get_participants")
+
+    async def _stats(self) -> float:
+        self.ping, cpu = await self._shard.request("stats", self.name)
+        return cpu
+
+    @property
+    def cpu_usage(self) -> Awaitable[float]:
+        return self._stats()
+
+    def on_update(self) -> Callable:
+        def decorator(func: Callable) -> Callable:
+            self._shard.set_handler(self.name, lambda update: func(self, update))
+            return func
+
+        return decorator
+
+
+class ShardManager:
+    """
+    Runs assistants in worker processes, ``shards`` of them.
+
+    Sessions are dealt out round-robin, so assistant ``clientN`` lives in
+    shard ``(N - 1) % shards``. A chat reaches its shard through the
+    assistant pinned to it in the database, the same routing used when
+    all sessions share one process. Each worker owns its sessions'
+    pyrogram clients and pytgcalls instances, so the ffmpeg pipes and
+    ntgcalls encoding of their calls are spread across cores.
+    """
+
+    def __init__(self, shards: int) -> None:
+        self.count = shards
+        self.shards: dict[int, ShardClient] = {}
+        # Called with the assistant names of a shard whose worker died
+        self.on_exit: Optional[Callable[[list[str]], None]] = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.count > 1
+
+    def _shard(self, shard_id: int) -> ShardClient:
+        shard = self.shards.get(shard_id)
+        if shard is None:
+            shard = ShardClient(shard_id, self._exited)
+            shard.start()
+            self.shards[shard_id] = shard
+        return shard
+
+    def _exited(self, clients: list[str]) -> None:
+        if self.on_exit is not None:
+            self.on_exit(clients)
+
+    async def open(self, index: int, name: str, session_string: str) -> RemoteCalls:
+        """Start session ``index`` as assistant ``name`` in its shard."""
+        shard = self._shard(index % self.count)
+        me = await shard.request("open", name, session_string, timeout=START_TIMEOUT)
+        shard.clients.append(name)
+        return RemoteCalls(shard, name, me)
+
+    async def close(self) -> None:
+        await asyncio.gather(
+            *(shard.stop() for shard in self.shards.values()), return_exceptions=True
+        )
+        self.shards.clear()
+
+    def stats(self) -> dict[int, dict[str, Any]]:
+        return {shard_id: shard.stats() for shard_id, shard in self.shards.items()}
+
+
+shard_manager = ShardManager(config.SHARDS)
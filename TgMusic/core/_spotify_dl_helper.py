@@ -5,10 +5,10 @@
 import asyncio
 import os
 import subprocess
+from contextlib import aclosing
 from pathlib import Path
-from typing import Union
+from typing import AsyncIterator, Union
 
-import aiofiles
 from Crypto.Cipher import AES
 from Crypto.Util import Counter
 from pytdbot import types
@@ -17,121 +17,123 @@ from TgMusic.logger import LOGGER
 
 from ._config import config
 from ._httpx import HttpxClient
+from ._scheduler import download_scheduler
 from ._dataclass import TrackInfo
 
+SPOTIFY_AUDIO_IV = bytes.fromhex("72e067fbddcbcf77ebe8bc643f630d93")
 
-async def rebuild_ogg(filename: str) -> None:
+# (offset, bytes) replacements that repair the OGG headers of a decrypted stream
+OGG_HEADER_PATCHES = (
+    (0, b"OggS"),
+    (6, b"\x00" * 10),
+    (26, b"\x01\x1e\x01vorbis"),
+    (39, b"\x02"),
+    (40, b"\x44\xac\x00\x00"),
+    (48, b"\x00\xe2\x04\x00"),
+    (56, b"\xb8\x01"),
+    (58, b"OggS"),
+    (62, b"\x00" * 10),
+)
+OGG_HEADER_SIZE = max(offset + len(value) for offset, value in OGG_HEADER_PATCHES)
+
+
+def patch_ogg_header(header: bytearray) -> bytes:
     """
-    Fixes broken OGG headers.
+    Fixes broken OGG headers in the first bytes of a decrypted stream.
     """
-    if not os.path.exists(filename):
-        LOGGER.error("❌ Error: %s not found.", filename)
-        return
-
-    try:
-        async with aiofiles.open(filename, "r+b") as ogg_file:
-            ogg_s = b"OggS"
-            zeroes = b"\x00" * 10
-            vorbis_start = b"\x01\x1e\x01vorbis"
-            channels = b"\x02"
-            sample_rate = b"\x44\xac\x00\x00"
-            bit_rate = b"\x00\xe2\x04\x00"
-            packet_sizes = b"\xb8\x01"
-
-            await ogg_file.seek(0)
-            await ogg_file.write(ogg_s)
-            await ogg_file.seek(6)
-            await ogg_file.write(zeroes)
-            await ogg_file.seek(26)
-            await ogg_file.write(vorbis_start)
-            await ogg_file.seek(39)
-            await ogg_file.write(channels)
-            await ogg_file.seek(40)
-            await ogg_file.write(sample_rate)
-            await ogg_file.seek(48)
-            await ogg_file.write(bit_rate)
-            await ogg_file.seek(56)
-            await ogg_file.write(packet_sizes)
-            await ogg_file.seek(58)
-            await ogg_file.write(ogg_s)
-            await ogg_file.seek(62)
-            await ogg_file.write(zeroes)
-    except Exception as e:
-        LOGGER.error("Error rebuilding OGG file %s: %s", filename, e)
+    if len(header) < OGG_HEADER_SIZE:
+        raise ValueError("Audio stream is too short to contain an OGG header")
+
+    for offset, value in OGG_HEADER_PATCHES:
+        header[offset : offset + len(value)] = value
+    return bytes(header)
 
 
 class SpotifyDownload:
     def __init__(self, track: TrackInfo):
         self.track = track
-        self.encrypted_file = os.path.join(
-            config.DOWNLOADS_DIR, f"{track.tc}.encrypted.ogg"
-        )
-        self.decrypted_file = os.path.join(
-            config.DOWNLOADS_DIR, f"{track.tc}.decrypted.ogg"
-        )
         self.output_file = os.path.join(config.DOWNLOADS_DIR, f"{track.tc}.ogg")
+        self.temp_file = f"{self.output_file}.part"
 
-    async def decrypt_audio(self) -> None:
+    async def decrypted_chunks(self) -> AsyncIterator[bytes]:
         """
-        Decrypt the downloaded audio file using a stream-based approach.
+        Download the encrypted audio and decrypt it chunk by chunk as it arrives.
         """
-        try:
-            key = bytes.fromhex(self.track.key)
-            iv = bytes.fromhex("72e067fbddcbcf77ebe8bc643f630d93")
-            iv_int = int.from_bytes(iv, "big")
-            cipher = AES.new(
-                key, AES.MODE_CTR, counter=Counter.new(128, initial_value=iv_int)
-            )
-
-            chunk_size = 8192  # 8KB chunks
-            async with (
-                aiofiles.open(self.encrypted_file, "rb") as fin,
-                aiofiles.open(self.decrypted_file, "wb") as fout,
-            ):
-                while chunk := await fin.read(chunk_size):
-                    decrypted_chunk = cipher.decrypt(chunk)
-                    await fout.write(decrypted_chunk)
-        except Exception as e:
-            LOGGER.error("Error decrypting audio file: %s", e)
-            raise
+        cipher = AES.new(
+            bytes.fromhex(self.track.key),
+            AES.MODE_CTR,
+            counter=Counter.new(
+                128, initial_value=int.from_bytes(SPOTIFY_AUDIO_IV, "big")
+            ),
+        )
 
-    async def fix_audio(self) -> None:
+        header = bytearray()
+        async with aclosing(HttpxClient().iter_bytes(self.track.cdnurl)) as stream:
+            async for chunk in stream:
+                data = cipher.decrypt(chunk)
+                if header is not None:
+                    header += data
+                    if len(header) < OGG_HEADER_SIZE:
+                        continue
+                    data, header = patch_ogg_header(header), None
+                yield data
+
+        if header is not None:
+            patch_ogg_header(header)
+
+    async def remux(self, chunks: AsyncIterator[bytes]) -> None:
         """
-        Fix the decrypted audio file using FFmpeg.
+        Pipe the decrypted audio through FFmpeg into the output file.
         """
+        process = await asyncio.create_subprocess_exec(
+            "ffmpeg",
+            "-loglevel",
+            "error",
+            "-y",
+            "-f",
+            "ogg",
+            "-i",
+            "pipe:0",
+            "-c",
+            "copy",
+            "-f",
+            "ogg",
+            self.temp_file,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+        )
         try:
-            process = await asyncio.create_subprocess_exec(
-                "ffmpeg",
-                "-i",
-                self.decrypted_file,
-                "-c",
-                "copy",
-                self.output_file,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-            )
-            _, stderr = await process.communicate()
-            if process.returncode != 0:
-                LOGGER.error("FFmpeg error: %s", stderr.decode().strip())
-                raise subprocess.CalledProcessError(process.returncode, "ffmpeg")
-        except Exception as e:
-            LOGGER.error("Error fixing audio file: %s", e)
+            async for chunk in chunks:
+                process.stdin.write(chunk)
+                await process.stdin.drain()
+            process.stdin.close()
+        except (BrokenPipeError, ConnectionResetError):
+            # FFmpeg exited early; its exit code and stderr explain why
+            pass
+        except BaseException:
+            process.kill()
+            await process.wait()
             raise
 
+        stderr = await process.stderr.read()
+        if await process.wait() != 0:
+            LOGGER.error("FFmpeg error: %s", stderr.decode().strip())
+            raise subprocess.CalledProcessError(process.returncode, "ffmpeg")
+
     async def _cleanup(self) -> None:
         """
-        Cleanup temporary files asynchronously.
+        Remove a partially written output file.
         """
-        for file in [self.encrypted_file, self.decrypted_file]:
-            try:
-                if os.path.exists(file):
-                    os.remove(file)
-            except Exception as e:
-                LOGGER.warning("Error removing %s: %s", file, e)
+        try:
+            if os.path.exists(self.temp_file):
+                os.remove(self.temp_file)
+        except Exception as e:
+            LOGGER.warning("Error removing %s: %s", self.temp_file, e)
 
     async def process(self) -> Union[Path, types.Error]:
         """
-        Main function to download, decrypt, and fix audio.
+        Download, decrypt and remux the track in a single streaming pass.
         """
         if os.path.exists(self.output_file):
             LOGGER.info("✅ Found existing file: %s", self.output_file)
@@ -145,11 +147,12 @@ class SpotifyDownload:
             )
 
         try:
-            await HttpxClient().download_file(self.track.cdnurl, self.encrypted_file)
-            await self.decrypt_audio()
-            await rebuild_ogg(self.decrypted_file)
-            await self.fix_audio()
-            await self._cleanup()
+            async with (
+                download_scheduler.slot("spotify"),
+                aclosing(self.decrypted_chunks()) as chunks,
+            ):
+                await self.remux(chunks)
+            os.replace(self.temp_file, self.output_file)
             LOGGER.info("✅ Successfully processed track: %s", self.output_file)
             return Path(self.output_file)
         except Exception as e:
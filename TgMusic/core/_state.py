@@ -0,0 +1,219 @@
+#  Copyright (c) 2025 AshokShau
+#  Licensed under the GNU AGPL v3.0: https://www.gnu.org/licenses/agpl-3.0.html
+#  Part of the TgMusicBot project. All rights reserved where applicable.
+
+import asyncio
+import json
+from abc import ABC, abstractmethod
+from typing import Any, Callable, Optional
+
+from TgMusic.logger import LOGGER
+from ._config import config
+
+ChatSnapshot = dict[str, Any]
+
+
+class StateBackend(ABC):
+    """
+    Where chat playback state (active flag and queue) is kept beyond memory.
+
+    ``ChatCacher`` always holds the working copy and serves every read
+    from it; the backend is only told which chats changed and reads
+    their current snapshot through the function given to ``bind``.
+    """
+
+    persistent: bool = False
+
+    def __init__(self) -> None:
+        self._snapshot: Callable[[int], Optional[ChatSnapshot]] = lambda _: None
+
+    def bind(self, snapshot: Callable[[int], Optional[ChatSnapshot]]) -> None:
+        """Set the function returning a chat's current state, or None once cleared."""
+        self._snapshot = snapshot
+
+    async def start(self) -> None:
+        pass
+
+    @abstractmethod
+    def changed(self, chat_id: int) -> None:
+        """Record that a chat's state changed."""
+
+    @abstractmethod
+    async def load(self) -> dict[int, ChatSnapshot]:
+        """Return every stored chat's snapshot."""
+
+    async def flush(self) -> None:
+        pass
+
+    async def close(self) -> None:
+        pass
+
+    def stats(self) -> dict[str, Any]:
+        return {"backend": type(self).__name__}
+
+
+class MemoryStateBackend(StateBackend):
+    """Keeps nothing outside the process; state is lost on restart."""
+
+    def changed(self, chat_id: int) -> None:
+        pass
+
+    async def load(self) -> dict[int, ChatSnapshot]:
+        return {}
+
+
+class RedisStateBackend(StateBackend):
+    """
+    Mirrors chat state to Redis with batched write-behind.
+
+    Changed chats are collected and written every ``flush_interval``
+    seconds, or as soon as ``max_batch`` are pending, in one pipeline of
+    ``SET``/``DEL`` commands. Reads never leave the process, so the hot
+    path costs a set insertion. Each chat is stored as JSON under
+    ``<prefix>:chat:<id>`` and listed in the ``<prefix>:chats`` set.
+    """
+
+    persistent = True
+
+    def __init__(
+        self,
+        url: str,
+        prefix: str = "tgmusic",
+        flush_interval: float = 0.5,
+        max_batch: int = 200,
+    ) -> None:
+        super().__init__()
+        self.url = url
+        self.prefix = prefix
+        self.flush_interval = flush_interval
+        self.max_batch = max_batch
+        self._redis = None
+        self._dirty: set[int] = set()
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._lock = asyncio.Lock()
+        self.flushes = 0
+        self.writes = 0
+        self.errors = 0
+
+    def _key(self, chat_id: int) -> str:
+        return f"{self.prefix}:chat:{chat_id}"
+
+    @property
+    def _index(self) -> str:
+        return f"{self.prefix}:chats"
+
+    async def start(self) -> None:
+        try:
+            from redis import asyncio as aioredis
+        except ImportError as e:
+            raise RuntimeError(
+                "STATE_BACKEND=redis requires the redis package "
+                "(pip install 'tgmusicbot[redis]')"
+            ) from e
+
+        self._redis = aioredis.from_url(self.url, decode_responses=True)
+        await self._redis.ping()
+        self._task = asyncio.create_task(self._run())
+        LOGGER.info("Chat state is persisted to Redis")
+
+    def changed(self, chat_id: int) -> None:
+        self._dirty.add(chat_id)
+        if len(self._dirty) >= self.max_batch:
+            self._wakeup.set()
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            try:
+                await self.flush()
+            except Exception as e:
+                LOGGER.error("Chat state flush failed: %s", e, exc_info=True)
+
+    async def flush(self) -> None:
+        if not self._dirty or self._redis is None:
+            return
+
+        async with self._lock:
+            batch, self._dirty = self._dirty, set()
+            pipe = self._redis.pipeline(transaction=False)
+            for chat_id in batch:
+                snapshot = self._snapshot(chat_id)
+                if snapshot is None:
+                    pipe.delete(self._key(chat_id))
+                    pipe.srem(self._index, chat_id)
+                else:
+                    pipe.set(self._key(chat_id), json.dumps(snapshot, default=str))
+                    pipe.sadd(self._index, chat_id)
+            try:
+                await pipe.execute()
+            except Exception as e:
+                # Keep the chats pending; the next flush writes their latest state
+                self._dirty |= batch
+                self.errors += 1
+                LOGGER.warning("Failed to persist chat state: %s", e)
+                return
+            except BaseException:
+                # Cancelled mid-write: keep the batch for the final flush
+                self._dirty |= batch
+                raise
+
+            self.flushes += 1
+            self.writes += len(batch)
+
+    async def load(self) -> dict[int, ChatSnapshot]:
+        if self._redis is None:
+            return {}
+
+        chat_ids = [int(chat_id) for chat_id in await self._redis.smembers(self._index)]
+        if not chat_ids:
+            return {}
+
+        values = await self._redis.mget([self._key(chat_id) for chat_id in chat_ids])
+        snapshots = {}
+        for chat_id, value in zip(chat_ids, values):
+            if not value:
+                continue
+            try:
+                snapshots[chat_id] = json.loads(value)
+            except ValueError:
+                LOGGER.warning("Discarding malformed state for chat %s", chat_id)
+        return snapshots
+
+    async def close(self) -> None:
+        if self._task:
+            self._task.cancel()
+            try:
+                # Let an in-flight flush finish unwinding before the final one
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+        if self._redis is not None:
+            await self._redis.aclose()
+            self._redis = None
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            **super().stats(),
+            "pending": len(self._dirty),
+            "flushes": self.flushes,
+            "writes": self.writes,
+            "errors": self.errors,
+        }
+
+
+def create_state_backend(name: str) -> StateBackend:
+    if name == "redis":
+        return RedisStateBackend(config.REDIS_URL)
+    if name != "memory":
+        LOGGER.warning("Unknown STATE_BACKEND %r; keeping state in memory", name)
+    return MemoryStateBackend()
+
+
+state_backend = create_state_backend(config.STATE_BACKEND)
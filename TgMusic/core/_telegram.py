@@ -8,6 +8,7 @@ from cachetools import TTLCache
 from pytdbot import types
 
 from TgMusic.logger import LOGGER
+from ._scheduler import download_scheduler
 
 
 class Telegram:
@@ -89,7 +90,8 @@ class Telegram:
                 "filename": file_name,
                 "message_id": message.id,
             }
-        return await dl_msg.download(), file_name
+        async with download_scheduler.slot("telegram"):
+            return await dl_msg.download(), file_name
 
     @staticmethod
     def get_cached_metadata(
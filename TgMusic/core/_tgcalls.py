@@ -2,8 +2,9 @@
 #  Licensed under the GNU AGPL v3.0: https://www.gnu.org/licenses/agpl-3.0.html
 #  Part of the TgMusicBot project. All rights reserved where applicable.
 
+import asyncio
+import itertools
 import os
-import random
 import re
 from pathlib import Path
 from typing import Optional, Union
@@ -14,7 +15,6 @@ from pyrogram import errors
 from pytdbot import Client, types
 from pytgcalls import PyTgCalls, exceptions
 from pytgcalls.types import (
-    AudioQuality,
     ChatUpdate,
     MediaStream,
     Update,
@@ -36,9 +36,19 @@ from ._cacher import (
     user_status_cache,
     chat_invite_cache,
 )
+from ._config import config
 from ._database import db
-from ._dataclass import CachedTrack
+from ._dataclass import CachedTrack, TrackInfo
 from ._downloader import DownloaderWrapper
+from ._media_index import media_indexer
+from ._placement import assistant_balancer
+from ._position import PositionTracker
+from ._prefetch import Prefetcher
+from ._quality import quality_governor
+from ._scheduler import Priority, set_priority
+from ._sharding import RemoteCalls, shard_manager
+from ._transcoder import is_playback_ready
+from ._transitions import ArmedStream, TransitionTracker
 from .buttons import control_buttons
 from .thumbnails import gen_thumb
 from .utils import send_logger
@@ -46,10 +56,17 @@ from .utils import send_logger
 
 class Calls:
     def __init__(self):
-        self.calls: dict[str, PyTgCalls] = {}
+        self.calls: dict[str, Union[PyTgCalls, RemoteCalls]] = {}
         self.client_counter: int = 1
         self.available_clients: list[str] = []
         self.bot: Optional[Client] = None
+        self.prefetcher = Prefetcher(
+            self.song_download, config.PREFETCH_COUNT, on_ready=self.prepare_next
+        )
+        self.transitions = TransitionTracker()
+        self.positions = PositionTracker()
+        self._background_tasks: set[asyncio.Task] = set()
+        shard_manager.on_exit = self._drop_assistants
 
     async def add_bot(self, bot: Client) -> types.Ok:
         self.bot = bot
@@ -63,18 +80,49 @@ class Calls:
             )
 
         if chat_id == 1:
-            return random.choice(self.available_clients)
+            return assistant_balancer.pick(self.available_clients)
 
         assistant = await db.get_assistant(chat_id)
         if assistant and assistant in self.available_clients:
             return assistant
 
-        new_client = random.choice(self.available_clients)
+        new_client = assistant_balancer.pick(self.available_clients)
         await db.set_assistant(chat_id, assistant=new_client)
         LOGGER.info("Set assistant for %s to %s", chat_id, new_client)
         return new_client
 
-    async def _group_assistant(self, chat_id: int) -> Union[PyTgCalls, types.Error]:
+    async def rebalance(self) -> dict[str, int]:
+        """Move idle chats pinned to overloaded assistants onto the others.
+
+        Chats with a live call stay where they are; moved chats start on
+        their new assistant the next time something is played.
+
+        Returns:
+            Number of chats moved away from each overloaded assistant
+        """
+        hot = assistant_balancer.overloaded(self.available_clients)
+        targets = sorted(
+            (name for name in self.available_clients if name not in hot),
+            key=assistant_balancer.score,
+        )
+        moved: dict[str, int] = {}
+        if not hot or not targets:
+            return moved
+
+        next_target = itertools.cycle(targets)
+        for name in hot:
+            for chat_id in await db.get_assistant_chats(name):
+                if chat_cache.is_active(chat_id):
+                    continue
+                await db.set_assistant(chat_id, assistant=next(next_target))
+                moved[name] = moved.get(name, 0) + 1
+
+        LOGGER.info("Rebalanced assistants: %s", moved)
+        return moved
+
+    async def _group_assistant(
+        self, chat_id: int
+    ) -> Union[PyTgCalls, RemoteCalls, types.Error]:
         client_name = await self._get_client_name(chat_id)
         if isinstance(client_name, types.Error):
             return client_name
@@ -114,13 +162,24 @@ class Calls:
     ) -> None:
         """Start a new pyrogram client session.
 
+        With sharding enabled the session is started in its shard's worker
+        process and driven through a ``RemoteCalls`` proxy.
+
         Args:
             api_id: Telegram API ID
             api_hash: Telegram API hash
             session_string: Session string for authentication
         """
         client_name = f"client{self.client_counter}"
+        index = self.client_counter - 1
         try:
+            if shard_manager.enabled:
+                self.client_counter += 1
+                calls = await shard_manager.open(index, client_name, session_string)
+                self.calls[client_name] = calls
+                self.available_clients.append(client_name)
+                return
+
             user_bot = PyroClient(
                 client_name,
                 api_id=api_id,
@@ -138,6 +197,40 @@ class Calls:
             LOGGER.error("Error starting client %s: %s", client_name, e)
             raise RuntimeError(f"Failed to start client {client_name}: {str(e)}") from e
 
+    def _drop_assistants(self, names: list[str]) -> None:
+        """Stop using assistants whose shard worker died.
+
+        Args:
+            names: The dead shard's assistants
+        """
+        for name in names:
+            if name in self.available_clients:
+                self.available_clients.remove(name)
+
+        task = asyncio.create_task(self._release_chats(names))
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+
+    async def _release_chats(self, names: list[str]) -> None:
+        """Unpin chats from dead assistants and end the calls they were running."""
+        for name in names:
+            for chat_id in await db.get_assistant_chats(name):
+                await db.remove_assistant(chat_id)
+                if not chat_cache.is_active(chat_id):
+                    continue
+
+                self.prefetcher.cancel(chat_id)
+                self.transitions.clear(chat_id)
+                self.positions.clear(chat_id)
+                quality_governor.forget(chat_id)
+                assistant_balancer.release(chat_id)
+                chat_cache.clear_chat(chat_id)
+                await self.bot.sendTextMessage(
+                    chat_id,
+                    "⚠️ Playback stopped because the assistant went offline.\n"
+                    "Use /play to start again.",
+                )
+
     async def register_decorators(self) -> None:
         """Register pytgcalls event handlers."""
         for _call in self.calls.values():
@@ -146,6 +239,9 @@ class Calls:
             async def general_handler(_, update: Update, _call=_call):
                 try:
                     if isinstance(update, stream.StreamEnded):
+                        if await self._resume_cut_stream(update.chat_id):
+                            return
+                        self.transitions.stream_ended(update.chat_id)
                         await self.play_next(update.chat_id)
                     elif isinstance(update, UpdatedGroupCallParticipant):
                         return
@@ -155,6 +251,11 @@ class Calls:
                         LOGGER.debug(
                             "Cleaning up chat %s after leaving", update.chat_id
                         )
+                        self.prefetcher.cancel(update.chat_id)
+                        self.transitions.clear(update.chat_id)
+                        self.positions.clear(update.chat_id)
+                        quality_governor.forget(update.chat_id)
+                        assistant_balancer.release(update.chat_id)
                         chat_cache.clear_chat(update.chat_id)
                 except Exception as e:
                     LOGGER.error("Error in general handler: %s", e, exc_info=True)
@@ -165,6 +266,8 @@ class Calls:
         file_path: Union[str, Path],
         video: bool = False,
         ffmpeg_parameters: Optional[str] = None,
+        position: float = 0.0,
+        speed: float = 1.0,
     ) -> Union[types.Ok, types.Error]:
         """Play media in a voice chat.
 
@@ -173,6 +276,8 @@ class Calls:
             file_path: Path to media file
             video: Whether to stream video
             ffmpeg_parameters: Custom FFmpeg parameters
+            position: Track position the parameters start playback at
+            speed: Playback speed the parameters apply
 
         Returns:
             types.Ok on success or types.Error on failure
@@ -181,9 +286,9 @@ class Calls:
             "Playing media for chat %s: %s (video=%s)", chat_id, file_path, video
         )
 
-        client = await self._group_assistant(chat_id)
-        if isinstance(client, types.Error):
-            return client
+        client_name = await self._get_client_name(chat_id)
+        if isinstance(client_name, types.Error):
+            return client_name
 
         # Validate media file exists if not URL
         if not re.match("^https?://", str(file_path)) and not os.path.exists(file_path):
@@ -195,11 +300,26 @@ class Calls:
         if isinstance(join, types.Error):
             return join
 
-        _stream = MediaStream(
+        _stream = self._build_stream(file_path, video, ffmpeg_parameters)
+        return await self._start_stream(
+            chat_id, client_name, _stream, video, file_path, position, speed
+        )
+
+    @staticmethod
+    def _build_stream(
+        file_path: Union[str, Path],
+        video: bool = False,
+        ffmpeg_parameters: Optional[str] = None,
+    ) -> MediaStream:
+        # Presets follow host load; transcoded files are capped to their format
+        audio_quality, video_quality = quality_governor.presets(
+            video, is_playback_ready(file_path)
+        )
+        return MediaStream(
             audio_path=file_path,
             media_path=file_path,
-            audio_parameters=AudioQuality.HIGH if video else AudioQuality.STUDIO,
-            video_parameters=VideoQuality.FHD_1080p if video else VideoQuality.SD_360p,
+            audio_parameters=audio_quality,
+            video_parameters=video_quality if video else VideoQuality.SD_360p,
             audio_flags=MediaStream.Flags.REQUIRED,
             video_flags=(
                 MediaStream.Flags.AUTO_DETECT if video else MediaStream.Flags.IGNORE
@@ -207,11 +327,27 @@ class Calls:
             ffmpeg_parameters=ffmpeg_parameters,
         )
 
+    async def _start_stream(
+        self,
+        chat_id: int,
+        client_name: str,
+        _stream: MediaStream,
+        video: bool,
+        source: Union[str, Path],
+        position: float = 0.0,
+        speed: float = 1.0,
+    ) -> Union[types.Ok, types.Error]:
+        """Hand a prepared stream to the chat's assistant."""
+        client = self.calls[client_name]
         call_config = (
             GroupCallConfig(auto_start=False) if chat_id < 0 else CallConfig(timeout=50)
         )
         try:
             await client.play(chat_id, _stream, call_config)
+            assistant_balancer.assign(client_name, chat_id, video)
+            self.positions.start(chat_id, source, position, speed)
+            quality_governor.record(chat_id)
+            media_indexer.schedule(source, video)
             # Send playback log if enabled
             if await db.get_logger_status(self.bot.me.id):
                 self.bot.loop.create_task(
@@ -229,6 +365,7 @@ class Calls:
             )
         except TelegramServerError:
             LOGGER.warning("Telegram server error during playback")
+            assistant_balancer.record_error(client_name)
             return types.Error(
                 code=502,
                 message="Telegram server issues detected. Please try again later.",
@@ -238,11 +375,13 @@ class Calls:
             return types.Error(code=404, message="Audio source not found.")
         except errors.RPCError as e:
             LOGGER.error("Playback failed in chat %s: %s", chat_id, str(e))
+            assistant_balancer.record_error(client_name)
             return types.Error(code=e.CODE or 500, message=f"Playback error: {str(e)}")
         except Exception as e:
             LOGGER.error(
                 "Playback failed in chat %s: %s", chat_id, str(e), exc_info=True
             )
+            assistant_balancer.record_error(client_name)
             return types.Error(code=500, message=f"Playback error: {str(e)}")
 
     async def play_next(self, chat_id: int) -> None:
@@ -281,31 +420,63 @@ class Calls:
         LOGGER.info("Playing song for chat %s: %s", chat_id, song.name)
 
         try:
-            # Send an initial loading message
-            reply = await self.bot.sendTextMessage(
-                chat_id, "⏳ Loading... Please wait."
-            )
-            if isinstance(reply, types.Error):
-                LOGGER.error("Failed to send message: %s", reply)
-                return
+            reply = None
+            if armed := self.transitions.take(chat_id, song):
+                # Stream prepared while the previous track played: just switch
+                play_result = await self._play_armed(chat_id, armed)
+            else:
+                if not song.file_path:
+                    # Only announce loading when the track still has to be fetched
+                    reply = await self.bot.sendTextMessage(
+                        chat_id, "⏳ Loading... Please wait."
+                    )
+                    if isinstance(reply, types.Error):
+                        LOGGER.error("Failed to send message: %s", reply)
+                        return
+
+                # Download (or start streaming) the song if it isn't downloaded
+                file_path = await self.get_playable(song)
+                if not file_path or isinstance(file_path, types.Error):
+                    await self._notify(
+                        chat_id,
+                        reply,
+                        "⚠️ Failed to download the song.\nSkipping to next track...",
+                    )
+                    await self.play_next(chat_id)
+                    return
+                song.file_path = file_path
 
-            # Download song if isn't downloaded
-            file_path = song.file_path or await self.song_download(song)
-            if not file_path:
-                await reply.edit_text(
-                    "⚠️ Failed to download the song.\n" "Skipping to next track..."
+                play_result = await self.play_media(
+                    chat_id, file_path, video=song.is_video
                 )
-                await self.play_next(chat_id)
-                return
 
-            # Start playback
-            play_result = await self.play_media(chat_id, file_path, video=song.is_video)
             if isinstance(play_result, types.Error):
-                await reply.edit_text(play_result.message)
+                await self._notify(chat_id, reply, play_result.message)
                 return
 
+            gap = self.transitions.stream_started(chat_id, armed is not None)
+            if gap is not None:
+                LOGGER.info(
+                    "Silence before %s in chat %s: %.2fs%s",
+                    song.name,
+                    chat_id,
+                    gap,
+                    " (armed)" if armed else "",
+                )
+
+            # Start fetching and preparing the next track(s) while this one plays
+            self.prefetcher.refresh(chat_id)
+            self.prepare_next(chat_id)
+
+            # Telegram message work happens only after audio is already flowing
+            if reply is None:
+                reply = await self.bot.sendTextMessage(chat_id, "🎵 Now playing...")
+                if isinstance(reply, types.Error):
+                    LOGGER.error("Failed to send message: %s", reply)
+                    return
+
             # Get duration if not available
-            duration = song.duration or await get_audio_duration(file_path)
+            duration = song.duration or await get_audio_duration(song.file_path)
 
             # Prepare a playback message
             text = (
@@ -359,6 +530,114 @@ class Calls:
                 "Error in _play_song for chat %s: %s", chat_id, str(e), exc_info=True
             )
 
+    async def _notify(
+        self, chat_id: int, reply: Optional[types.Message], text: str
+    ) -> None:
+        """Edit the loading message if there is one, otherwise send ``text``."""
+        if reply is not None:
+            await reply.edit_text(text)
+        else:
+            await self.bot.sendTextMessage(chat_id, text)
+
+    async def _play_armed(
+        self, chat_id: int, armed: ArmedStream
+    ) -> Union[types.Ok, types.Error]:
+        client_name = await self._get_client_name(chat_id)
+        if isinstance(client_name, types.Error):
+            return client_name
+        video = armed.track.is_video
+        _stream = (
+            armed.stream
+            if armed.level == quality_governor.level
+            else self._build_stream(armed.file_path, video)
+        )
+        return await self._start_stream(
+            chat_id, client_name, _stream, video, armed.file_path
+        )
+
+    async def resume_session(
+        self, chat_id: int, position: float = 0.0, speed: float = 1.0
+    ) -> Union[types.Ok, types.Error]:
+        """Start the current track again after a restart, at a saved position.
+
+        Args:
+            chat_id: Target chat ID
+            position: Position in the track to resume at (seconds)
+            speed: Playback speed to resume with
+
+        Returns:
+            types.Ok on success or types.Error on failure
+        """
+        song = chat_cache.get_playing_track(chat_id)
+        if not song:
+            return types.Error(code=404, message="No track to resume.")
+
+        if not song.file_path:
+            file_path = await self.get_playable(song)
+            if not file_path or isinstance(file_path, types.Error):
+                return file_path or types.Error(
+                    code=500, message="Failed to download the song."
+                )
+            song.file_path = file_path
+
+        # Close to the end there is nothing worth resuming; start over instead
+        if position >= 1 and (not song.duration or position < song.duration - 5):
+            result = await self._play_at(chat_id, song, position, speed)
+        else:
+            result = await self.play_media(chat_id, song.file_path, song.is_video)
+
+        if isinstance(result, types.Ok):
+            self.prefetcher.refresh(chat_id)
+            self.prepare_next(chat_id)
+        return result
+
+    def prepare_next(self, chat_id: int) -> None:
+        """Prepare the next queued track's stream in the background.
+
+        Call this whenever the next track may have changed or become ready.
+
+        Args:
+            chat_id: Target chat ID
+        """
+        task = asyncio.create_task(self._arm_next(chat_id))
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+
+    async def _arm_next(self, chat_id: int) -> None:
+        """Resolve, probe and join for the next track so the switch is one play call."""
+        queue = chat_cache.get_queue(chat_id)
+        if len(queue) < 2 or chat_cache.get_loop_count(chat_id) > 0:
+            return
+
+        track = queue[1]
+        file_path = track.file_path
+        # Stream URLs expire, so only local files are armed
+        if (
+            not file_path
+            or re.match("^https?://", str(file_path))
+            or self.transitions.is_armed(chat_id, track)
+        ):
+            return
+
+        try:
+            track.duration = track.duration or await get_audio_duration(file_path)
+            join = await self._join_assistant(chat_id)
+            if isinstance(join, types.Error):
+                return
+
+            self.transitions.arm(
+                chat_id,
+                ArmedStream(
+                    track,
+                    file_path,
+                    self._build_stream(file_path, track.is_video),
+                    quality_governor.level,
+                ),
+            )
+            LOGGER.debug("Armed %s for chat %s", track.name, chat_id)
+        except Exception as e:
+            LOGGER.warning("Failed to prepare next track for %s: %s", chat_id, e)
+
     @staticmethod
     async def song_download(song: CachedTrack) -> Union[Path, types.Error]:
         """Download a song from various platforms.
@@ -382,6 +661,76 @@ class Calls:
             message=f"Invalid URL: {song_url}",
         )
 
+    async def get_playable(
+        self, song: CachedTrack, allow_stream: bool = True
+    ) -> Union[str, Path, types.Error]:
+        """Resolve the file or URL to play for a track.
+
+        With STREAM_WHILE_DOWNLOADING enabled and the track not cached yet,
+        a direct media URL is returned so playback can start at once, and the
+        file is downloaded into the media cache in the background. The track
+        switches to the local file as soon as it is ready.
+
+        Args:
+            song: CachedTrack object containing song data
+            allow_stream: Whether a direct media URL may be returned
+
+        Returns:
+            Local path or media URL, or types.Error on failure
+        """
+        if song.file_path:
+            return song.file_path
+
+        if not (allow_stream and config.STREAM_WHILE_DOWNLOADING):
+            return await self.song_download(song)
+
+        wrapper = DownloaderWrapper(song.url)
+        if not wrapper.is_valid(song.url):
+            return types.Error(code=400, message=f"Invalid URL: {song.url}")
+
+        track_info = await wrapper.get_track()
+        if isinstance(track_info, types.Error):
+            return track_info
+
+        if cached := wrapper.get_cached(track_info, song.is_video):
+            return cached
+
+        stream_url = await wrapper.get_stream_url(track_info, song.is_video)
+        if not stream_url:
+            return await wrapper.fetch_track(track_info, song.is_video)
+
+        task = asyncio.create_task(
+            self._cache_in_background(song, wrapper, track_info, stream_url)
+        )
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+        return stream_url
+
+    @staticmethod
+    async def _cache_in_background(
+        song: CachedTrack,
+        wrapper: DownloaderWrapper,
+        track_info: TrackInfo,
+        stream_url: str,
+    ) -> None:
+        """Download a streamed track into the cache and switch it to the local file."""
+        set_priority(Priority.BACKGROUND)
+        try:
+            result = await wrapper.fetch_track(track_info, song.is_video)
+            if isinstance(result, types.Error):
+                LOGGER.warning(
+                    "Background download failed for %s: %s", song.name, result.message
+                )
+                return
+
+            if song.file_path == stream_url:
+                song.file_path = result
+            LOGGER.info("Cached streamed track %s at %s", song.name, result)
+        except Exception as e:
+            LOGGER.error(
+                "Background download error for %s: %s", song.name, e, exc_info=True
+            )
+
     async def _handle_no_songs(self, chat_id: int) -> None:
         """Handle an empty queue scenario.
 
@@ -408,6 +757,11 @@ class Calls:
             if isinstance(client, types.Error):
                 return client
 
+            self.prefetcher.cancel(chat_id)
+            self.transitions.clear(chat_id)
+            self.positions.clear(chat_id)
+            quality_governor.forget(chat_id)
+            assistant_balancer.release(chat_id)
             chat_cache.clear_chat(chat_id)
 
             try:
@@ -427,6 +781,56 @@ class Calls:
             )
             return types.Error(code=500, message=f"Failed to end call: {str(e)}")
 
+    @staticmethod
+    def _position_parameters(
+        file_path: Union[str, Path], position: float, video: bool, speed: float
+    ) -> tuple[Optional[str], float]:
+        """Build ffmpeg parameters that start at ``position`` at ``speed``.
+
+        Seeking happens on the input side. With an index for the file,
+        playback starts at a byte offset or keyframe instead of having
+        ffmpeg look for the position itself.
+
+        Returns:
+            The parameters (or None) and the position playback starts at
+        """
+        parts = []
+        if position > 0:
+            if index := media_indexer.get(file_path, video):
+                position, seek = index.seek_args(position, video)
+            else:
+                seek = f"-ss {position:.3f}"
+            parts.append(seek)
+
+        if speed != 1.0:
+            # atempo accepts at most 2.0 per instance, so chain it for more
+            tempo, filters = speed, []
+            while tempo > 2.0:
+                filters.append("atempo=2.0")
+                tempo /= 2.0
+            filters.append(f"atempo={tempo:.4g}")
+            parts.append("-atend")
+            if video:
+                parts.append(f"-filter:v setpts=PTS/{speed}")
+            parts.append(f"-filter:a {','.join(filters)}")
+
+        return " ".join(parts) or None, position
+
+    async def _play_at(
+        self, chat_id: int, song: CachedTrack, position: float, speed: float
+    ) -> Union[types.Ok, types.Error]:
+        params, start = self._position_parameters(
+            song.file_path, position, song.is_video, speed
+        )
+        return await self.play_media(
+            chat_id,
+            song.file_path,
+            song.is_video,
+            params,
+            position=start,
+            speed=speed,
+        )
+
     async def seek_stream(
         self,
         chat_id: int,
@@ -435,13 +839,13 @@ class Calls:
         duration: int,
         is_video: bool,
     ) -> Union[types.Ok, types.Error]:
-        """Seek to a position in the current stream.
+        """Seek to a position in the current stream, keeping the playback speed.
 
         Args:
             chat_id: Target chat ID
             file_path_or_url: Media file path or URL
             to_seek: Position to seek to (seconds)
-            duration: Total duration to play (seconds)
+            duration: Total duration of the track (seconds)
             is_video: Whether the stream is video
 
         Returns:
@@ -455,15 +859,17 @@ class Calls:
             )
 
         try:
-            is_url = bool(re.match(r"https?://", str(file_path_or_url)))
-            ffmpeg_params = (
-                f"-ss {to_seek} -i {file_path_or_url} -to {duration}"
-                if is_url or not os.path.isfile(file_path_or_url)
-                else f"-ss {to_seek} -to {duration}"
+            speed = self.positions.speed(chat_id)
+            params, start = self._position_parameters(
+                file_path_or_url, to_seek, is_video, speed
             )
-
             return await self.play_media(
-                chat_id, file_path_or_url, is_video, ffmpeg_params
+                chat_id,
+                file_path_or_url,
+                is_video,
+                params,
+                position=start,
+                speed=speed,
             )
         except Exception as e:
             LOGGER.error("Seek failed for chat %s: %s", chat_id, str(e), exc_info=True)
@@ -472,7 +878,7 @@ class Calls:
     async def speed_change(
         self, chat_id: int, speed: float = 1.0
     ) -> Union[types.Ok, types.Error]:
-        """Change playback speed.
+        """Change playback speed, continuing from the current position.
 
         Args:
             chat_id: Target chat ID
@@ -490,14 +896,55 @@ class Calls:
         if not curr_song or not curr_song.file_path:
             return types.Error(code=404, message="No track currently playing")
 
-        return await self.play_media(
+        position = self.positions.position(chat_id) or 0.0
+        return await self._play_at(chat_id, curr_song, position, speed)
+
+    async def restart_stream(self, chat_id: int) -> Union[types.Ok, types.Error]:
+        """Restart the current track where it was, e.g. after a dropped stream.
+
+        Args:
+            chat_id: Target chat ID
+
+        Returns:
+            types.Ok on success or types.Error on failure
+        """
+        curr_song = chat_cache.get_playing_track(chat_id)
+        if not curr_song or not curr_song.file_path:
+            return types.Error(code=404, message="No track currently playing")
+
+        position = self.positions.position(chat_id) or 0.0
+        return await self._play_at(
+            chat_id, curr_song, position, self.positions.speed(chat_id)
+        )
+
+    async def _resume_cut_stream(self, chat_id: int) -> bool:
+        """Continue a streamed track from its local copy if the stream ended early.
+
+        Returns:
+            Whether playback was resumed
+        """
+        playing = self.positions.get(chat_id)
+        song = chat_cache.get_playing_track(chat_id)
+        if not playing or not song or not song.duration:
+            return False
+
+        # Only URL streams end early; a local file that ends is finished
+        if not re.match("^https?://", str(playing.source)) or re.match(
+            "^https?://", str(song.file_path)
+        ):
+            return False
+        if playing.position >= song.duration - 5:
+            return False
+
+        LOGGER.info(
+            "Stream for %s in chat %s ended at %.0fs of %ss, resuming from cache",
+            song.name,
             chat_id,
-            curr_song.file_path,
-            curr_song.is_video,
-            ffmpeg_parameters=(
-                f"-atend -filter:v setpts=0.5*PTS " f"-filter:a atempo={speed}"
-            ),
+            playing.position,
+            song.duration,
         )
+        result = await self.restart_stream(chat_id)
+        return not isinstance(result, types.Error)
 
     async def change_volume(
         self, chat_id: int, volume: int
@@ -587,7 +1034,15 @@ class Calls:
             if isinstance(client, types.Error):
                 return client
 
+            if quality_governor.is_stale(chat_id):
+                # The downgrade was held back while the stream was paused
+                result = await self.restart_stream(chat_id)
+                if not isinstance(result, types.Error):
+                    quality_governor.downgraded += 1
+                    return result
+
             await client.resume(chat_id)
+            self.positions.resume(chat_id)
             return types.Ok()
         except (exceptions.NotInCallError, ConnectionNotFound):
             return types.Error(code=400, message="My Assistant is not in a call")
@@ -612,6 +1067,7 @@ class Calls:
                 return client
 
             await client.pause(chat_id)
+            self.positions.pause(chat_id)
             return types.Ok()
         except Exception as e:
             LOGGER.error("Pause failed for chat %s: %s", chat_id, str(e), exc_info=True)
@@ -631,8 +1087,16 @@ class Calls:
             if isinstance(client, types.Error):
                 return client
 
-            return await client.time(chat_id)
+            elapsed = await client.time(chat_id)
+            # The call's own timer restarts on every seek or speed change
+            position = self.positions.position(chat_id)
+            return int(position) if position is not None else elapsed
         except exceptions.NotInCallError:
+            self.prefetcher.cancel(chat_id)
+            self.transitions.clear(chat_id)
+            self.positions.clear(chat_id)
+            quality_governor.forget(chat_id)
+            assistant_balancer.release(chat_id)
             chat_cache.clear_chat(chat_id)
             return 0
         except Exception as e:
@@ -0,0 +1,183 @@
+#  Copyright (c) 2025 AshokShau
+#  Licensed under the GNU AGPL v3.0: https://www.gnu.org/licenses/agpl-3.0.html
+#  Part of the TgMusicBot project. All rights reserved where applicable.
+
+import asyncio
+import os
+import subprocess
+from pathlib import Path
+from typing import Optional, Union
+
+from TgMusic.logger import LOGGER
+from ._config import config
+from ._coordinator import DownloadKey
+from ._media_cache import media_cache
+from ._scheduler import Priority, download_scheduler, set_priority
+
+PLAYBACK_MARKER = ".playback"
+PLAYBACK_SAMPLE_RATE = 48000
+PLAYBACK_HEIGHT = 720
+PLAYBACK_FPS = 30
+
+
+def is_playback_ready(path: Union[str, Path]) -> bool:
+    """Whether a file was produced by the transcoder."""
+    return PLAYBACK_MARKER in Path(path).name
+
+
+class Transcoder:
+    """
+    Converts cached downloads into a playback-ready format in the background.
+
+    Audio becomes Opus at 48 kHz stereo and video becomes H.264 at up to
+    720p/30 fps with Opus audio, matching the stream parameters used for
+    such files in ``Calls.play_media``. ffmpeg inside the call then decodes
+    without resampling or scaling. Jobs run at ``Priority.BACKGROUND``
+    through the ``transcode`` scheduler source, and the cache entry is
+    switched to the new file once it is ready.
+    """
+
+    def __init__(self, enabled: bool) -> None:
+        self.enabled = enabled
+        self._tasks: dict[DownloadKey, asyncio.Task] = {}
+        self.completed = 0
+        self.failed = 0
+
+    def schedule(self, key: DownloadKey, path: Path, video: bool) -> None:
+        """
+        Queue a cached file for transcoding, if enabled and not done already.
+
+        Args:
+            key (DownloadKey): Identity of the cached track.
+            path (Path): The downloaded file.
+            video (bool): Whether the file is a video.
+        """
+        if not self.enabled or is_playback_ready(path) or key in self._tasks:
+            return
+        if key not in media_cache:
+            # Only indexed files can be switched over and evicted later
+            return
+
+        task = asyncio.create_task(self._run(key, path, video))
+        self._tasks[key] = task
+        task.add_done_callback(lambda _: self._tasks.pop(key, None))
+
+    async def _run(self, key: DownloadKey, path: Path, video: bool) -> None:
+        set_priority(Priority.BACKGROUND)
+        try:
+            async with download_scheduler.slot("transcode"):
+                target = await self.transcode(path, video)
+        except Exception as e:
+            LOGGER.error("Transcode error for %s: %s", path, e, exc_info=True)
+            target = None
+
+        if target is None:
+            self.failed += 1
+            return
+
+        self.completed += 1
+        if not await media_cache.replace(key, target):
+            # The track left the cache meanwhile; nothing would track the copy
+            try:
+                await asyncio.to_thread(os.remove, target)
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                LOGGER.warning("Failed to remove unused transcode %s: %s", target, e)
+
+    @staticmethod
+    def _build_command(source: Path, output: str, video: bool) -> list[str]:
+        command = ["ffmpeg", "-loglevel", "error", "-y", "-i", str(source)]
+        if video:
+            command += [
+                "-map",
+                "0:v:0",
+                "-map",
+                "0:a:0?",
+                "-vf",
+                f"scale=-2:'min({PLAYBACK_HEIGHT},ih)',fps={PLAYBACK_FPS}",
+                "-c:v",
+                "libx264",
+                "-preset",
+                "veryfast",
+                "-crf",
+                "23",
+                "-pix_fmt",
+                "yuv420p",
+            ]
+        else:
+            command += ["-vn"]
+
+        command += [
+            "-map_metadata",
+            "-1",
+            "-c:a",
+            "libopus",
+            "-b:a",
+            "128k",
+            "-ar",
+            str(PLAYBACK_SAMPLE_RATE),
+            "-ac",
+            "2",
+            "-f",
+            "matroska" if video else "ogg",
+            output,
+        ]
+        return command
+
+    async def transcode(self, source: Path, video: bool) -> Optional[Path]:
+        """
+        Transcode a file into the playback-ready format.
+
+        Args:
+            source (Path): File to convert.
+            video (bool): Whether to keep the video stream.
+
+        Returns:
+            Optional[Path]: The new file, or None on failure.
+        """
+        target = source.with_name(
+            f"{source.stem}{PLAYBACK_MARKER}{'.mkv' if video else '.opus'}"
+        )
+        if target.exists():
+            return target
+
+        temp_file = f"{target}.part"
+        process = await asyncio.create_subprocess_exec(
+            *self._build_command(source, temp_file, video),
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+        )
+        try:
+            _, stderr = await process.communicate()
+        except asyncio.CancelledError:
+            process.kill()
+            await process.wait()
+            if os.path.exists(temp_file):
+                os.remove(temp_file)
+            raise
+
+        if process.returncode != 0:
+            LOGGER.error("Transcode of %s failed: %s", source, stderr.decode().strip())
+            if os.path.exists(temp_file):
+                os.remove(temp_file)
+            return None
+
+        os.replace(temp_file, target)
+        LOGGER.info("Transcoded %s to %s", source.name, target.name)
+        return target
+
+    def cancel_all(self) -> None:
+        for task in list(self._tasks.values()):
+            task.cancel()
+
+    def stats(self) -> dict[str, Union[int, bool]]:
+        return {
+            "enabled": self.enabled,
+            "pending": len(self._tasks),
+            "completed": self.completed,
+            "failed": self.failed,
+        }
+
+
+transcoder = Transcoder(config.TRANSCODE_CACHE)
@@ -0,0 +1,101 @@
+#  Copyright (c) 2025 AshokShau
+#  Licensed under the GNU AGPL v3.0: https://www.gnu.org/licenses/agpl-3.0.html
+#  Part of the TgMusicBot project. All rights reserved where applicable.
+
+import os
+import time
+from collections import deque
+from pathlib import Path
+from typing import Optional, Union
+
+from pytgcalls.types import MediaStream
+
+from ._dataclass import CachedTrack
+
+
+class ArmedStream:
+    """A queued track whose stream is ready to be handed to ``play``."""
+
+    __slots__ = ("track", "file_path", "stream", "level")
+
+    def __init__(
+        self,
+        track: CachedTrack,
+        file_path: Union[str, Path],
+        stream: MediaStream,
+        level: int = 0,
+    ) -> None:
+        self.track = track
+        self.file_path = file_path
+        self.stream = stream
+        # Quality level the stream's presets were chosen at
+        self.level = level
+
+
+class TransitionTracker:
+    """
+    Holds the pre-armed next stream per chat and measures silence between tracks.
+
+    The gap is the time from ``StreamEnded`` to the next ``play`` call
+    returning. Transitions that used an armed stream are counted as gapless.
+    """
+
+    def __init__(self, history: int = 100) -> None:
+        self._armed: dict[int, ArmedStream] = {}
+        self._ended_at: dict[int, float] = {}
+        self._gaps: deque[float] = deque(maxlen=history)
+        self.transitions = 0
+        self.armed_hits = 0
+
+    def arm(self, chat_id: int, armed: ArmedStream) -> None:
+        self._armed[chat_id] = armed
+
+    def is_armed(self, chat_id: int, track: CachedTrack) -> bool:
+        armed = self._armed.get(chat_id)
+        return bool(
+            armed and armed.track is track and armed.file_path == track.file_path
+        )
+
+    def take(self, chat_id: int, track: CachedTrack) -> Optional[ArmedStream]:
+        """
+        Return the armed stream for ``track`` if it is still valid.
+
+        The entry is consumed either way; a stream armed for another track
+        or whose file has since been evicted is discarded.
+        """
+        armed = self._armed.pop(chat_id, None)
+        if armed is None or armed.track is not track:
+            return None
+        if armed.file_path != track.file_path or not os.path.exists(armed.file_path):
+            return None
+        return armed
+
+    def stream_ended(self, chat_id: int) -> None:
+        self._ended_at[chat_id] = time.monotonic()
+
+    def stream_started(self, chat_id: int, armed: bool) -> Optional[float]:
+        """Record a started track and return the silence before it, if measured."""
+        if (ended_at := self._ended_at.pop(chat_id, None)) is None:
+            return None
+
+        gap = time.monotonic() - ended_at
+        self._gaps.append(gap)
+        self.transitions += 1
+        if armed:
+            self.armed_hits += 1
+        return gap
+
+    def clear(self, chat_id: int) -> None:
+        self._armed.pop(chat_id, None)
+        self._ended_at.pop(chat_id, None)
+
+    def stats(self) -> dict[str, Union[int, float]]:
+        gaps = sorted(self._gaps)
+        return {
+            "armed": len(self._armed),
+            "transitions": self.transitions,
+            "armed_hits": self.armed_hits,
+            "avg_gap": sum(gaps) / len(gaps) if gaps else 0.0,
+            "p95_gap": gaps[min(len(gaps) - 1, int(len(gaps) * 0.95))] if gaps else 0.0,
+            "last_gap": self._gaps[-1] if self._gaps else 0.0,
+        }
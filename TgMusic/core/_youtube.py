@@ -7,7 +7,7 @@ import os
 import random
 import re
 from pathlib import Path
-from typing import Any, Optional, Dict, Union
+from typing import Any, AsyncIterator, Optional, Dict, Union
 
 from py_yt import Playlist, VideosSearch
 from pytdbot import types
@@ -17,8 +17,10 @@ from TgMusic.logger import LOGGER
 
 from ._config import config
 from ._dataclass import MusicTrack, PlatformTracks, TrackInfo
-from ._downloader import MusicService
+from ._downloader import MusicService, service_registry
 from ._httpx import HttpxClient
+from ._scheduler import download_scheduler
+from ._ytdlp_pool import YtDlpPoolUnavailable, ytdlp_pool
 
 
 class YouTubeUtils:
@@ -45,19 +47,6 @@ class YouTubeUtils:
         """Clean the query by removing unnecessary parameters."""
         return query.split("&")[0].split("#")[0].strip()
 
-    @staticmethod
-    def is_valid_url(url: Optional[str]) -> bool:
-        if not url:
-            return False
-        return any(
-            pattern.match(url)
-            for pattern in (
-                YouTubeUtils.YOUTUBE_VIDEO_PATTERN,
-                YouTubeUtils.YOUTUBE_PLAYLIST_PATTERN,
-                YouTubeUtils.YOUTUBE_SHORTS_PATTERN,
-            )
-        )
-
     @staticmethod
     def _extract_video_id(url: str) -> Optional[str]:
         """Extract video ID from various YouTube URL formats."""
@@ -94,7 +83,7 @@ class YouTubeUtils:
             return PlatformTracks(tracks=[])
 
         valid_tracks = [
-            MusicTrack(**track)
+            MusicTrack.from_dict(track)
             for track in data["results"]
             if track and track.get("id")
         ]
@@ -210,6 +199,23 @@ class YouTubeUtils:
             }
         return None
 
+    @staticmethod
+    def is_telegram_link(url: str) -> bool:
+        return bool(re.fullmatch(r"https:\/\/t\.me\/([a-zA-Z0-9_]{5,})\/(\d+)", url))
+
+    @staticmethod
+    async def get_api_url(video_id: str, is_video: bool = False) -> Optional[str]:
+        """
+        Ask the API for a download link (a CDN URL or a Telegram message link).
+        """
+        if public_url := await HttpxClient().make_request(
+            f"{config.API_URL}/yt?id={video_id}&video={is_video}"
+        ):
+            if dl_url := public_url.get("results"):
+                return dl_url
+            LOGGER.error("Response from API is empty")
+        return None
+
     @staticmethod
     async def download_with_api(
         video_id: str, is_video: bool = False
@@ -217,18 +223,11 @@ class YouTubeUtils:
         """
         Download audio using the API.
         """
-        from TgMusic import client
+        from TgMusic.client import client
 
         httpx = HttpxClient()
-        if public_url := await httpx.make_request(
-            f"{config.API_URL}/yt?id={video_id}&video={is_video}"
-        ):
-            dl_url = public_url.get("results")
-            if not dl_url:
-                LOGGER.error("Response from API is empty")
-                return None
-
-            if not re.fullmatch(r"https:\/\/t\.me\/([a-zA-Z0-9_]{5,})\/(\d+)", dl_url):
+        if dl_url := await YouTubeUtils.get_api_url(video_id, is_video):
+            if not YouTubeUtils.is_telegram_link(dl_url):
                 dl = await httpx.download_file(dl_url)
                 return dl.file_path if dl.success else None
 
@@ -246,7 +245,8 @@ class YouTubeUtils:
                 )
                 return None
 
-            file = await msg.download()
+            async with download_scheduler.slot("telegram"):
+                file = await msg.download()
             if isinstance(file, types.Error):
                 LOGGER.error(
                     f"❌ Failed to download message with ID {info.message.id}; {file}"
@@ -255,6 +255,130 @@ class YouTubeUtils:
             return Path(file.path)
         return None
 
+    @staticmethod
+    async def get_stream_url_with_yt_dlp(video_id: str, video: bool) -> Optional[str]:
+        """Resolve a direct media URL with yt-dlp without downloading the file.
+
+        Video requests are limited to progressive formats so that a single URL
+        carries both audio and video.
+        """
+        cookie_file = await YouTubeUtils.get_cookie_file()
+        format_selector = (
+            "best[ext=mp4][height<=720]/best[height<=720]"
+            if video
+            else "bestaudio[ext=m4a]/bestaudio[ext=webm]/bestaudio/best"
+        )
+        video_url = f"https://www.youtube.com/watch?v={video_id}"
+
+        if ytdlp_pool.enabled:
+            opts = YouTubeUtils._base_ytdlp_opts(cookie_file)
+            opts["format"] = format_selector
+            try:
+                async with download_scheduler.slot("yt-dlp"):
+                    info = await ytdlp_pool.extract(video_url, opts)
+                return info.get("url") if info else None
+            except YtDlpPoolUnavailable as e:
+                LOGGER.warning("%s; falling back to the yt-dlp CLI", e)
+
+        ytdlp_params = [
+            "yt-dlp",
+            "--no-warnings",
+            "--quiet",
+            "--geo-bypass",
+            "--socket-timeout",
+            "10",
+            "-g",
+            "-f",
+            format_selector,
+        ]
+        if config.PROXY:
+            ytdlp_params += ["--proxy", config.PROXY]
+        elif cookie_file:
+            ytdlp_params += ["--cookies", cookie_file]
+        ytdlp_params.append(video_url)
+
+        try:
+            async with download_scheduler.slot("yt-dlp"):
+                proc = await asyncio.create_subprocess_exec(
+                    *ytdlp_params,
+                    stdout=asyncio.subprocess.PIPE,
+                    stderr=asyncio.subprocess.PIPE,
+                )
+                stdout, stderr = await asyncio.wait_for(proc.communicate(), timeout=60)
+        except asyncio.TimeoutError:
+            LOGGER.error("yt-dlp URL lookup timed out for video ID: %s", video_id)
+            return None
+        except Exception as e:
+            LOGGER.error("yt-dlp URL lookup failed for %s: %r", video_id, e)
+            return None
+
+        if proc.returncode != 0:
+            LOGGER.error(
+                "yt-dlp URL lookup failed for %s (code %d): %s",
+                video_id,
+                proc.returncode,
+                stderr.decode().strip(),
+            )
+            return None
+
+        urls = stdout.decode().strip().splitlines()
+        return urls[0] if urls else None
+
+    @staticmethod
+    def _base_ytdlp_opts(cookie_file: Optional[str]) -> dict[str, Any]:
+        """Options shared by every in-process yt-dlp job."""
+        opts: dict[str, Any] = {
+            "quiet": True,
+            "no_warnings": True,
+            "geo_bypass": True,
+            "socket_timeout": 10,
+        }
+        if config.PROXY:
+            opts["proxy"] = config.PROXY
+        elif cookie_file:
+            opts["cookiefile"] = cookie_file
+        return opts
+
+    @staticmethod
+    def _build_ytdlp_opts(video: bool, cookie_file: Optional[str]) -> dict[str, Any]:
+        """In-process equivalent of ``_build_ytdlp_params``."""
+        opts = YouTubeUtils._base_ytdlp_opts(cookie_file)
+        opts.update(
+            {
+                "outtmpl": str(config.DOWNLOADS_DIR / "%(id)s.%(ext)s"),
+                "format": (
+                    "bestvideo[ext=mp4][height<=1080]+bestaudio[ext=m4a]/best[ext=mp4][height<=1080]"
+                    if video
+                    else "bestaudio[ext=m4a]/bestaudio[ext=mp4]/bestaudio[ext=webm]/bestaudio/best"
+                ),
+                "retries": 2,
+                "continuedl": True,
+                "nopart": True,
+                "concurrent_fragment_downloads": 3,
+                "throttledratelimit": 100 * 1024,
+                "writethumbnail": False,
+                "writeinfojson": False,
+            }
+        )
+        if video:
+            opts["merge_output_format"] = "mp4"
+        return opts
+
+    @staticmethod
+    def _check_download(video_id: str, path: Optional[str]) -> Optional[Path]:
+        """Validate the output path reported by yt-dlp."""
+        if not path:
+            LOGGER.error("yt-dlp finished but no output path returned for %s", video_id)
+            return None
+
+        downloaded_path = Path(path)
+        if not downloaded_path.exists():
+            LOGGER.error("yt-dlp reported path but file not found: %s", downloaded_path)
+            return None
+
+        LOGGER.info("Successfully downloaded %s to %s", video_id, downloaded_path)
+        return downloaded_path
+
     @staticmethod
     def _build_ytdlp_params(
         video_id: str, video: bool, cookie_file: Optional[str]
@@ -321,18 +445,32 @@ class YouTubeUtils:
             Optional[str]: File path of the downloaded media, or None on failure.
         """
         cookie_file = await YouTubeUtils.get_cookie_file()
-        ytdlp_params = YouTubeUtils._build_ytdlp_params(video_id, video, cookie_file)
 
+        if ytdlp_pool.enabled:
+            opts = YouTubeUtils._build_ytdlp_opts(video, cookie_file)
+            video_url = f"https://www.youtube.com/watch?v={video_id}"
+            try:
+                LOGGER.debug(
+                    "Starting pooled yt-dlp download for video ID: %s", video_id
+                )
+                async with download_scheduler.slot("yt-dlp"):
+                    path = await ytdlp_pool.download(video_url, opts)
+                return YouTubeUtils._check_download(video_id, path)
+            except YtDlpPoolUnavailable as e:
+                LOGGER.warning("%s; falling back to the yt-dlp CLI", e)
+
+        ytdlp_params = YouTubeUtils._build_ytdlp_params(video_id, video, cookie_file)
         try:
             LOGGER.debug("Starting yt-dlp download for video ID: %s", video_id)
 
-            proc = await asyncio.create_subprocess_exec(
-                *ytdlp_params,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
-            )
+            async with download_scheduler.slot("yt-dlp"):
+                proc = await asyncio.create_subprocess_exec(
+                    *ytdlp_params,
+                    stdout=asyncio.subprocess.PIPE,
+                    stderr=asyncio.subprocess.PIPE,
+                )
 
-            stdout, stderr = await asyncio.wait_for(proc.communicate(), timeout=600)
+                stdout, stderr = await asyncio.wait_for(proc.communicate(), timeout=600)
 
             if proc.returncode != 0:
                 LOGGER.error(
@@ -343,22 +481,7 @@ class YouTubeUtils:
                 )
                 return None
 
-            downloaded_path_str = stdout.decode().strip()
-            if not downloaded_path_str:
-                LOGGER.error(
-                    "yt-dlp finished but no output path returned for %s", video_id
-                )
-                return None
-
-            downloaded_path = Path(downloaded_path_str)
-            if not downloaded_path.exists():
-                LOGGER.error(
-                    "yt-dlp reported path but file not found: %s", downloaded_path
-                )
-                return None
-
-            LOGGER.info("Successfully downloaded %s to %s", video_id, downloaded_path)
-            return downloaded_path
+            return YouTubeUtils._check_download(video_id, stdout.decode().strip())
 
         except asyncio.TimeoutError:
             LOGGER.error("yt-dlp timed out for video ID: %s", video_id)
@@ -380,6 +503,12 @@ class YouTubeData(MusicService):
     Uses both direct API calls and YouTube Data API for comprehensive coverage.
     """
 
+    URL_PATTERNS = (
+        YouTubeUtils.YOUTUBE_VIDEO_PATTERN,
+        YouTubeUtils.YOUTUBE_PLAYLIST_PATTERN,
+        YouTubeUtils.YOUTUBE_SHORTS_PATTERN,
+    )
+
     def __init__(self, query: Optional[str] = None) -> None:
         """Initialize with optional query (URL or search term).
 
@@ -388,16 +517,14 @@ class YouTubeData(MusicService):
         """
         self.query = YouTubeUtils.clean_query(query) if query else None
 
-    def is_valid(self, url: Optional[str]) -> bool:
-        """Validate YouTube URL format.
-
-        Args:
-            url: URL to validate
-
-        Returns:
-            bool: True if URL matches YouTube patterns
-        """
-        return YouTubeUtils.is_valid_url(url)
+    def cache_identity(self) -> str:
+        """Key single videos by their ID so every URL form shares one entry."""
+        query = self.query or ""
+        if not YouTubeUtils.YOUTUBE_PLAYLIST_PATTERN.match(query) and (
+            match := YouTubeUtils.YOUTUBE_VIDEO_PATTERN.match(query)
+        ):
+            return f"{type(self).__name__}:{match.group(1)}"
+        return super().cache_identity()
 
     async def get_info(self) -> Union[PlatformTracks, types.Error]:
         """Retrieve track information from YouTube URL.
@@ -415,6 +542,50 @@ class YouTubeData(MusicService):
 
         return YouTubeUtils.create_platform_tracks(data)
 
+    def supports_pages(self) -> bool:
+        return bool(
+            self.query and YouTubeUtils.YOUTUBE_PLAYLIST_PATTERN.match(self.query)
+        )
+
+    async def get_info_pages(
+        self,
+    ) -> AsyncIterator[Union[PlatformTracks, types.Error]]:
+        """Yield a playlist one page (up to 100 videos) at a time.
+
+        Yields:
+            PlatformTracks: Tracks of each page as soon as it is fetched
+            types.Error: If the first page cannot be retrieved
+        """
+        if not self.supports_pages():
+            yield await self.get_info()
+            return
+
+        playlist = Playlist(self.query)
+        seen = 0
+        yielded = False
+        while playlist.hasMoreVideos:
+            try:
+                await playlist.getNextVideos()
+            except Exception as error:
+                LOGGER.error(f"Playlist page fetch failed: {error}")
+                break
+
+            # getNextVideos extends playlist.videos, so slice off the new page
+            page, seen = playlist.videos[seen:], len(playlist.videos)
+            if not page:
+                break
+            results = [
+                YouTubeUtils.format_track(video) for video in page if video.get("id")
+            ]
+            if results:
+                yielded = True
+                yield YouTubeUtils.create_platform_tracks({"results": results})
+
+        if not yielded:
+            yield types.Error(
+                code=404, message="Could not retrieve playlist information"
+            )
+
     async def search(self) -> Union[PlatformTracks, types.Error]:
         """Search YouTube for tracks matching the query.
 
@@ -439,7 +610,7 @@ class YouTubeData(MusicService):
                 )
 
             tracks = [
-                MusicTrack(**YouTubeUtils.format_track(video))
+                MusicTrack.from_dict(YouTubeUtils.format_track(video))
                 for video in results["result"]
             ]
             return PlatformTracks(tracks=tracks)
@@ -487,8 +658,12 @@ class YouTubeData(MusicService):
         if not track:
             return types.Error(code=400, message="Invalid track information provided")
 
-        # Try API download first if configured
-        if config.API_URL and config.API_KEY:
+        # Try API download first if configured and not known to be down
+        if (
+            config.API_URL
+            and config.API_KEY
+            and HttpxClient.is_available(config.API_URL)
+        ):
             if api_result := await YouTubeUtils.download_with_api(track.tc, video):
                 return api_result
 
@@ -501,6 +676,32 @@ class YouTubeData(MusicService):
 
         return dl_path
 
+    async def get_stream_url(
+        self, track: TrackInfo, video: bool = False
+    ) -> Optional[str]:
+        """Resolve a direct media URL for playback while the file downloads.
+
+        Args:
+            track: TrackInfo containing the video ID
+            video: Whether a video stream is needed
+
+        Returns:
+            str: Direct media URL, or None if none could be resolved
+        """
+        if not track:
+            return None
+
+        if (
+            config.API_URL
+            and config.API_KEY
+            and HttpxClient.is_available(config.API_URL)
+        ):
+            api_url = await YouTubeUtils.get_api_url(track.tc, video)
+            if api_url and not YouTubeUtils.is_telegram_link(api_url):
+                return api_url
+
+        return await YouTubeUtils.get_stream_url_with_yt_dlp(track.tc, video)
+
     async def _fetch_data(self, url: str) -> Optional[Dict[str, Any]]:
         """Internal method to fetch YouTube data.
 
@@ -559,3 +760,6 @@ class YouTubeData(MusicService):
         except Exception as error:
             LOGGER.error(f"Playlist data fetch failed: {error}")
             return None
+
+
+service_registry.register("youtube", YouTubeData)
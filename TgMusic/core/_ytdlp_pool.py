@@ -0,0 +1,158 @@
+#  Copyright (c) 2025 AshokShau
+#  Licensed under the GNU AGPL v3.0: https://www.gnu.org/licenses/agpl-3.0.html
+#  Part of the TgMusicBot project. All rights reserved where applicable.
+
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Optional, Union
+
+from TgMusic.logger import LOGGER
+from TgMusic.workers.ytdlp import run_job, warm_up
+from ._config import config
+
+
+class YtDlpPoolUnavailable(Exception):
+    """Raised when the worker pool is disabled or its processes died."""
+
+
+class YtDlpPool:
+    """
+    Pool of worker processes running yt-dlp in-process.
+
+    Each worker imports yt-dlp once and keeps ``YoutubeDL`` instances per
+    option set, so extractors, cookie jars and proxy settings are reused
+    across jobs instead of paying interpreter startup for every track.
+    Jobs are submitted over the executor's IPC queue and time out inside
+    the worker, which gives up on the job and stays in the pool; a timed
+    out job returns None. Only when the pool is disabled or its processes
+    died is ``YtDlpPoolUnavailable`` raised, so callers can fall back to
+    the CLI.
+    """
+
+    # Extra seconds granted to a worker before it counts as unresponsive
+    GRACE = 30
+
+    def __init__(self, workers: int) -> None:
+        self.workers = workers
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self.jobs = 0
+        self.failures = 0
+        self.restarts = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.workers > 0
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if not self.enabled:
+            raise YtDlpPoolUnavailable("yt-dlp worker pool is disabled")
+        if self._executor is None:
+            # Forking a threaded asyncio process can copy held locks into workers
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=warm_up,
+            )
+            LOGGER.info("Started yt-dlp worker pool with %d workers", self.workers)
+        return self._executor
+
+    def _restart(self, executor: ProcessPoolExecutor, kill: bool = False) -> None:
+        """Drop a broken or stuck executor; the next job starts a new one."""
+        if self._executor is not executor:
+            # Another job already replaced it
+            return
+
+        self.restarts += 1
+        self._executor = None
+        # Snapshot first: shutdown() forgets the processes
+        processes = list((getattr(executor, "_processes", None) or {}).values())
+        executor.shutdown(wait=False, cancel_futures=True)
+        if kill:
+            for process in processes:
+                if process.is_alive():
+                    process.kill()
+            LOGGER.warning("Killed unresponsive yt-dlp workers")
+
+    async def _submit(
+        self, url: str, opts: dict[str, Any], download: bool, timeout: float
+    ) -> Any:
+        executor = self._get_executor()
+        self.jobs += 1
+        future = executor.submit(run_job, url, opts, download, timeout)
+        try:
+            response = await asyncio.wait_for(
+                asyncio.wrap_future(future), timeout=timeout + self.GRACE
+            )
+        except BrokenProcessPool as e:
+            self.failures += 1
+            self._restart(executor)
+            raise YtDlpPoolUnavailable(f"yt-dlp worker died: {e}") from e
+        except asyncio.TimeoutError:
+            self.failures += 1
+            if future.cancel():
+                # Still queued behind other jobs; the workers are fine
+                LOGGER.error("yt-dlp job for %s was not started in time", url)
+            else:
+                # The worker ignored its own timeout, so only a restart frees it
+                LOGGER.error("yt-dlp worker stopped responding on %s", url)
+                self._restart(executor, kill=True)
+            return None
+
+        if not response["ok"]:
+            self.failures += 1
+            LOGGER.error("yt-dlp job failed for %s: %s", url, response["error"])
+            return None
+        return response["result"]
+
+    async def extract(
+        self, url: str, opts: dict[str, Any], timeout: float = 60
+    ) -> Optional[dict[str, Any]]:
+        """
+        Extract metadata without downloading.
+
+        Args:
+            url (str): Media or playlist URL.
+            opts (dict): YoutubeDL options.
+            timeout (float): Seconds the job may run.
+
+        Returns:
+            Optional[dict]: Sanitized info dict, or None if yt-dlp failed
+                or timed out.
+        """
+        return await self._submit(url, opts, False, timeout)
+
+    async def download(
+        self, url: str, opts: dict[str, Any], timeout: float = 600
+    ) -> Optional[str]:
+        """
+        Download media into the path given by ``opts["outtmpl"]``.
+
+        Args:
+            url (str): Media URL.
+            opts (dict): YoutubeDL options.
+            timeout (float): Seconds the job may run.
+
+        Returns:
+            Optional[str]: Path of the downloaded file, or None if yt-dlp
+                failed or timed out.
+        """
+        return await self._submit(url, opts, True, timeout)
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def stats(self) -> dict[str, Union[int, bool]]:
+        return {
+            "enabled": self.enabled,
+            "workers": self.workers,
+            "jobs": self.jobs,
+            "failures": self.failures,
+            "restarts": self.restarts,
+        }
+
+
+ytdlp_pool = YtDlpPool(config.YTDLP_WORKERS)
@@ -4,7 +4,7 @@
 
 from pytdbot import Client, types
 
-from TgMusic.core import Filter, chat_cache
+from TgMusic.core import Filter, chat_cache, call
 from TgMusic.core.admins import is_admin
 
 
@@ -28,6 +28,7 @@ async def clear_queue(c: Client, msg: types.Message) -> None:
         await msg.reply_text("ℹ️ The queue is already empty.")
         return None
 
+    call.prefetcher.cancel(chat_id)
     chat_cache.clear_chat(chat_id)
     reply = await msg.reply_text(f"✅ Queue cleared by {await msg.mention()}")
     if isinstance(reply, types.Error):
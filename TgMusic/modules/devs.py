@@ -25,7 +25,26 @@ from pytdbot import __version__ as py_td_ver
 from pytgcalls import __version__ as pytgver
 
 from TgMusic import StartTime
-from TgMusic.core import Filter, chat_cache, config, call, db
+from TgMusic.core import (
+    Filter,
+    HttpxClient,
+    assistant_balancer,
+    chat_cache,
+    config,
+    call,
+    db,
+    download_coordinator,
+    download_scheduler,
+    ytdlp_pool,
+    transcoder,
+    media_cache,
+    metadata_cache,
+    media_indexer,
+    playback_sessions,
+    quality_governor,
+    shard_manager,
+    state_backend,
+)
 from TgMusic.modules.utils.play_helpers import del_msg, extract_argument
 
 
@@ -53,6 +72,17 @@ def format_exception(
     return f"Traceback (most recent call last):\n{stack}{type(exp).__name__}{msg}"
 
 
+def format_bytes(size: float) -> str:
+    """
+    Format a byte count as a human-readable string.
+    """
+    for unit in ["B", "KiB", "MiB", "GiB", "TiB"]:
+        if size < 1024:
+            return f"{size:.2f} {unit}"
+        size /= 1024
+    return f"{size:.2f} PiB"
+
+
 @Client.on_message(filters=Filter.command("eval"))
 async def exec_eval(c: Client, m: types.Message) -> None:
     """
@@ -225,13 +255,6 @@ async def sys_stats(client: Client, message: types.Message) -> None:
     chats = len(await db.get_all_chats())
     users = len(await db.get_all_users())
 
-    def format_bytes(size):
-        for unit in ["B", "KiB", "MiB", "GiB", "TiB"]:
-            if size < 1024:
-                return f"{size:.2f} {unit}"
-            size /= 1024
-        return f"{size:.2f} PiB"
-
     response = f"""
 <b>⚙️ {client.me.first_name} System Statistics</b>
 ━━━━━━━━━━━━━━━━━━━━
@@ -283,6 +306,153 @@ async def sys_stats(client: Client, message: types.Message) -> None:
     return None
 
 
+@Client.on_message(filters=Filter.command(["metrics", "perf"]))
+async def metrics(c: Client, message: types.Message) -> None:
+    """
+    Show download and cache performance counters.
+    """
+    if message.from_id not in config.DEVS:
+        await del_msg(message)
+        return None
+
+    cache = media_cache.stats()
+    downloads = download_coordinator.stats()
+    meta = metadata_cache.stats()
+    max_bytes = format_bytes(cache["max_bytes"]) if cache["max_bytes"] else "unlimited"
+
+    text = (
+        "<b>📈 Performance Metrics</b>\n"
+        "━━━━━━━━━━━━━━━━━━━━\n"
+        "<b>💾 Media Cache:</b>\n"
+        f"  • <b>Files:</b> <code>{cache['files']}</code>\n"
+        f"  • <b>Size:</b> <code>{format_bytes(cache['bytes'])} / {max_bytes}</code>\n"
+        f"  • <b>Policy:</b> <code>{cache['policy'].upper()}</code>\n"
+        f"  • <b>Hit Rate:</b> <code>{cache['hit_rate']:.1%} "
+        f"({cache['hits']} hits, {cache['misses']} misses)</code>\n"
+        f"  • <b>Evicted:</b> <code>{cache['evicted_files']} files, "
+        f"{format_bytes(cache['evicted_bytes'])}</code>\n\n"
+        "<b>🗂 Metadata Cache:</b>\n"
+        f"  • <b>Entries:</b> <code>{meta['size']} / {meta['maxsize']}"
+        f"{' (+Mongo)' if meta['persist'] else ''}</code>\n"
+        f"  • <b>Hit Rate:</b> <code>{meta['hit_rate']:.1%} ({meta['hits']} fresh, "
+        f"{meta['stale_hits']} stale, {meta['negative_hits']} negative, "
+        f"{meta['persistent_hits']} Mongo, {meta['misses']} misses)</code>\n\n"
+        "<b>⬇️ Downloads:</b>\n"
+        f"  • <b>In Flight:</b> <code>{downloads['in_flight']}</code>\n"
+        f"  • <b>Started:</b> <code>{downloads['started']}</code>\n"
+        f"  • <b>Coalesced:</b> <code>{downloads['coalesced']}</code>\n\n"
+        "<b>🚦 Scheduler:</b>\n"
+    )
+    for source, stat in download_scheduler.stats().items():
+        text += (
+            f"  • <b>{source}:</b> <code>{stat['active']}/{stat['limit']} active, "
+            f"{stat['queued']} queued, wait {stat['avg_wait']:.2f}s avg / "
+            f"{stat['max_wait']:.2f}s max</code>\n"
+        )
+
+    pool = ytdlp_pool.stats()
+    text += (
+        "\n<b>⚙️ yt-dlp Workers:</b>\n"
+        f"  • <b>Workers:</b> <code>{pool['workers'] if pool['enabled'] else 'disabled (CLI)'}</code>\n"
+        f"  • <b>Jobs:</b> <code>{pool['jobs']} ({pool['failures']} failed, "
+        f"{pool['restarts']} restarts)</code>\n"
+    )
+
+    http = HttpxClient.stats()
+    hosts = (
+        ", ".join(f"{host} ({count})" for host, count in http["top_hosts"]) or "none"
+    )
+    text += (
+        "\n<b>🌐 HTTP Pool:</b>\n"
+        f"  • <b>Sessions:</b> <code>{http['sessions']} "
+        f"({'HTTP/2' if http['http2'] else 'HTTP/1.1'})</code>\n"
+        f"  • <b>Connections:</b> <code>{http['connections']} "
+        f"({http['idle']} idle)</code>\n"
+        f"  • <b>Requests:</b> <code>{http['requests']}</code>\n"
+        f"  • <b>Top Hosts:</b> <code>{hosts}</code>\n"
+    )
+    for host, health in http["hosts"].items():
+        if health["open"] or health["trips"]:
+            text += (
+                f"  • <b>{host}:</b> <code>{'OPEN' if health['open'] else 'closed'}, "
+                f"{health['trips']} trips, {health['errors']} errors, "
+                f"timeout {health['timeout']:.1f}s</code>\n"
+            )
+
+    transitions = call.transitions.stats()
+    text += (
+        "\n<b>⏭ Track Transitions:</b>\n"
+        f"  • <b>Transitions:</b> <code>{transitions['transitions']} "
+        f"({transitions['armed_hits']} pre-armed, {transitions['armed']} armed now)</code>\n"
+        f"  • <b>Silence:</b> <code>{transitions['avg_gap']:.2f}s avg / "
+        f"{transitions['p95_gap']:.2f}s p95 / {transitions['last_gap']:.2f}s last</code>\n"
+    )
+
+    index = media_indexer.stats()
+    text += (
+        f"  • <b>Seek Index:</b> <code>{index['files']} files, "
+        f"{index['pending']} pending, {index['failed']} failed</code>\n"
+    )
+
+    quality = quality_governor.stats()
+    text += (
+        "\n<b>🎛 Stream Quality:</b>\n"
+        f"  • <b>Level:</b> <code>{quality['level']}"
+        f"{' (downgrading running streams)' if quality['downgrade_running'] else ''}</code>\n"
+        f"  • <b>Load:</b> <code>cpu {quality.get('cpu', 0):.0f}%, "
+        f"ntgcalls {quality.get('ntgcalls_cpu', 0):.0f}%, {quality.get('calls', 0)} calls, "
+        f"ping {quality.get('ping', 0):.0f}ms</code>\n"
+        f"  • <b>Downgraded:</b> <code>{quality['downgraded']} streams</code>\n"
+    )
+
+    text += "\n<b>🎙 Assistants:</b>\n"
+    for name, load in assistant_balancer.stats(call.available_clients).items():
+        text += (
+            f"  • <b>{name}:</b> <code>{load['audio']} audio, {load['video']} video, "
+            f"{load['errors']} errors, score {load['score']:.1f}</code>\n"
+        )
+
+    state = state_backend.stats()
+    text += f"\n<b>💾 Chat State:</b> <code>{state['backend']}"
+    if state_backend.persistent:
+        text += (
+            f", {state['writes']} writes in {state['flushes']} flushes, "
+            f"{state['pending']} pending, {state['errors']} errors"
+        )
+    text += "</code>\n"
+
+    sessions = playback_sessions.stats()
+    if sessions["enabled"]:
+        text += (
+            f"<b>⏯ Sessions:</b> <code>{sessions['saved']} saved, "
+            f"{sessions['restoring']} resuming, {sessions['resumed']} resumed, "
+            f"{sessions['failed']} failed</code>\n"
+        )
+
+    if shard_manager.enabled:
+        text += "\n<b>🧩 Shards:</b>\n"
+        for shard_id, shard in shard_manager.stats().items():
+            text += (
+                f"  • <b>Shard {shard_id}:</b> <code>"
+                f"{'running' if shard['alive'] else 'DOWN'} (pid {shard['pid']}), "
+                f"{shard['clients']} assistants, {shard['pending']} pending</code>\n"
+            )
+
+    transcode = transcoder.stats()
+    if transcode["enabled"]:
+        text += (
+            "\n<b>🎚 Transcoder:</b>\n"
+            f"  • <b>Pending:</b> <code>{transcode['pending']}</code>\n"
+            f"  • <b>Done:</b> <code>{transcode['completed']} "
+            f"({transcode['failed']} failed)</code>\n"
+        )
+
+    reply = await message.reply_text(text, disable_web_page_preview=True)
+    if isinstance(reply, types.Error):
+        c.logger.warning(reply.message)
+    return None
+
+
 @Client.on_message(filters=Filter.command(["activevc", "av"]))
 async def active_vc(c: Client, message: types.Message) -> None:
     """
@@ -426,6 +596,28 @@ async def clear_all_assistants(c: Client, message: types.Message) -> None:
     return
 
 
+@Client.on_message(filters=Filter.command("rebalance"))
+async def rebalance(c: Client, message: types.Message) -> None:
+    if message.from_id not in config.DEVS:
+        await del_msg(message)
+        return
+
+    moved = await call.rebalance()
+    if not moved:
+        reply = await message.reply_text("⚖️ Assistants are balanced, nothing moved.")
+    else:
+        details = "\n".join(
+            f"  • <b>{name}:</b> <code>{count} chats</code>"
+            for name, count in moved.items()
+        )
+        reply = await message.reply_text(
+            f"⚖️ Moved {sum(moved.values())} idle chats off busy assistants:\n{details}"
+        )
+    if isinstance(reply, types.Error):
+        c.logger.warning(reply.message)
+    return
+
+
 @Client.on_message(filters=Filter.command("logs"))
 async def logs(c: Client, message: types.Message) -> None:
     if message.from_id not in config.DEVS:
@@ -5,7 +5,7 @@ import asyncio
 import time
 from datetime import datetime, timedelta
 from pytdbot import Client, types
-from TgMusic.core import chat_cache, call, db, config
+from TgMusic.core import chat_cache, call, db, config, playback_sessions
 from pyrogram import errors
 from pyrogram.client import Client as PyroClient
 
@@ -19,6 +19,10 @@ class InactiveCallManager:
         self._sleep_time = 40
 
     async def _end_call_if_inactive(self, chat_id: int) -> bool:
+        if playback_sessions.is_restoring(chat_id):
+            # Not rejoined yet after a restart
+            return False
+
         vc_users = await call.vc_users(chat_id)
         if isinstance(vc_users, types.Error):
             self.bot.logger.warning(f"[VC Users Error] {chat_id}: {vc_users.message}")
@@ -50,12 +54,11 @@ class InactiveCallManager:
                     await asyncio.sleep(self._sleep_time)
                     continue
 
-                active_chats = chat_cache.get_active_chats()
-                if not active_chats:
+                if not chat_cache.active_count:
                     await asyncio.sleep(self._sleep_time)
                     continue
 
-                for chat_id in active_chats:
+                for chat_id in chat_cache.get_active_chats():
                     await self._end_call_if_inactive(chat_id)
                     await asyncio.sleep(0.1)
 
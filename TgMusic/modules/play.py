@@ -2,11 +2,13 @@
 #  Licensed under the GNU AGPL v3.0: https://www.gnu.org/licenses/agpl-3.0.html
 #  Part of the TgMusicBot project. All rights reserved where applicable.
 
+import asyncio
 import re
+from typing import AsyncIterator, Union
 
 from pytdbot import Client, types
 
-from TgMusic.core import YouTubeData, DownloaderWrapper, db, call, tg
+from TgMusic.core import YouTubeData, DownloaderWrapper, config, db, call, tg
 from TgMusic.core import (
     CachedTrack,
     MusicTrack,
@@ -126,9 +128,11 @@ async def _handle_single_track(
         url=track.url,
     )
 
-    # Download track if not already cached
+    # Download track if not already cached; stream it if nothing is playing yet
     if not song.file_path:
-        download_result = await call.song_download(song)
+        download_result = await call.get_playable(
+            song, allow_stream=not chat_cache.is_active(chat_id)
+        )
         if isinstance(download_result, types.Error):
             return await edit_text(
                 msg, f"❌ Download failed: {download_result.message}"
@@ -143,11 +147,13 @@ async def _handle_single_track(
 
     if chat_cache.is_active(chat_id):
         # Add to queue if playback is active
-        queue = chat_cache.get_queue(chat_id)
+        position = chat_cache.get_queue_length(chat_id)
         chat_cache.add_song(chat_id, song)
+        call.prefetcher.refresh(chat_id)
+        call.prepare_next(chat_id)
 
         queue_info = (
-            f"<b>🎧 Added to Queue (#{len(queue)})</b>\n\n"
+            f"<b>🎧 Added to Queue (#{position})</b>\n\n"
             f"▫ <b>Track:</b> <a href='{song.url}'>{song.name}</a>\n"
             f"▫ <b>Duration:</b> {sec_to_min(song.duration)}\n"
             f"▫ <b>Requested by:</b> {song.user}"
@@ -192,42 +198,47 @@ async def _handle_single_track(
     return None
 
 
+def _queue_track(chat_id: int, track: MusicTrack, user_by: str, loop: int = 0):
+    """Add a not yet downloaded track to the chat queue."""
+    chat_cache.add_song(
+        chat_id,
+        CachedTrack(
+            name=track.name,
+            artist=track.artist,
+            track_id=track.id,
+            loop=loop,
+            duration=track.duration,
+            thumbnail=track.cover,
+            user=user_by,
+            file_path="",
+            platform=track.platform,
+            is_video=False,
+            url=track.url,
+        ),
+    )
+
+
 async def _handle_multiple_tracks(
     msg: types.Message, tracks: list[MusicTrack], user_by: str
 ):
     """Process and queue multiple tracks (playlist/album)."""
     chat_id = msg.chat_id
     is_active = chat_cache.is_active(chat_id)
-    queue = chat_cache.get_queue(chat_id)
+    start = chat_cache.get_queue_length(chat_id)
 
     queue_header = "<b>📥 Added to Queue:</b>\n<blockquote expandable>\n"
     queue_items = []
 
     for index, track in enumerate(tracks):
-        position = len(queue) + index
-        chat_cache.add_song(
-            chat_id,
-            CachedTrack(
-                name=track.name,
-                artist=track.artist,
-                track_id=track.id,
-                loop=1 if not is_active and index == 0 else 0,
-                duration=track.duration,
-                thumbnail=track.cover,
-                user=user_by,
-                file_path="",
-                platform=track.platform,
-                is_video=False,
-                url=track.url,
-            ),
-        )
+        position = start + index
+        _queue_track(chat_id, track, user_by, 1 if not is_active and index == 0 else 0)
         queue_items.append(
             f"<b>{position}.</b> {track.name}\n└ Duration: {sec_to_min(track.duration)}"
         )
 
     queue_summary = (
         f"</blockquote>\n"
-        f"<b>📋 Total in Queue:</b> {len(chat_cache.get_queue(chat_id))}\n"
+        f"<b>📋 Total in Queue:</b> {chat_cache.get_queue_length(chat_id)}\n"
         f"<b>⏱ Total Duration:</b> {sec_to_min(sum(t.duration for t in tracks))}\n"
         f"<b>👤 Requested by:</b> {user_by}"
     )
@@ -240,10 +251,104 @@ async def _handle_multiple_tracks(
 
     if not is_active:
         await call.play_next(chat_id)
+    else:
+        call.prefetcher.refresh(chat_id)
 
     await edit_text(msg, full_message, reply_markup=control_buttons("play"))
 
 
+# Keeps references to running playlist ingestion tasks
+_playlist_tasks: set[asyncio.Task] = set()
+
+
+async def _ingest_playlist_pages(
+    msg: types.Message,
+    pages: AsyncIterator[Union[PlatformTracks, types.Error]],
+    user_by: str,
+    queued: int,
+):
+    """Queue the remaining pages of a playlist while the first one plays."""
+    chat_id = msg.chat_id
+    added = 0
+    duration = 0
+    limit_reached = False
+    try:
+        async for page in pages:
+            if isinstance(page, types.Error) or not chat_cache.is_active(chat_id):
+                # Stop quietly if the page failed or playback was ended meanwhile
+                break
+
+            tracks = page.tracks[: config.PLAYLIST_LIMIT - queued]
+            for track in tracks:
+                _queue_track(chat_id, track, user_by)
+            queued += len(tracks)
+            added += len(tracks)
+            duration += sum(track.duration for track in tracks)
+            call.prefetcher.refresh(chat_id)
+
+            if queued >= config.PLAYLIST_LIMIT:
+                limit_reached = True
+                break
+
+            await edit_text(
+                msg,
+                f"<b>📥 Loading playlist...</b>\n"
+                f"<b>📋 Queued so far:</b> {queued}\n"
+                f"<b>👤 Requested by:</b> {user_by}",
+                reply_markup=control_buttons("play"),
+            )
+    except Exception as e:
+        LOGGER.error("Playlist ingestion failed for %s: %s", chat_id, e, exc_info=True)
+    finally:
+        await pages.aclose()
+
+    if not added:
+        return
+
+    limit_note = f" (limit of {config.PLAYLIST_LIMIT} reached)" if limit_reached else ""
+    await edit_text(
+        msg,
+        f"<b>📥 Playlist added:</b> {queued} tracks{limit_note}\n"
+        f"<b>📋 Total in Queue:</b> {chat_cache.get_queue_length(chat_id)}\n"
+        f"<b>⏱ Loaded in background:</b> {sec_to_min(duration)}\n"
+        f"<b>👤 Requested by:</b> {user_by}",
+        reply_markup=control_buttons("play"),
+    )
+
+
+async def _play_url(
+    c: Client,
+    msg: types.Message,
+    wrapper: Union[DownloaderWrapper, YouTubeData],
+    user_by: str,
+    is_video: bool = False,
+):
+    """Play the first page of a URL now and queue any further pages in the background."""
+    pages = wrapper.get_info_pages()
+    track_info = await anext(pages)
+    if isinstance(track_info, types.Error):
+        await pages.aclose()
+        return await edit_text(
+            msg,
+            text=f"⚠️ Couldn't retrieve track info:\n{track_info.message}",
+            reply_markup=SupportButton,
+        )
+
+    track_info.tracks = track_info.tracks[: config.PLAYLIST_LIMIT]
+    await play_music(c, msg, track_info, user_by, is_video=is_video)
+
+    if not wrapper.supports_pages() or len(track_info.tracks) >= config.PLAYLIST_LIMIT:
+        await pages.aclose()
+        return None
+
+    task = asyncio.create_task(
+        _ingest_playlist_pages(msg, pages, user_by, len(track_info.tracks))
+    )
+    _playlist_tasks.add(task)
+    task.add_done_callback(_playlist_tasks.discard)
+    return None
+
+
 async def play_music(
     c: Client,
     msg: types.Message,
@@ -366,8 +471,7 @@ async def handle_play_command(c: Client, msg: types.Message, is_video: bool = Fa
         return await msg.reply_text("❌ This command only works in groups/channels.")
 
     # Check queue limit
-    queue = chat_cache.get_queue(chat_id)
-    if len(queue) > 10:
+    if chat_cache.get_queue_length(chat_id) > 10:
         return await msg.reply_text(
             "⚠️ Queue limit reached (10 tracks max). Use /end to clear queue."
         )
@@ -425,15 +529,7 @@ async def handle_play_command(c: Client, msg: types.Message, is_video: bool = Fa
                 reply_markup=SupportButton,
             )
 
-        track_info = await wrapper.get_info()
-        if isinstance(track_info, types.Error):
-            return await edit_text(
-                status_msg,
-                text=f"⚠️ Couldn't retrieve track info:\n{track_info.message}",
-                reply_markup=SupportButton,
-            )
-
-        return await play_music(c, status_msg, track_info, requester, is_video=is_video)
+        return await _play_url(c, status_msg, wrapper, requester, is_video)
 
     # Handle text search for audio only
     if not is_video:
@@ -25,6 +25,8 @@ async def queue_info(_: Client, msg: types.Message) -> None:
         await msg.reply_text("⏸ No active playback session.")
         return
 
+    # The queue is a live view, so keep the track shown as playing
+    current_song = _queue[0]
     chat = await msg.getChat()
     if isinstance(chat, types.Error):
         await msg.reply_text(
@@ -32,7 +34,6 @@ async def queue_info(_: Client, msg: types.Message) -> None:
         )
         return
 
-    current_song = _queue[0]
     text = [
         f"<b>🎧 Queue for {chat.title}</b>",
         "",
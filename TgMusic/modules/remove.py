@@ -4,7 +4,7 @@
 
 from pytdbot import Client, types
 
-from TgMusic.core import Filter, chat_cache
+from TgMusic.core import Filter, chat_cache, call
 from TgMusic.core.admins import is_admin
 from .utils.play_helpers import extract_argument
 
@@ -39,19 +39,23 @@ async def remove_song(c: Client, msg: types.Message) -> None:
         await msg.reply_text("⚠️ Please enter a valid track number.")
         return None
 
-    _queue = chat_cache.get_queue(chat_id)
+    queue_length = chat_cache.get_queue_length(chat_id)
 
-    if not _queue:
-        await msg.reply_text("📭 The queue is currently empty.")
+    if queue_length < 2:
+        await msg.reply_text("📭 There are no upcoming tracks to remove.")
         return None
 
-    if track_num <= 0 or track_num > len(_queue):
+    # Numbers match /queue, where 1 is the first track after the one playing
+    removed_track = (
+        chat_cache.remove_track(chat_id, track_num) if track_num > 0 else None
+    )
+    if removed_track is None:
         await msg.reply_text(
-            f"⚠️ Invalid track number. Please choose between 1 and {len(_queue)}."
+            f"⚠️ Invalid track number. Please choose between 1 and {queue_length - 1}."
         )
         return None
 
-    removed_track = chat_cache.remove_track(chat_id, track_num)
+    call.prefetcher.refresh(chat_id)
     reply = await msg.reply_text(
         f"✅ Track <b>{removed_track.name[:45]}</b> removed by {await msg.mention()}"
     )
@@ -11,7 +11,15 @@ from os import execvp
 
 from pytdbot import Client, types
 
-from TgMusic.core import chat_cache, call, Filter, config
+from TgMusic.core import (
+    chat_cache,
+    call,
+    Filter,
+    config,
+    db,
+    playback_sessions,
+    state_backend,
+)
 from TgMusic.logger import LOGGER
 from TgMusic.modules.utils.play_helpers import del_msg
 
@@ -100,7 +108,11 @@ async def update(c: Client, message: types.Message) -> None:
             await msg.edit_text(f"⚠️ Update error: {e}")
             return
 
-    if active_vc := chat_cache.get_active_chats():
+    if playback_sessions.enabled:
+        # Playback picks up where it left off once the bot is back
+        saved = await playback_sessions.save()
+        LOGGER.info("Saved %d playback sessions before restarting", saved)
+    elif active_vc := chat_cache.get_active_chats():
         for chat_id in active_vc:
             await call.end(chat_id)
             await c.sendTextMessage(
@@ -113,6 +125,9 @@ async def update(c: Client, message: types.Message) -> None:
             )
             await asyncio.sleep(0.5)
 
+    # The restart skips Bot.stop, which would write these on shutdown
+    await state_backend.flush()
+    await db.flush_registrations()
     await msg.edit_text("♻️ Restarting the bot...")
 
     if is_docker():
@@ -5,6 +5,7 @@
 __all__ = [
     "sec_to_min",
     "get_audio_duration",
+    "probe_media",
 ]
 
 import asyncio
@@ -26,7 +27,10 @@ def sec_to_min(seconds):
         return None
 
 
-async def get_audio_duration(file_path):
+async def probe_media(file_path) -> dict:
+    """
+    Run ffprobe on a media file and return its parsed format and stream info.
+    """
     try:
         proc = await asyncio.create_subprocess_exec(
             "ffprobe",
@@ -36,14 +40,21 @@ async def get_audio_duration(file_path):
             "json",
             "-show_format",
             "-show_streams",
-            file_path,
+            str(file_path),
             stdout=asyncio.subprocess.PIPE,
             stderr=asyncio.subprocess.PIPE,
         )
         stdout, _ = await proc.communicate()
-        data = json.loads(stdout)
-        duration = float(data["format"]["duration"])
-        return int(duration)
+        return json.loads(stdout) or {}
     except Exception as e:
+        LOGGER.warning("Failed to probe media using ffprobe: %s", e)
+        return {}
+
+
+async def get_audio_duration(file_path):
+    data = await probe_media(file_path)
+    try:
+        return int(float(data["format"]["duration"]))
+    except (KeyError, TypeError, ValueError) as e:
         LOGGER.warning("Failed to get audio duration using ffprobe: %s", e)
         return 0
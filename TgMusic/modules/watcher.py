@@ -225,21 +225,23 @@ async def new_message(client: Client, update: types.UpdateNewMessage) -> None:
     chat_id = message.chat_id
     content = message.content
 
-    # Run DB operation in the background
+    # Queued in memory and written in batches; only waits when the buffer is full
     if chat_id < 0:
-        client.loop.create_task(db.add_chat(chat_id))
+        await db.add_chat(chat_id)
     else:
-        client.loop.create_task(db.add_user(chat_id))
+        await db.add_user(chat_id)
 
     # Handle video chat events
     if isinstance(content, types.MessageVideoChatEnded):
         LOGGER.info("Video chat ended in %s", chat_id)
+        call.prefetcher.cancel(chat_id)
         chat_cache.clear_chat(chat_id)
         await client.sendTextMessage(chat_id, "Video chat ended!\nAll queues cleared")
         return
 
     if isinstance(content, types.MessageVideoChatStarted):
         LOGGER.info("Video chat started in %s", chat_id)
+        call.prefetcher.cancel(chat_id)
         chat_cache.clear_chat(chat_id)
         await client.sendTextMessage(
             chat_id, "Video chat started!\nUse /play song name to play a song"
@@ -0,0 +1,27 @@
+#  Copyright (c) 2025 AshokShau
+#  Licensed under the GNU AGPL v3.0: https://www.gnu.org/licenses/agpl-3.0.html
+#  Part of the TgMusicBot project. All rights reserved where applicable.
+
+"""
+Entry points of the bot's worker processes.
+
+Workers are started with the spawn method, so each child imports the
+module holding its target. Modules here must not import ``TgMusic.core``
+or ``TgMusic.logger``: the first builds every service of the bot, the
+second attaches another handler to the log file the main process rotates.
+"""
+
+import logging
+
+LOGGER = logging.getLogger("TgMusicBot")
+
+
+def setup_logging() -> None:
+    """Log to stderr only; the main process owns bot.log."""
+    logging.basicConfig(
+        level=logging.INFO,
+        format="[%(asctime)s - %(levelname)s] - %(name)s (%(processName)s) - "
+        "%(filename)s:%(lineno)d - %(message)s",
+        datefmt="%d-%b-%y %H:%M:%S",
+    )
+    logging.getLogger("pyrogram").setLevel(logging.WARNING)
@@ -0,0 +1,178 @@
+#  Copyright (c) 2025 AshokShau
+#  Licensed under the GNU AGPL v3.0: https://www.gnu.org/licenses/agpl-3.0.html
+#  Part of the TgMusicBot project. All rights reserved where applicable.
+
+import asyncio
+import signal
+from multiprocessing.connection import Connection
+from typing import Any, Awaitable, Callable
+
+from . import LOGGER, setup_logging
+
+# PyTgCalls methods the front-end may call on a worker's assistant
+CALL_METHODS = frozenset(
+    {
+        "play",
+        "leave_call",
+        "change_volume_call",
+        "mute",
+        "unmute",
+        "resume",
+        "pause",
+        "time",
+        "get_participants",
+    }
+)
+
+
+def encode_error(exc: BaseException) -> tuple[str, str, str, Any]:
+    cls = type(exc)
+    return cls.__module__, cls.__qualname__, str(exc), getattr(exc, "value", None)
+
+
+class ShardWorker:
+    """
+    Runs in a shard's worker process and owns its assistants' sessions.
+
+    Requests from the front-end arrive over the pipe as
+    ``(kind, request_id, *args)`` and are answered with
+    ``("result", request_id, value)`` or ``("error", request_id, error)``.
+    Stream and chat updates are pushed as ``("update", client_name, update)``.
+    """
+
+    def __init__(
+        self, shard_id: int, api_id: int, api_hash: str, conn: Connection
+    ) -> None:
+        self.shard_id = shard_id
+        self.api_id = api_id
+        self.api_hash = api_hash
+        self.conn = conn
+        self.calls: dict[str, Any] = {}
+        self._tasks: set[asyncio.Task] = set()
+        self._stopped = asyncio.Event()
+
+    def _send(self, message: tuple) -> None:
+        try:
+            self.conn.send(message)
+        except (OSError, ValueError) as e:
+            LOGGER.error("Shard %d failed to reply: %s", self.shard_id, e)
+            self._stopped.set()
+
+    def _reply(self, request_id: int, result: Any) -> None:
+        try:
+            self.conn.send(("result", request_id, result))
+        except (OSError, ValueError):
+            self._stopped.set()
+        except Exception as e:
+            # The result could not be pickled
+            self._send(("error", request_id, encode_error(e)))
+
+    async def _open(self, name: str, session_string: str) -> dict[str, Any]:
+        from pyrogram import Client as PyroClient
+        from pytgcalls import PyTgCalls
+        from pytgcalls.types import ChatUpdate, stream
+
+        user_bot = PyroClient(
+            name,
+            api_id=self.api_id,
+            api_hash=self.api_hash,
+            session_string=session_string,
+        )
+        calls = PyTgCalls(user_bot, cache_duration=100)
+        await calls.start()
+        self.calls[name] = calls
+
+        @calls.on_update()
+        async def forward(_, update, name=name):
+            if isinstance(update, (stream.StreamEnded, ChatUpdate)):
+                try:
+                    self.conn.send(("update", name, update))
+                except Exception as e:
+                    LOGGER.warning("Shard %d dropped an update: %s", self.shard_id, e)
+
+        LOGGER.info("Client %s started in shard %d", name, self.shard_id)
+        me = user_bot.me
+        return {
+            "id": me.id,
+            "is_bot": me.is_bot,
+            "first_name": me.first_name,
+            "username": me.username,
+        }
+
+    async def _call(
+        self, name: str, method: str, args: tuple, kwargs: dict[str, Any]
+    ) -> Any:
+        if method not in CALL_METHODS:
+            raise ValueError(f"Method {method} is not exposed by shard workers")
+        return await getattr(self.calls[name], method)(*args, **kwargs)
+
+    async def _stats(self, name: str) -> tuple[float, float]:
+        calls = self.calls[name]
+        return calls.ping, await calls.cpu_usage
+
+    async def _userbot(self, name: str, action: str, *args: Any) -> Any:
+        ub = self.calls[name].mtproto_client
+        if action == "join_chat":
+            await ub.join_chat(*args)
+        elif action == "leave_chat":
+            await ub.leave_chat(*args)
+        elif action == "dialogs":
+            return [dialog.chat.id async for dialog in ub.get_dialogs() if dialog.chat]
+        else:
+            raise ValueError(f"Unknown userbot action {action}")
+        return None
+
+    async def _handle(self, message: tuple) -> None:
+        kind, request_id, *args = message
+        handlers: dict[str, Callable[..., Awaitable[Any]]] = {
+            "open": self._open,
+            "call": self._call,
+            "stats": self._stats,
+            "userbot": self._userbot,
+        }
+        try:
+            if kind not in handlers:
+                raise ValueError(f"Unknown request {kind}")
+            result = await handlers[kind](*args)
+        except Exception as e:
+            self._send(("error", request_id, encode_error(e)))
+            return
+        self._reply(request_id, result)
+
+    def _on_readable(self) -> None:
+        try:
+            while self.conn.poll():
+                message = self.conn.recv()
+                if message[0] == "stop":
+                    self._stopped.set()
+                    return
+                task = asyncio.create_task(self._handle(message))
+                self._tasks.add(task)
+                task.add_done_callback(self._tasks.discard)
+        except (EOFError, OSError):
+            # The front-end went away
+            self._stopped.set()
+
+    async def serve(self) -> None:
+        loop = asyncio.get_running_loop()
+        loop.add_reader(self.conn.fileno(), self._on_readable)
+        try:
+            await self._stopped.wait()
+        finally:
+            loop.remove_reader(self.conn.fileno())
+            for task in self._tasks:
+                task.cancel()
+            for name, calls in self.calls.items():
+                try:
+                    await calls.mtproto_client.stop()
+                except Exception as e:
+                    LOGGER.debug("Failed to stop %s: %s", name, e)
+            self.conn.close()
+
+
+def run_worker(shard_id: int, api_id: int, api_hash: str, conn: Connection) -> None:
+    """Entry point of a shard's worker process."""
+    setup_logging()
+    # Shutdown is driven by the front-end, not by Ctrl+C on the process group
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    asyncio.run(ShardWorker(shard_id, api_id, api_hash, conn).serve())
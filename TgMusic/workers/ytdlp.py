@@ -0,0 +1,82 @@
+#  Copyright (c) 2025 AshokShau
+#  Licensed under the GNU AGPL v3.0: https://www.gnu.org/licenses/agpl-3.0.html
+#  Part of the TgMusicBot project. All rights reserved where applicable.
+
+import threading
+from typing import Any
+
+from . import setup_logging
+
+# Seconds yt-dlp waits on a silent connection before giving up on it
+SOCKET_TIMEOUT = 30
+
+# Per-process state of a worker: warm YoutubeDL instances keyed by options
+_instances: dict[str, Any] = {}
+_MAX_INSTANCES = 8
+
+
+def _get_instance(opts: dict[str, Any]) -> Any:
+    import yt_dlp
+
+    key = repr(sorted(opts.items()))
+    ydl = _instances.get(key)
+    if ydl is None:
+        if len(_instances) >= _MAX_INSTANCES:
+            _instances.pop(next(iter(_instances))).close()
+        ydl = yt_dlp.YoutubeDL(opts)
+        _instances[key] = ydl
+    return ydl
+
+
+def _drop_instance(ydl: Any) -> None:
+    for key, instance in list(_instances.items()):
+        if instance is ydl:
+            del _instances[key]
+
+
+def warm_up() -> None:
+    setup_logging()
+    import yt_dlp  # noqa: F401
+
+
+def _extract(ydl: Any, url: str, download: bool) -> dict[str, Any]:
+    try:
+        info = ydl.extract_info(url, download=download)
+        if not info:
+            return {"ok": False, "error": "no information extracted"}
+
+        if download:
+            downloads = info.get("requested_downloads") or [{}]
+            return {"ok": True, "result": downloads[0].get("filepath")}
+        return {"ok": True, "result": ydl.sanitize_info(info)}
+    except Exception as e:
+        # Exceptions from yt-dlp may carry tracebacks that cannot be pickled
+        return {"ok": False, "error": str(e)}
+
+
+def run_job(
+    url: str, opts: dict[str, Any], download: bool, timeout: float
+) -> dict[str, Any]:
+    """
+    Run one extract or download job inside a worker process.
+
+    The job runs in a thread so the worker can give up on it after
+    ``timeout`` seconds and take the next job; a stuck thread cannot be
+    stopped, but ``SOCKET_TIMEOUT`` ends stalled transfers eventually.
+    """
+    try:
+        ydl = _get_instance({"socket_timeout": SOCKET_TIMEOUT, **opts})
+    except Exception as e:
+        return {"ok": False, "error": str(e)}
+
+    response: dict[str, Any] = {}
+    thread = threading.Thread(
+        target=lambda: response.update(_extract(ydl, url, download)), daemon=True
+    )
+    thread.start()
+    thread.join(timeout)
+    if thread.is_alive():
+        # Later jobs must not share an instance that is still in use
+        _drop_instance(ydl)
+        return {"ok": False, "error": f"timed out after {timeout:.0f}s"}
+    return response
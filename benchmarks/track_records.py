@@ -0,0 +1,150 @@
+#  Copyright (c) 2025 AshokShau
+#  Licensed under the GNU AGPL v3.0: https://www.gnu.org/licenses/agpl-3.0.html
+#  Part of the TgMusicBot project. All rights reserved where applicable.
+
+"""
+Compare pydantic track models with the slotted records on a 500-entry playlist.
+
+Each path parses the provider response into ``PlatformTracks`` and then
+queues every entry as a ``CachedTrack``, as ``/play <playlist>`` does.
+
+    python benchmarks/track_records.py [--entries 500] [--rounds 200]
+"""
+
+import argparse
+import importlib.util
+import sys
+import timeit
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Union
+
+from pydantic import BaseModel
+
+# Load the records module on its own; importing the TgMusic.core package
+# would read the bot's configuration and set up its services.
+_spec = importlib.util.spec_from_file_location(
+    "track_records",
+    Path(__file__).resolve().parent.parent / "TgMusic" / "core" / "_dataclass.py",
+)
+records = importlib.util.module_from_spec(_spec)
+sys.modules[_spec.name] = records
+_spec.loader.exec_module(records)
+
+
+class OldCachedTrack(BaseModel):
+    url: str
+    name: str
+    artist: str
+    loop: int
+    user: str
+    file_path: Union[str, Path]
+    thumbnail: str
+    track_id: str
+    duration: int = 0
+    is_video: bool
+    platform: str
+
+
+class OldMusicTrack(BaseModel):
+    url: str
+    name: str
+    artist: str
+    id: str
+    year: int
+    cover: str
+    duration: int
+    platform: str
+
+
+class OldPlatformTracks(BaseModel):
+    tracks: list[OldMusicTrack]
+
+
+def make_response(entries: int) -> dict[str, Any]:
+    return {
+        "results": [
+            {
+                "id": f"video{i:05d}",
+                "name": f"Track number {i}",
+                "artist": "Some Artist",
+                "duration": 180 + i % 120,
+                "cover": f"https://i.ytimg.com/vi/video{i:05d}/hqdefault.jpg",
+                "year": 0,
+                "url": f"https://www.youtube.com/watch?v=video{i:05d}",
+                "platform": "youtube",
+            }
+            for i in range(entries)
+        ]
+    }
+
+
+def _queue(tracks: list, cached_cls: type) -> list:
+    return [
+        cached_cls(
+            name=track.name,
+            artist=track.artist,
+            track_id=track.id,
+            loop=0,
+            duration=track.duration,
+            thumbnail=track.cover,
+            user="bench",
+            file_path="",
+            platform=track.platform,
+            is_video=False,
+            url=track.url,
+        )
+        for track in tracks
+    ]
+
+
+def old_path(response: dict[str, Any]) -> list:
+    parsed = OldPlatformTracks(
+        tracks=[OldMusicTrack(**track) for track in response["results"]]
+    )
+    return _queue(parsed.tracks, OldCachedTrack)
+
+
+def new_path(response: dict[str, Any]) -> list:
+    parsed = records.PlatformTracks(
+        tracks=[records.MusicTrack.from_dict(track) for track in response["results"]]
+    )
+    return _queue(parsed.tracks, records.CachedTrack)
+
+
+def measure(
+    name: str, path: Callable[[dict[str, Any]], list], response: dict, rounds: int
+) -> tuple[float, int]:
+    seconds = min(timeit.repeat(lambda: path(response), number=rounds, repeat=5))
+    per_call = seconds / rounds
+
+    tracemalloc.start()
+    kept = path(response)
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del kept
+
+    print(
+        f"{name:<10} {per_call * 1000:8.3f} ms/playlist {size / 1024:10.1f} KiB retained"
+    )
+    return per_call, size
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--entries", type=int, default=500)
+    parser.add_argument("--rounds", type=int, default=200)
+    args = parser.parse_args()
+
+    response = make_response(args.entries)
+    print(f"{args.entries}-entry playlist, best of 5 x {args.rounds} rounds")
+    old_time, old_size = measure("pydantic", old_path, response, args.rounds)
+    new_time, new_size = measure("records", new_path, response, args.rounds)
+    print(
+        f"speedup {old_time / new_time:.2f}x, "
+        f"memory {new_size / old_size:.0%} of pydantic"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+#  Copyright (c) 2025 AshokShau
+#  Licensed under the GNU AGPL v3.0: https://www.gnu.org/licenses/agpl-3.0.html
+#  Part of the TgMusicBot project. All rights reserved where applicable.
+
+"""
+Import the core modules under test without starting the bot.
+
+Importing the ``TgMusic.core`` package builds every service of the bot,
+so a bare package entry is registered instead and tests import only the
+modules they exercise. The configuration is read from placeholder values,
+and the session runs in a scratch directory because the config and logger
+create files relative to the working directory.
+"""
+
+import os
+import sys
+import tempfile
+from pathlib import Path
+from types import ModuleType
+
+ROOT = Path(__file__).resolve().parent.parent
+
+for _name, _value in {
+    "API_ID": "1",
+    "API_HASH": "test",
+    "TOKEN": "test",
+    "MONGO_URI": "mongodb://localhost:27017",
+    "LOGGER_ID": "-1",
+    "STRING1": "test",
+    "IGNORE_BACKGROUND_UPDATES": "False",
+}.items():
+    os.environ.setdefault(_name, _value)
+
+sys.path.insert(0, str(ROOT))
+if "TgMusic.core" not in sys.modules:
+    _package = ModuleType("TgMusic.core")
+    _package.__path__ = [str(ROOT / "TgMusic" / "core")]
+    sys.modules["TgMusic.core"] = _package
+
+
+def pytest_configure(config) -> None:
+    # After pytest has resolved its paths, before any test module is imported
+    os.chdir(tempfile.mkdtemp(prefix="tgmusic-tests-"))
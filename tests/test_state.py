@@ -0,0 +1,163 @@
+#  Copyright (c) 2025 AshokShau
+#  Licensed under the GNU AGPL v3.0: https://www.gnu.org/licenses/agpl-3.0.html
+#  Part of the TgMusicBot project. All rights reserved where applicable.
+
+import asyncio
+import json
+
+import pytest
+
+fakeredis = pytest.importorskip("fakeredis")
+
+from TgMusic.core._cacher import ChatCacher  # noqa: E402
+from TgMusic.core._dataclass import CachedTrack  # noqa: E402
+from TgMusic.core._state import RedisStateBackend  # noqa: E402
+
+
+def make_track(n: int, file_path: str = "") -> CachedTrack:
+    return CachedTrack(
+        url=f"https://www.youtube.com/watch?v=video{n}",
+        name=f"Track {n}",
+        artist="Artist",
+        loop=0,
+        user="tester",
+        file_path=file_path,
+        thumbnail="",
+        track_id=f"video{n}",
+        duration=180,
+        is_video=False,
+        platform="youtube",
+    )
+
+
+def make_backend() -> RedisStateBackend:
+    backend = RedisStateBackend("redis://unused")
+    backend._redis = fakeredis.aioredis.FakeRedis(decode_responses=True)
+    return backend
+
+
+class FailingPipeline:
+    def __init__(self, pipe, error: BaseException):
+        self._pipe = pipe
+        self._error = error
+
+    def __getattr__(self, name):
+        return getattr(self._pipe, name)
+
+    async def execute(self):
+        raise self._error
+
+
+def test_flush_batches_changes_into_one_write():
+    async def run():
+        backend = make_backend()
+        cache = ChatCacher(backend)
+        cache.add_song(-1001, make_track(1))
+        cache.add_song(-1001, make_track(2))
+        cache.add_song(-1002, make_track(3))
+
+        assert backend.stats()["pending"] == 2
+        await backend.flush()
+
+        assert backend.flushes == 1
+        assert backend.writes == 2
+        assert backend.stats()["pending"] == 0
+        assert await backend._redis.smembers("tgmusic:chats") == {"-1001", "-1002"}
+        stored = json.loads(await backend._redis.get("tgmusic:chat:-1001"))
+        assert stored["active"] is True
+        assert [t["name"] for t in stored["queue"]] == ["Track 1", "Track 2"]
+
+    asyncio.run(run())
+
+
+def test_cleared_chats_are_deleted():
+    async def run():
+        backend = make_backend()
+        cache = ChatCacher(backend)
+        cache.add_song(-1001, make_track(1))
+        cache.add_song(-1002, make_track(2))
+        await backend.flush()
+
+        cache.clear_chat(-1001)
+        await backend.flush()
+
+        assert await backend._redis.get("tgmusic:chat:-1001") is None
+        assert await backend._redis.smembers("tgmusic:chats") == {"-1002"}
+
+    asyncio.run(run())
+
+
+def test_failed_flush_keeps_chats_pending():
+    async def run():
+        backend = make_backend()
+        cache = ChatCacher(backend)
+        cache.add_song(-1001, make_track(1))
+
+        redis = backend._redis
+        pipeline = redis.pipeline
+        redis.pipeline = lambda **kw: FailingPipeline(
+            pipeline(**kw), ConnectionError("down")
+        )
+        await backend.flush()
+
+        assert backend.errors == 1
+        assert backend.stats()["pending"] == 1
+        assert await redis.get("tgmusic:chat:-1001") is None
+
+        redis.pipeline = pipeline
+        await backend.flush()
+
+        assert backend.stats()["pending"] == 0
+        assert await redis.get("tgmusic:chat:-1001") is not None
+
+    asyncio.run(run())
+
+
+def test_cancelled_flush_keeps_chats_pending():
+    async def run():
+        backend = make_backend()
+        cache = ChatCacher(backend)
+        cache.add_song(-1001, make_track(1))
+
+        redis = backend._redis
+        pipeline = redis.pipeline
+        redis.pipeline = lambda **kw: FailingPipeline(
+            pipeline(**kw), asyncio.CancelledError()
+        )
+        with pytest.raises(asyncio.CancelledError):
+            await backend.flush()
+        assert backend.stats()["pending"] == 1
+
+        redis.pipeline = pipeline
+        await backend.close()
+        # close() flushed the batch before dropping the connection
+        backend._redis = redis
+        assert await redis.get("tgmusic:chat:-1001") is not None
+
+    asyncio.run(run())
+
+
+def test_restore_rebuilds_queues():
+    async def run():
+        backend = make_backend()
+        cache = ChatCacher(backend)
+        cache.add_song(-1001, make_track(1, file_path="https://cdn.example/stream"))
+        cache.add_song(-1001, make_track(2))
+        cache.add_song(-1002, make_track(3))
+        cache.set_active(-1002, False)
+        await backend.flush()
+        await backend._redis.set("tgmusic:chat:-1003", "not json")
+        await backend._redis.sadd("tgmusic:chats", -1003)
+
+        restored = ChatCacher(backend)
+        playing = await restored.restore()
+
+        assert playing == [-1001]
+        assert [t.name for t in restored.get_queue(-1001)] == ["Track 1", "Track 2"]
+        # Stream URLs expire, so the track is resolved again on resume
+        assert restored.get_playing_track(-1001).file_path == ""
+        assert restored.get_queue_length(-1002) == 1
+        assert not restored.is_active(-1002)
+        assert restored.get_queue_length(-1003) == 0
+
+    asyncio.run(run())